@@ -1,62 +1,138 @@
-import pygame
+"""
+Sprite background removal: keys out a flat background colour and writes the
+sheet back as RGBA.
+
+Usage:
+    python inspect_and_fix.py runner_man/assets/runner.png --inspect
+    python inspect_and_fix.py runner_man/assets/runner.png                      # white, tolerance 60, in place
+    python inspect_and_fix.py sheet.png -o sheet_keyed.png --background auto --feather 30
+
+A pixel whose colour is within --tolerance of the background (sum of the
+R, G, B differences) becomes fully transparent. With --feather, alpha then
+ramps up over the next `feather` units of distance instead of jumping to
+opaque, which softens anti-aliased edges. Existing transparency is kept.
+Everything runs on NumPy views of the sheet's pixels (pygame.surfarray),
+so a 1024x1024 sheet takes a few tens of milliseconds.
+"""
+import os
 import sys
+import time
+import argparse
+from collections import Counter
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import numpy as np
+import pygame
+
+def parse_color(text):
+    """'white', '#rrggbb' or 'r,g,b' -> (r, g, b); 'auto' -> None."""
+    if text == "auto":
+        return None
+    if "," in text:
+        return tuple(int(part) for part in text.split(","))[:3]
+    color = pygame.Color(text)
+    return (color.r, color.g, color.b)
+
+def corner_colors(rgb, alpha):
+    # (r, g, b, a) at the four corners; arrays are surfarray-shaped (width, height)
+    w, h = alpha.shape
+    return [tuple(int(v) for v in rgb[x, y]) + (int(alpha[x, y]),)
+            for x, y in ((0, 0), (w - 1, 0), (0, h - 1), (w - 1, h - 1))]
+
+def detect_background(rgb, alpha):
+    """Most common opaque corner colour, or None when every corner is already transparent."""
+    opaque = [color[:3] for color in corner_colors(rgb, alpha) if color[3] == 255]
+    if not opaque:
+        return None
+    return Counter(opaque).most_common(1)[0][0]
+
+def key_alpha(rgb, background, tolerance, feather=0):
+    """
+    Alpha (uint8, shape of rgb[..., 0]) that hides pixels within tolerance of
+    background: 0 below tolerance, 255 from tolerance + feather on. Distances
+    and alpha come from 256- and 766-entry lookup tables, so the per-pixel
+    work is table indexing on views of the channels.
+    """
+    levels = np.arange(256, dtype=np.int16)
+    r, g, b = (np.abs(levels - c).astype(np.uint16) for c in background)
+    distance = r[rgb[..., 0]] + g[rgb[..., 1]] + b[rgb[..., 2]]
+    distances = np.arange(766)
+    if feather <= 0:
+        table = np.where(distances < tolerance, 0, 255)
+    else:
+        table = np.clip((distances - tolerance + 1) * (255.0 / feather), 0, 255)
+    return table.astype(np.uint8)[distance]
+
+def remove_background(image, background, tolerance, feather=0):
+    """New 32-bit SRCALPHA surface: image with background keyed out (hidden pixels are (0, 0, 0, 0))."""
+    if image.get_bitsize() == 32 and image.get_flags() & pygame.SRCALPHA:
+        result = image.copy()
+    else:
+        result = pygame.Surface(image.get_size(), pygame.SRCALPHA, 32)
+        result.blit(image, (0, 0)) # Opaque pixels come across with alpha 255
+    # Views straight into result's pixels, no copies
+    rgb = pygame.surfarray.pixels3d(result)
+    key = key_alpha(rgb, background, tolerance, feather)
+    del rgb
+    alpha = pygame.surfarray.pixels_alpha(result)
+    np.minimum(alpha, key, out=alpha) # Keep existing transparency
+    hidden = alpha == 0
+    del alpha
+    pygame.surfarray.pixels2d(result)[hidden] = 0
+    return result
+
+def inspect(path, image, background, tolerance, feather):
+    rgb = pygame.surfarray.array3d(image)
+    alpha = pygame.surfarray.array_alpha(image)
+    print(f"{path}: {image.get_width()}x{image.get_height()}, {image.get_bitsize()}-bit, "
+          f"{'with' if image.get_flags() & pygame.SRCALPHA else 'no'} alpha channel")
+    print(f"  Corner colours (RGBA): {corner_colors(rgb, alpha)}")
+    print(f"  Already transparent: {np.mean(alpha == 0) * 100:.1f}% of pixels")
+    if background is None:
+        print("  No opaque corner; nothing to key")
+        return
+    keyed = key_alpha(rgb, background, tolerance, feather)
+    print(f"  Background {background}, tolerance {tolerance}: would hide {np.mean(keyed == 0) * 100:.1f}%"
+          + (f", feather {np.mean((keyed > 0) & (keyed < 255)) * 100:.1f}%" if feather > 0 else ""))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Key out a sprite sheet's background colour into alpha.")
+    parser.add_argument("paths", nargs="+", help="Image files (any format pygame loads; saved as PNG)")
+    parser.add_argument("-o", "--output", default=None, help="Write here instead of overwriting (one input only)")
+    parser.add_argument("--background", default="white",
+                        help="Colour to remove: a name, #rrggbb, r,g,b, or 'auto' (most common opaque corner)")
+    parser.add_argument("--tolerance", type=int, default=60, help="Max summed R+G+B difference keyed out")
+    parser.add_argument("--feather", type=int, default=0, help="Distance over which alpha ramps back to opaque")
+    parser.add_argument("--inspect", action="store_true", help="Report corners and coverage; write nothing")
+    args = parser.parse_args(argv)
+    if args.output and len(args.paths) > 1:
+        parser.error("--output takes a single input")
+
+    for path in args.paths:
+        try:
+            image = pygame.image.load(path)
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"Error: {path}: {e}", file=sys.stderr)
+            return 1
+        background = parse_color(args.background)
+        if background is None:
+            background = detect_background(pygame.surfarray.array3d(image), pygame.surfarray.array_alpha(image))
+
+        if args.inspect:
+            inspect(path, image, background, args.tolerance, args.feather)
+            continue
+        if background is None:
+            print(f"{path}: no opaque corner to take the background from; skipped")
+            continue
 
-def inspect_and_fix():
-    pygame.init()
-    pygame.display.set_mode((1, 1))
-    
-    path = "d:/Github/ang-laro/runner_man/assets/runner.png"
-    
-    try:
-        # Load image (preserve existing alpha if any, though likely opaque)
-        image = pygame.image.load(path).convert()
-        width, height = image.get_size()
-        
-        # Sample 4 corners to find consensus on background color
-        corners = [
-            image.get_at((0, 0)),
-            image.get_at((width-1, 0)),
-            image.get_at((0, height-1)),
-            image.get_at((width-1, height-1))
-        ]
-        
-        print(f"Corner colors: {corners}")
-        
-        # Force White Background Assumption based on User feedback and likely grid lines at (0,0)
-        bg_color = pygame.Color(255, 255, 255, 255)
-        print(f"Forcing Background Color: {bg_color}")
-
-        # Create new RGBA surface
-        new_image = pygame.Surface((width, height), pygame.SRCALPHA)
-        new_image.fill((0,0,0,0)) # Transparent start
-        
-        # Manual pixel iteration to handle tolerance (artifacts)
-        # Lock surfaces for speed
-        # This is slower but deterministic for artifacts
-        # Tolerance for JPEG/Compression artifacts: +/- 40 (Aggressive)
-        tol = 60 # Increased tolerance for 'white-ish' pixels
-        
-        for y in range(height):
-            for x in range(width):
-                c = image.get_at((x, y))
-                # Check distance to bg_color
-                dist = abs(c.r - bg_color.r) + abs(c.g - bg_color.g) + abs(c.b - bg_color.b)
-                
-                if dist < tol:
-                    # Transparent
-                    new_image.set_at((x, y), (0, 0, 0, 0))
-                else:
-                    # Keep Pixel (Solid)
-                    new_image.set_at((x, y), (c.r, c.g, c.b, 255))
-        
-        # Save fixed image
-        pygame.image.save(new_image, path)
-        print(f"Fixed image saved to {path} with background removed.")
-        
-    except Exception as e:
-        print(f"Error: {e}")
-        
-    pygame.quit()
+        start = time.perf_counter()
+        result = remove_background(image, background, args.tolerance, args.feather)
+        elapsed = time.perf_counter() - start
+        output = args.output or path
+        pygame.image.save(result, output)
+        print(f"{path}: removed {background} (tolerance {args.tolerance}, feather {args.feather}) "
+              f"in {elapsed * 1000:.1f}ms -> {output}")
+    return 0
 
 if __name__ == "__main__":
-    inspect_and_fix()
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,50 @@
+import pygame
+
+class BackgroundLayer:
+    """
+    Cached, display-format copy of everything static in a frame: the floor
+    fill, the arena walls and every obstacle that is not blinking.
+    Rebuilt only when the obstacle set changes (ObstacleManager.version),
+    an obstacle starts blinking, or the arena / target size changes; other
+    frames cost one blit plus the blinking obstacles drawn on top.
+    """
+    def __init__(self, fill_color=(20, 20, 20)):
+        self.fill_color = fill_color
+        self.surface = None
+        self.key = None
+        self.blinking = [] # Obstacles drawn live over the cached layer
+
+    def rebuild(self, target, arena, obstacle_manager, key):
+        if self.surface is None or self.surface.get_size() != target.get_size():
+            # Same pixel format as the target, so the per-frame blit is a straight copy
+            self.surface = pygame.Surface(target.get_size(), 0, target)
+        self.surface.fill(self.fill_color)
+        arena.draw(self.surface)
+        self.blinking = []
+        for obs in obstacle_manager.get_obstacles():
+            if obs.is_blinking():
+                self.blinking.append(obs)
+            else:
+                obs.draw(self.surface)
+        self.key = key
+
+    def refresh(self, target, arena, obstacle_manager):
+        """Rebuilds the cached layer if it is stale; returns True when it did."""
+        obstacles = obstacle_manager.get_obstacles()
+        # Obstacles only start blinking (never stop) until they expire, which bumps
+        # the version, so the blinking count is enough to notice a new one
+        blinking_count = sum(1 for obs in obstacles if obs.is_blinking())
+        key = (obstacle_manager.version, blinking_count, tuple(arena.rect), target.get_size())
+        if key == self.key:
+            return False
+        self.rebuild(target, arena, obstacle_manager, key)
+        return True
+
+    def draw_blinking(self, target):
+        for obs in self.blinking:
+            obs.draw(target)
+
+    def draw(self, target, arena, obstacle_manager):
+        self.refresh(target, arena, obstacle_manager)
+        target.blit(self.surface, (0, 0))
+        self.draw_blinking(target)
@@ -0,0 +1,515 @@
+"""
+Seeded microbenchmarks for the level_maze hot paths.
+
+Usage:
+    python -m level_maze.bench                      # full run, JSON to stdout
+    python -m level_maze.bench --quick -o run.json  # smaller scales, JSON to file
+    python -m level_maze.bench --filter find_path
+
+Every case rebuilds its world from the same seed, so two runs on different
+commits measure identical layouts. One "op" is one call of the benchmarked
+function, except for per-entity queries (line of sight), where one op is a
+full frame's worth of calls over every enemy.
+"""
+
+import os
+# stdout carries the JSON report; keep pygame's import banner out of it
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import pygame
+import random
+import time
+import math
+import io
+import json
+import sys
+import platform
+import argparse
+import subprocess
+import tempfile
+from level_maze.config_manager import ConfigManager
+from level_maze.event_log import EventLog, log
+from level_maze.telemetry import TelemetryWriter, RECORD
+from level_maze.arena import Arena
+from level_maze.obstacle_manager import ObstacleManager
+from level_maze.enemy import Enemy
+from level_maze.player import Player
+from level_maze.input_handler import InputFrame
+from level_maze.enemy_store import EnemyStore, StoredEnemy
+from level_maze.combat_system import CombatSystem
+from level_maze.vfx import VFXManager
+from level_maze.background import BackgroundLayer
+from level_maze.roar_bomb import RoarBomb
+from level_maze.brick_bomb import BrickBomb
+from level_maze.flow_field import FlowField
+from level_maze.line_of_sight import batch_line_of_sight
+from level_maze.simulation import Simulation
+
+SCHEMA_VERSION = 1
+
+ENEMY_COUNTS = (15, 100, 1000)
+OBSTACLE_COUNTS = (10, 50, 200)
+PARTICLE_COUNTS = (60, 600)
+LARGE_OBSTACLE_COUNTS = (2000,)
+PATHING_ENEMY_COUNTS = (1, 2, 4, 8, 16)
+
+QUICK_ENEMY_COUNTS = (15, 100)
+QUICK_OBSTACLE_COUNTS = (10, 50)
+QUICK_PARTICLE_COUNTS = (60,)
+
+class BenchCase:
+    def __init__(self, name, params, run, reset=None):
+        self.name = name
+        self.params = params
+        self.run = run
+        self.reset = reset # Untimed, called before every op
+
+class BenchWorld:
+    """Deterministic arena + obstacle layout shared by the cases."""
+    def __init__(self, seed, obstacle_count, width=1920, height=1080):
+        random.seed(seed)
+        self.arena = Arena(50, 50, width - 100, height - 100)
+        self.center = pygame.Vector2(width // 2, height // 2)
+        self.safe_zone = pygame.Rect(self.center.x - 100, self.center.y - 100, 200, 200)
+        self.obstacle_manager = ObstacleManager()
+        self.obstacle_manager.generate_obstacles(self.arena, self.safe_zone, num_obstacles=obstacle_count)
+
+    def random_point(self, padding=20):
+        return pygame.Vector2(
+            random.randint(self.arena.rect.left + padding, self.arena.rect.right - padding),
+            random.randint(self.arena.rect.top + padding, self.arena.rect.bottom - padding)
+        )
+
+    def spawn_enemies(self, count):
+        return [Enemy(p.x, p.y) for p in (self.random_point() for _ in range(count))]
+
+class _Target:
+    # Stand-in for the Player in queries that only read position
+    def __init__(self, position):
+        self.position = pygame.Vector2(position)
+
+def percentile(sorted_values, pct):
+    # Nearest-rank percentile on an already sorted list
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(pct / 100.0 * len(sorted_values))
+    return sorted_values[max(0, min(len(sorted_values), rank) - 1)]
+
+def measure(case, min_time, min_samples, max_samples, warmup=3):
+    for _ in range(warmup):
+        if case.reset: case.reset()
+        case.run()
+
+    samples = []
+    total = 0.0
+    while len(samples) < max_samples and (total < min_time or len(samples) < min_samples):
+        if case.reset: case.reset()
+        t0 = time.perf_counter()
+        case.run()
+        elapsed = time.perf_counter() - t0
+        samples.append(elapsed)
+        total += elapsed
+
+    samples.sort()
+    return {
+        "name": case.name,
+        "params": case.params,
+        "samples": len(samples),
+        "ops_per_sec": len(samples) / total if total > 0 else None,
+        "mean_ms": total / len(samples) * 1000.0,
+        "p50_ms": percentile(samples, 50) * 1000.0,
+        "p99_ms": percentile(samples, 99) * 1000.0,
+        "min_ms": samples[0] * 1000.0,
+        "max_ms": samples[-1] * 1000.0,
+    }
+
+def find_path_cases(seed, obstacle_counts):
+    for obstacle_count in obstacle_counts:
+        world = BenchWorld(seed, obstacle_count)
+        enemy = Enemy(world.arena.rect.left + 30, world.arena.rect.top + 30)
+        goal = world.center
+        obstacle_manager = world.obstacle_manager
+        yield BenchCase(
+            "enemy.find_path",
+            {"obstacles": len(obstacle_manager.get_obstacles())},
+            lambda e=enemy, g=goal, o=obstacle_manager, a=world.arena: e.find_path(e.position, g, o, a)
+        )
+
+        # Goal walled in (as by solidified brick bombs): rejected by the region check
+        walled = ObstacleManager()
+        walled.set_obstacles(list(obstacle_manager.get_obstacles()))
+        box = pygame.Rect(0, 0, 200, 200)
+        box.center = goal
+        for wall in (pygame.Rect(box.left, box.top, box.width, 20), pygame.Rect(box.left, box.bottom - 20, box.width, 20),
+                     pygame.Rect(box.left, box.top, 20, box.height), pygame.Rect(box.right - 20, box.top, 20, box.height)):
+            walled.add_dynamic_obstacle(wall)
+        yield BenchCase(
+            "enemy.find_path_unreachable",
+            {"obstacles": len(walled.get_obstacles())},
+            lambda e=enemy, g=goal, o=walled, a=world.arena: e.find_path(e.position, g, o, a)
+        )
+
+def flow_field_cases(seed, enemy_counts, obstacle_counts):
+    for obstacle_count in obstacle_counts:
+        for enemy_count in enemy_counts:
+            world = BenchWorld(seed, obstacle_count)
+            enemies = world.spawn_enemies(enemy_count)
+            flow_field = FlowField()
+
+            def run(world=world, enemies=enemies, flow_field=flow_field):
+                # Worst case: the player just changed cell, so the field is rebuilt once
+                flow_field.computed_goal = None
+                flow_field.set_goal(world.center, world.obstacle_manager, world.arena)
+                for enemy in enemies:
+                    flow_field.waypoints(enemy.position)
+
+            yield BenchCase(
+                "flow_field.waypoints",
+                {"enemies": enemy_count, "obstacles": len(world.obstacle_manager.get_obstacles()), "calls_per_op": enemy_count},
+                run
+            )
+
+def pathing_crossover_cases(seed, obstacle_counts):
+    # One repath event both ways: every enemy runs its own A*, or the shared field
+    # is rebuilt once and every enemy walks it. The field wins from the enemy count
+    # where the two lines cross.
+    for obstacle_count in obstacle_counts:
+        world = BenchWorld(seed, obstacle_count)
+        obstacle_manager = world.obstacle_manager
+        for enemy_count in PATHING_ENEMY_COUNTS:
+            enemies = world.spawn_enemies(enemy_count)
+            params = {"enemies": enemy_count, "obstacles": len(obstacle_manager.get_obstacles())}
+
+            def astar(enemies=enemies, goal=world.center, o=obstacle_manager, a=world.arena):
+                for enemy in enemies:
+                    enemy.find_path(enemy.position, goal, o, a)
+
+            def flow(enemies=enemies, world=world, flow_field=FlowField()):
+                flow_field.computed_goal = None
+                flow_field.set_goal(world.center, world.obstacle_manager, world.arena)
+                for enemy in enemies:
+                    flow_field.waypoints(enemy.position)
+
+            yield BenchCase("pathing.astar", params, astar)
+            yield BenchCase("pathing.flow_field", params, flow)
+
+def line_of_sight_cases(seed, enemy_counts, obstacle_counts):
+    for obstacle_count in obstacle_counts:
+        for enemy_count in enemy_counts:
+            world = BenchWorld(seed, obstacle_count)
+            enemies = world.spawn_enemies(enemy_count)
+            target = _Target(world.center)
+            obstacle_manager = world.obstacle_manager
+
+            def run(enemies=enemies, target=target, obstacle_manager=obstacle_manager):
+                for enemy in enemies:
+                    enemy.check_line_of_sight(target, obstacle_manager)
+
+            yield BenchCase(
+                "enemy.check_line_of_sight",
+                {"enemies": enemy_count, "obstacles": len(obstacle_manager.get_obstacles()), "calls_per_op": enemy_count},
+                run
+            )
+
+            def run_batched(enemies=enemies, target=target, obstacle_manager=obstacle_manager):
+                starts = [(e.position.x, e.position.y) for e in enemies]
+                batch_line_of_sight(starts, (target.position.x, target.position.y), obstacle_manager.get_obstacle_boxes())
+
+            yield BenchCase(
+                "line_of_sight.batch_line_of_sight",
+                {"enemies": enemy_count, "obstacles": len(obstacle_manager.get_obstacles()), "calls_per_op": 1},
+                run_batched
+            )
+
+def enemy_collision_cases(seed, enemy_counts):
+    for enemy_count in enemy_counts:
+        world = BenchWorld(seed, 0)
+        enemies = world.spawn_enemies(enemy_count)
+        start_positions = [e.position.copy() for e in enemies]
+        combat_system = CombatSystem()
+
+        def reset(enemies=enemies, start_positions=start_positions):
+            # Collisions push enemies apart, so restore the overlapping layout each op
+            for enemy, pos in zip(enemies, start_positions):
+                enemy.position = pos.copy()
+                enemy.rect.center = (int(pos.x), int(pos.y))
+
+        yield BenchCase(
+            "combat_system.resolve_enemy_collisions",
+            {"enemies": enemy_count},
+            lambda c=combat_system, e=enemies: c.resolve_enemy_collisions(e),
+            reset
+        )
+
+def enemy_integrate_cases(seed, enemy_counts):
+    dt = 1.0 / 60.0
+    for enemy_count in enemy_counts:
+        world = BenchWorld(seed, 0)
+        enemies = world.spawn_enemies(enemy_count)
+        store = EnemyStore()
+        for enemy in enemies:
+            # Mid-knockback, so the decay branch is exercised on every op
+            enemy.velocity = pygame.Vector2(enemy.speed, 0)
+            enemy.knockback = pygame.Vector2(300, 0)
+            stored = StoredEnemy(enemy.position.x, enemy.position.y)
+            stored.velocity = enemy.velocity
+            stored.knockback = enemy.knockback
+            store.add(stored)
+
+        def reset(enemies=enemies, store=store):
+            for enemy in enemies:
+                enemy.knockback = pygame.Vector2(300, 0)
+            store.knockback[:len(store)] = (300, 0)
+
+        def run_each(enemies=enemies):
+            for enemy in enemies:
+                enemy.integrate(dt)
+
+        yield BenchCase("enemy.integrate", {"enemies": enemy_count}, run_each, reset)
+        yield BenchCase("enemy_store.integrate", {"enemies": enemy_count}, lambda s=store: s.integrate(dt), reset)
+
+def generate_obstacles_cases(seed, obstacle_counts, large_counts=()):
+    # large_counts run on an arena with room to spare (~160px of side per obstacle)
+    sizes = [(count, 1920, 1080) for count in obstacle_counts]
+    sizes += [(count, int(count ** 0.5) * 160, int(count ** 0.5) * 160) for count in large_counts]
+    for obstacle_count, width, height in sizes:
+        world = BenchWorld(seed, 0, width, height)
+
+        def run(world=world, obstacle_count=obstacle_count):
+            world.obstacle_manager.generate_obstacles(world.arena, world.safe_zone, num_obstacles=obstacle_count)
+
+        def reset(seed=seed):
+            random.seed(seed)
+
+        reset()
+        run()
+        yield BenchCase(
+            "obstacle_manager.generate_obstacles",
+            {"requested": obstacle_count, "placed": world.obstacle_manager.generation_stats["placed"],
+             "arena": [width, height]},
+            run,
+            reset
+        )
+
+def free_space_cases(seed, obstacle_counts):
+    for obstacle_count in obstacle_counts:
+        world = BenchWorld(seed, obstacle_count)
+        free_space = world.obstacle_manager.free_space
+        area = world.arena.rect.inflate(-10, -10)
+        params = {"obstacles": len(world.obstacle_manager.get_obstacles())}
+
+        def rebuild(free_space=free_space, area=area):
+            free_space.tables = {}
+            free_space.table(area, (30, 30), 5)
+
+        rng = random.Random(seed)
+        exclude = [world.safe_zone]
+        yield BenchCase("free_space.table", params, rebuild)
+        yield BenchCase("free_space.sample", params,
+                        lambda f=free_space, a=area, r=rng, e=exclude: f.sample(r, a, (30, 30), 5, e))
+
+def vfx_draw_cases(seed, particle_counts):
+    surface = pygame.Surface((1920, 1080))
+    for particle_count in particle_counts:
+        random.seed(seed)
+        vfx = VFXManager()
+        # Roar-style bursts of 60 particles spread over the screen
+        for _ in range(max(1, particle_count // 60)):
+            pos = pygame.Vector2(random.randint(100, 1820), random.randint(100, 980))
+            vfx.emit(pos, 60, (255, 100, 0), 100, 300, size_max=6, life=0.6)
+        yield BenchCase(
+            "vfx_manager.draw",
+            {"particles": particle_count},
+            lambda v=vfx, s=surface: v.draw(s)
+        )
+
+def vfx_update_cases(seed, particle_counts):
+    for particle_count in particle_counts:
+        vfx = VFXManager()
+
+        def reset(vfx=vfx, particle_count=particle_count):
+            # Refill with fresh bursts; ops near the end of a burst's life also compact
+            random.seed(seed)
+            vfx.update(10.0)
+            for _ in range(max(1, particle_count // 60)):
+                pos = pygame.Vector2(random.randint(100, 1820), random.randint(100, 980))
+                vfx.emit(pos, 60, (255, 100, 0), 100, 300, size_max=6, life=0.6)
+            vfx.update(0.3)
+
+        yield BenchCase(
+            "vfx_manager.update",
+            {"particles": particle_count},
+            lambda v=vfx: v.update(1.0 / 60.0),
+            reset
+        )
+
+def background_draw_cases(seed, obstacle_counts):
+    surface = pygame.Surface((1920, 1080))
+    for obstacle_count in obstacle_counts:
+        world = BenchWorld(seed, obstacle_count)
+        obstacle_manager = world.obstacle_manager
+        params = {"obstacles": len(obstacle_manager.get_obstacles())}
+
+        def redraw(s=surface, a=world.arena, o=obstacle_manager):
+            s.fill((20, 20, 20))
+            a.draw(s)
+            o.draw(s)
+
+        yield BenchCase("background.redraw", params, redraw)
+        yield BenchCase(
+            "background_layer.draw",
+            params,
+            lambda b=BackgroundLayer(), s=surface, a=world.arena, o=obstacle_manager: b.draw(s, a, o)
+        )
+
+def roar_bomb_draw_cases(seed, config):
+    surface = pygame.Surface((1920, 1080))
+    random.seed(seed)
+    bomb = RoarBomb(pygame.Vector2(960, 540), pygame.Vector2(1, 0), config)
+    # Let the bomb settle and build up its steady-state wave count
+    for _ in range(180):
+        bomb.update(1.0 / 60.0, Arena(50, 50, 1820, 980))
+    yield BenchCase(
+        "roar_bomb.draw",
+        {"waves": len(bomb.waves), "radius": bomb.max_radius},
+        lambda b=bomb, s=surface: b.draw(s)
+    )
+
+def player_glow_draw_cases(seed, config_manager):
+    surface = pygame.Surface((1920, 1080))
+    random.seed(seed)
+    world = BenchWorld(seed, 0)
+    player = Player(world.center.x, world.center.y, config_manager)
+    # Mid-roar right after a dash: three expanding rings plus five fading ghosts
+    player.look_direction = pygame.Vector2(1, 0)
+    player.attempt_dash()
+    player.attempt_roar()
+    for _ in range(6):
+        player.update(1.0 / 60.0, InputFrame(), world.arena, world.obstacle_manager)
+    yield BenchCase(
+        "player.draw",
+        {"ghosts": len(player.trail_ghosts), "waves": len(player.roar_waves)},
+        lambda p=player, s=surface: p.draw(s)
+    )
+
+def brick_bomb_clearance_cases(seed, obstacle_counts, config):
+    for obstacle_count in obstacle_counts:
+        world = BenchWorld(seed, obstacle_count)
+        bomb = BrickBomb(world.center, pygame.Vector2(1, 0), config, player_diameter=30)
+        obstacle_manager = world.obstacle_manager
+        yield BenchCase(
+            "brick_bomb.check_clearance",
+            {"obstacles": len(obstacle_manager.get_obstacles())},
+            lambda b=bomb, a=world.arena, o=obstacle_manager: b.check_clearance(a, o)
+        )
+
+def simulation_snapshot_cases(seed, config_manager):
+    simulation = Simulation(config_manager, seed=seed)
+    with log.suppressed(): # Keep the JSON on stdout clean
+        simulation.reset()
+        for _ in range(120):
+            simulation.step(1.0 / 120.0, InputFrame(move=(1, 0)))
+    blob = simulation.snapshot()
+    params = {"enemies": len(simulation.enemies), "bytes": len(blob)}
+    yield BenchCase("simulation.snapshot", params, simulation.snapshot)
+    yield BenchCase("simulation.restore", params, lambda s=simulation, b=blob: s.restore(b))
+
+def event_log_cases():
+    # A private log into memory: the cost on the game thread of one hot-path message
+    event_log = EventLog(stream=io.StringIO())
+    yield BenchCase("event_log.info", {"rate_limited": True},
+                    lambda l=event_log: l.info("Enemy took %s damage. HP: %g", 10, 90.0))
+    yield BenchCase("event_log.filtered", {"level": "INFO"},
+                    lambda l=event_log: l.debug("Enemy Stuck! Switching to BACKOFF."))
+
+def telemetry_cases():
+    writer = TelemetryWriter()
+    writer.open(os.path.join(tempfile.gettempdir(), f"level_maze-bench-{os.getpid()}.lmt"), 4096)
+    position = pygame.Vector2(100, 200)
+    yield BenchCase("telemetry.emit", {"record_bytes": RECORD.size},
+                    lambda w=writer, p=position: w.damage(1, 10, 40.0, p))
+    writer.close()
+    os.remove(writer.path)
+
+def build_cases(seed, quick=False):
+    enemy_counts = QUICK_ENEMY_COUNTS if quick else ENEMY_COUNTS
+    obstacle_counts = QUICK_OBSTACLE_COUNTS if quick else OBSTACLE_COUNTS
+    particle_counts = QUICK_PARTICLE_COUNTS if quick else PARTICLE_COUNTS
+
+    config_manager = ConfigManager()
+    roar_bomb_config = config_manager.settings.abilities.roar_bomb
+    brick_bomb_config = config_manager.settings.abilities.brick_bomb
+
+    yield from find_path_cases(seed, obstacle_counts)
+    yield from flow_field_cases(seed, enemy_counts, obstacle_counts)
+    yield from pathing_crossover_cases(seed, obstacle_counts)
+    yield from line_of_sight_cases(seed, enemy_counts, obstacle_counts)
+    yield from enemy_collision_cases(seed, enemy_counts)
+    yield from enemy_integrate_cases(seed, enemy_counts)
+    yield from generate_obstacles_cases(seed, obstacle_counts, () if quick else LARGE_OBSTACLE_COUNTS)
+    yield from free_space_cases(seed, obstacle_counts)
+    yield from vfx_draw_cases(seed, particle_counts)
+    yield from vfx_update_cases(seed, particle_counts)
+    yield from background_draw_cases(seed, obstacle_counts)
+    yield from player_glow_draw_cases(seed, config_manager)
+    yield from roar_bomb_draw_cases(seed, roar_bomb_config)
+    yield from brick_bomb_clearance_cases(seed, obstacle_counts, brick_bomb_config)
+    yield from simulation_snapshot_cases(seed, config_manager)
+    yield from event_log_cases()
+    yield from telemetry_cases()
+
+def git_revision():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, timeout=5
+        )
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run level_maze microbenchmarks and print JSON results.")
+    parser.add_argument("--seed", type=int, default=1234, help="Seed used to build every benchmark world")
+    parser.add_argument("--quick", action="store_true", help="Smaller scales for a fast smoke run")
+    parser.add_argument("--filter", default=None, help="Only run cases whose name contains this string")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Minimum measured seconds per case")
+    parser.add_argument("--min-samples", type=int, default=5)
+    parser.add_argument("--max-samples", type=int, default=2000)
+    parser.add_argument("-o", "--output", default=None, help="Write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    log.stream = sys.stderr # Anything logged while building worlds stays off the JSON
+    results = []
+    for case in build_cases(args.seed, quick=args.quick):
+        if args.filter and args.filter not in case.name:
+            continue
+        result = measure(case, args.min_time, args.min_samples, args.max_samples)
+        results.append(result)
+        # Progress on stderr so stdout stays valid JSON
+        print(f"{result['name']} {result['params']}: {result['ops_per_sec']:.1f} ops/s, "
+              f"p50 {result['p50_ms']:.3f} ms, p99 {result['p99_ms']:.3f} ms", file=sys.stderr)
+
+    report = {
+        "schema": SCHEMA_VERSION,
+        "meta": {
+            "seed": args.seed,
+            "quick": args.quick,
+            "git_revision": git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -6,14 +6,15 @@ class BrickBomb:
     def __init__(self, position, direction, config, player_diameter=40):
         self.position = pygame.Vector2(position)
         self.direction = direction.normalize()
-        self.speed = config.get("throw_speed", 400.0)
-        self.fuse_timer = config.get("fuse_time", 3.0)
+        # config: BrickBombSettings
+        self.speed = config.throw_speed
+        self.fuse_timer = config.fuse_time
         self.init_fuse = self.fuse_timer
-        self.size = config.get("size", 40)
+        self.size = config.size
         
         # Clearance Settings
         self.player_diameter = player_diameter
-        self.clearance_dist = player_diameter * config.get("clearance_factor", 1.5)
+        self.clearance_dist = player_diameter * config.clearance_factor
         # We need 1.5x diameter clearance. 
         # Is it from CENTER or EDGE? "edges needs to be 1.5 the diameter ... away"
         # Edge-to-Edge distance >= 1.5 * diameter.
@@ -26,7 +27,7 @@ class BrickBomb:
         self.color = (200, 100, 50) # Brick color
         self.blink_timer = 0.0
 
-    def update(self, dt, arena, obstacles, enemies=None):
+    def update(self, dt, arena, obstacle_manager, enemies=None):
         if self.is_solidified:
             return
 
@@ -52,42 +53,40 @@ class BrickBomb:
             self.direction.y *= -1
 
         # 2. Obstacle & Enemy Collisions (Bounce)
-        # Combine list for checking
-        collidables = list(obstacles)
-        if enemies:
-             # Wrap enemies in simple objects or use their rects?
-             # Enemies have .rect, but we might want to treat them similar to obstacles for bouncing.
-             collidables.extend(enemies)
+        # Obstacles come from the spatial index, then enemies (same priority as before)
+        obs = obstacle_manager.first_collision(self.rect)
+        if obs is None and enemies:
+             # Enemies have .rect, so we treat them similar to obstacles for bouncing.
+             for enemy in enemies:
+                 if self.rect.colliderect(enemy.rect):
+                     obs = enemy
+                     break
              
         # Simple AABB reflection
-        for obs in collidables:
-            # For enemies, we might want to check if they are "active" or alive?
-            # Assuming passed list is valid.
-            if self.rect.colliderect(obs.rect):
-                # Resolve Collision reflectively
-                # Determine side of collision
-                clip = self.rect.clip(obs.rect)
-                
-                # If wide collision, likely vertical
-                if clip.width > clip.height:
-                    # Vertical Bounce
-                    self.direction.y *= -1
-                    # Push out
-                    if self.rect.center[1] < obs.rect.center[1]:
-                         self.position.y -= clip.height
-                    else:
-                         self.position.y += clip.height
+        if obs is not None:
+            # Resolve Collision reflectively
+            # Determine side of collision
+            clip = self.rect.clip(obs.rect)
+            
+            # If wide collision, likely vertical
+            if clip.width > clip.height:
+                # Vertical Bounce
+                self.direction.y *= -1
+                # Push out
+                if self.rect.center[1] < obs.rect.center[1]:
+                     self.position.y -= clip.height
                 else:
-                    # Horizontal Bounce
-                    self.direction.x *= -1
-                     # Push out
-                    if self.rect.center[0] < obs.rect.center[0]:
-                         self.position.x -= clip.width
-                    else:
-                         self.position.x += clip.width
-                
-                self.rect.center = (int(self.position.x), int(self.position.y))
-                break # Handle one at a time
+                     self.position.y += clip.height
+            else:
+                # Horizontal Bounce
+                self.direction.x *= -1
+                 # Push out
+                if self.rect.center[0] < obs.rect.center[0]:
+                     self.position.x -= clip.width
+                else:
+                     self.position.x += clip.width
+            
+            self.rect.center = (int(self.position.x), int(self.position.y))
 
         # Fuse Logic
         self.fuse_timer -= dt
@@ -95,7 +94,7 @@ class BrickBomb:
         
         if self.fuse_timer <= 0:
             # Check Placement Validity
-            if self.check_clearance(arena, obstacles):
+            if self.check_clearance(arena, obstacle_manager):
                 self.is_solidified = True
                 self.is_active = False # Handled by main to convert
             else:
@@ -114,7 +113,7 @@ class BrickBomb:
                 # Let's implementation: Once Fuse is 0, Try to Solidify. If fail, keep bouncing.
                 pass
 
-    def check_clearance(self, arena, obstacles):
+    def check_clearance(self, arena, obstacle_manager):
         # Edges needs to be 1.5 * diameter away from other edges.
         # My Edge to Their Edge distance.
         required_dist = self.clearance_dist
@@ -130,7 +129,9 @@ class BrickBomb:
             return False
             
         # 2. Check Obstacles
-        for obs in obstacles:
+        # Only obstacles within required_dist on both axes can fail the check
+        reach = int(math.ceil(required_dist)) * 2
+        for obs in obstacle_manager.query_rect(self.rect.inflate(reach, reach)):
             # Calculate generic distance between rectangles?
             # Or simplified center distance?
             # "Edges ... away"
@@ -163,6 +164,12 @@ class BrickBomb:
                 
         return True
 
+    def get_draw_bounds(self):
+        # Screen rects draw() can touch (dirty-rect rendering)
+        if self.is_solidified:
+            return [self.rect.copy()]
+        return [pygame.Rect(self.rect.centerx - 11, self.rect.centery - 11, 22, 22)]
+
     def draw(self, surface):
         if self.is_solidified:
             pygame.draw.rect(surface, self.color, self.rect)
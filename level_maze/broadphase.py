@@ -0,0 +1,116 @@
+import numpy as np
+
+class UniformGridBroadphase:
+    """
+    Per-frame uniform grid over circular entities (anything with .position and .radius).
+    build() buckets entity indices by center cell; candidate_pairs() and the
+    query helpers only return entities from neighbouring cells, so contact
+    checks cost O(N + contacts) instead of O(N^2).
+    Indices refer to the list passed to build() and come back sorted, so
+    callers resolve contacts in the same order as a plain nested loop.
+    """
+    # Half of the 3x3 neighbourhood: each adjacent cell pair is visited once
+    FORWARD_NEIGHBORS = ((1, 0), (-1, 1), (0, 1), (1, 1))
+
+    def __init__(self, min_cell_size=32, margin=16):
+        self.min_cell_size = min_cell_size
+        self.margin = margin # Slack for entities pushed mid-pass; at least one separation push (a radius)
+        self.cell_size = min_cell_size
+        self.max_radius = 0
+        self.cells = {} # Key: (cx, cy), Value: list of entity indices
+        self.keys = [] # Index -> (cx, cy)
+        self.count = 0
+
+    def __getstate__(self):
+        # Cells are rebuilt every frame
+        state = self.__dict__.copy()
+        state["cells"] = {}
+        state["keys"] = []
+        state["count"] = 0
+        return state
+
+    def build(self, entities, positions=None):
+        # positions: optional (N, 2) array of entity centers (e.g. EnemyStore.positions())
+        self.count = len(entities)
+        self.max_radius = max((e.radius for e in entities), default=0)
+        # Cells at least one contact distance wide -> contacts only span adjacent cells
+        self.cell_size = max(self.min_cell_size, 2 * self.max_radius + self.margin)
+
+        cs = self.cell_size
+        if positions is not None:
+            keys = map(tuple, np.floor_divide(positions, cs).astype(np.int64).tolist())
+        else:
+            keys = ((int(p.x // cs), int(p.y // cs)) for p in (e.position for e in entities))
+        keys = list(keys)
+        cells = {}
+        for i, key in enumerate(keys):
+            bucket = cells.get(key)
+            if bucket is None:
+                cells[key] = [i]
+            else:
+                bucket.append(i)
+        self.cells = cells
+        self.keys = keys # Cell each index is bucketed in
+
+    def candidate_pairs(self):
+        """Sorted (i, j) index pairs with i < j that may be in contact."""
+        pairs = []
+        cells = self.cells
+        for (cx, cy), members in cells.items():
+            n = len(members)
+            for a in range(n):
+                i = members[a]
+                for b in range(a + 1, n):
+                    j = members[b]
+                    pairs.append((i, j) if i < j else (j, i))
+            for dx, dy in self.FORWARD_NEIGHBORS:
+                other = cells.get((cx + dx, cy + dy))
+                if not other:
+                    continue
+                for i in members:
+                    for j in other:
+                        pairs.append((i, j) if i < j else (j, i))
+        pairs.sort()
+        return pairs
+
+    def move(self, index, x, y):
+        """
+        Re-buckets entity index at (x, y) after it was pushed mid-pass; returns
+        the sorted indices of the other entities that may now touch it.
+        """
+        cs = self.cell_size
+        key = (int(x // cs), int(y // cs))
+        old = self.keys[index]
+        if key != old:
+            bucket = self.cells[old]
+            bucket.remove(index)
+            if not bucket:
+                del self.cells[old]
+            self.cells.setdefault(key, []).append(index)
+            self.keys[index] = key
+        cx, cy = key
+        found = self._query_cells((cx - 1) * cs, (cy - 1) * cs, (cx + 1) * cs, (cy + 1) * cs) # 3x3 cells
+        found.remove(index)
+        return found
+
+    def _query_cells(self, left, top, right, bottom):
+        cs = self.cell_size
+        found = []
+        cells = self.cells
+        for cx in range(int(left // cs), int(right // cs) + 1):
+            for cy in range(int(top // cs), int(bottom // cs) + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.extend(bucket)
+        found.sort()
+        return found
+
+    def query_rect(self, rect):
+        """Sorted indices of entities whose bodies may overlap rect."""
+        reach = self.max_radius + self.margin
+        return self._query_cells(rect.left - reach, rect.top - reach, rect.right + reach, rect.bottom + reach)
+
+    def query_circle(self, center, radius):
+        """Sorted indices of entities whose centers may lie within radius of center."""
+        reach = radius + self.margin
+        return self._query_cells(center.x - reach, center.y - reach, center.x + reach, center.y + reach)
@@ -1,4 +1,8 @@
+import heapq
+import bisect
 import pygame
+from level_maze.broadphase import UniformGridBroadphase
+from level_maze.telemetry import telemetry, TARGET_PLAYER, TARGET_ENEMY
 
 class CombatSystem:
     def __init__(self):
@@ -6,15 +10,20 @@ class CombatSystem:
         self.knockback_multiplier = 50 # Force per point of damage
         self.cooldown_timers = {} # Key: enemy_id, Value: time since last hit
         self.hit_cooldown = 0.5 # Seconds before same pair can collide again (prevents mulit-frame hits)
+        # Rebuilt from enemy positions each frame; narrows every contact test to nearby enemies
+        self.broadphase = UniformGridBroadphase()
 
-    def resolve_collisions(self, player, enemies, dt):
+    # positions: optional (N, 2) array of enemy centers aligned with `enemies`
+    # (EnemyStore.positions()); lets the grid and pair checks skip per-enemy Vector2s.
+    def resolve_collisions(self, player, enemies, dt, positions=None):
         # Cooldown management (simple cleanup logic could go here, but for now just check)
         
         # Player vs Enemies
         player_rect = player.rect
-        player_center = player.position
+        self.broadphase.build(enemies, positions)
 
-        for enemy in enemies:
+        for index in self.broadphase.query_rect(player_rect):
+             enemy = enemies[index]
              # Check collision
              if player_rect.colliderect(enemy.rect):
                  # Check internal cooldown for this interaction if persistent
@@ -41,6 +50,8 @@ class CombatSystem:
         # 2. Apply Damage
         player.take_damage(self.damage_value)
         enemy.take_damage(self.damage_value)
+        telemetry.damage(TARGET_PLAYER, self.damage_value, player.health, player.position)
+        telemetry.damage(TARGET_ENEMY, self.damage_value, enemy.health, enemy.position)
         
         # 3. Apply Knockback
         force = self.damage_value * self.knockback_multiplier
@@ -52,63 +63,109 @@ class CombatSystem:
         # Move them out a tiny bit so next frame doesn't trigger collision before update
         # However, bounce velocity should handle it in next update.
 
-    def resolve_enemy_collisions(self, enemies):
-        # O(N^2) check - fine for small number of enemies (e.g. < 50)
-        # If many enemies, would need spatial partition (QuadTree or Grid)
+    def resolve_enemy_collisions(self, enemies, positions=None):
+        # Broadphase: uniform grid over enemy centers -> only neighbouring pairs are tested
+        # Pairs come back in (i, j) order, same as the old O(N^2) double loop
         
         count = len(enemies)
         if count < 2:
             return
 
-        for i in range(count):
+        broadphase = self.broadphase
+        broadphase.build(enemies, positions)
+        pairs = broadphase.candidate_pairs()
+        # A push can bring an enemy into contact with one the grid never paired it
+        # with. Pairs left out were at least margin apart, so once an enemy has been
+        # pushed more than half of it, it is re-bucketed and its new pairs that sort
+        # after the current one are merged into the walk.
+        slack = broadphase.margin / 2.0
+        drift = [0.0] * count
+        extra = [] # Heap of pairs found after a re-bucket
+        queued = set()
+        k = 0
+        while True:
+            if extra and (k == len(pairs) or extra[0] < pairs[k]):
+                i, j = heapq.heappop(extra)
+            elif k < len(pairs):
+                i, j = pairs[k]
+                k += 1
+            else:
+                break
             e1 = enemies[i]
-            for j in range(i + 1, count):
-                e2 = enemies[j]
-                
-                # Check distance
+            e2 = enemies[j]
+            
+            radius_sum = e1.radius + e2.radius
+            min_dist_sq = radius_sum * radius_sum
+
+            # Check distance
+            if positions is not None:
+                # Read the live rows directly; most candidate pairs are not touching
+                dx = positions.item(i, 0) - positions.item(j, 0)
+                dy = positions.item(i, 1) - positions.item(j, 1)
+                if dx * dx + dy * dy >= min_dist_sq:
+                    continue
+                dist_vec = pygame.Vector2(dx, dy)
+            else:
                 dist_vec = e1.position - e2.position
-                dist_sq = dist_vec.length_squared()
+            dist_sq = dist_vec.length_squared()
+            
+            if dist_sq < min_dist_sq:
+                # Collision detected!
+                dist = dist_vec.length()
                 
-                radius_sum = e1.radius + e2.radius
-                min_dist_sq = radius_sum * radius_sum
+                if dist == 0:
+                    dist_vec = pygame.Vector2(1, 0)
+                    dist = 1.0
                 
-                if dist_sq < min_dist_sq:
-                    # Collision detected!
-                    dist = dist_vec.length()
-                    
-                    if dist == 0:
-                        dist_vec = pygame.Vector2(1, 0)
-                        dist = 1.0
-                    
-                    overlap = radius_sum - dist
-                    
-                    # 1. Position Correction (Push apart)
-                    # Move each away by half overlap
-                    normal = dist_vec.normalize()
-                    separation = normal * (overlap / 2.0)
-                    
-                    e1.position += separation
-                    e2.position -= separation
-                    
-                    # Update Rects immediately so other collisions use fresh pos
-                    e1.rect.center = (int(e1.position.x), int(e1.position.y))
-                    e2.rect.center = (int(e2.position.x), int(e2.position.y))
-                    
-                    # 2. Physics Bounce (Knockback)
-                    # Apply a force to separate them velocity-wise
-                    bounce_force = 200 # Adjustable bounce strength
-                    
-                    # If they are moving towards each other, reflect?
-                    # For now just apply additive knockback to ensure they fly apart
-                    e1.apply_knockback(normal * bounce_force)
-                    e2.apply_knockback(-normal * bounce_force)
-
-    def resolve_bomb_collisions(self, bombs, enemies):
-        for bomb in bombs:
-            if not bomb.is_active:
-                continue
+                overlap = radius_sum - dist
+                
+                # 1. Position Correction (Push apart)
+                # Move each away by half overlap
+                normal = dist_vec.normalize()
+                separation = normal * (overlap / 2.0)
+                
+                e1.position += separation
+                e2.position -= separation
+                
+                # Update Rects immediately so other collisions use fresh pos
+                e1.rect.center = (int(e1.position.x), int(e1.position.y))
+                e2.rect.center = (int(e2.position.x), int(e2.position.y))
                 
-            for enemy in enemies:
+                # 2. Physics Bounce (Knockback)
+                # Apply a force to separate them velocity-wise
+                bounce_force = 200 # Adjustable bounce strength
+                
+                # If they are moving towards each other, reflect?
+                # For now just apply additive knockback to ensure they fly apart
+                e1.apply_knockback(normal * bounce_force)
+                e2.apply_knockback(-normal * bounce_force)
+
+                for index in (i, j):
+                    drift[index] += overlap / 2.0
+                    if drift[index] <= slack:
+                        continue
+                    drift[index] = 0.0
+                    x, y = positions[index] if positions is not None else enemies[index].position
+                    for other in broadphase.move(index, x, y):
+                        pair = (index, other) if index < other else (other, index)
+                        if pair <= (i, j) or pair in queued:
+                            continue
+                        at = bisect.bisect_left(pairs, pair)
+                        if at < len(pairs) and pairs[at] == pair:
+                            continue
+                        queued.add(pair)
+                        heapq.heappush(extra, pair)
+
+    def resolve_bomb_collisions(self, bombs, enemies, positions=None):
+        active_bombs = [bomb for bomb in bombs if bomb.is_active]
+        if not active_bombs:
+            return
+        self.broadphase.build(enemies, positions)
+
+        for bomb in active_bombs:
+            # Only enemies near the blast radius can receive a push
+            for index in self.broadphase.query_circle(bomb.position, bomb.max_radius):
+                enemy = enemies[index]
                 # Apply Push Force
                 # (Roar Bomb doesn't do damage, just pushes)
                 force = bomb.get_push_force(enemy.position)
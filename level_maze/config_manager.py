@@ -1,11 +1,31 @@
 import yaml
 import os
+import time
+from level_maze.settings import compile_settings
+from level_maze.event_log import log
 
 class ConfigManager:
+    """
+    Loads config.yaml. Gameplay sections are compiled into frozen typed
+    objects on self.settings (see level_maze.settings) whenever config is
+    assigned, so readers use plain attributes; get() remains for the tool
+    sections (replay, levels, profiler, ...) and caches each dotted lookup.
+    """
     def __init__(self, config_path="level_maze/config.yaml"):
         self.config_path = config_path
         self.config = self._load_config()
 
+    @property
+    def config(self):
+        return self._config
+
+    @config.setter
+    def config(self, config):
+        # Compile first: an invalid config raises and leaves the current one in place
+        self.settings = compile_settings(config)
+        self._config = config
+        self._lookups = {}
+
     def _load_config(self):
         if not os.path.exists(self.config_path):
             # Fallback path if running from different context
@@ -18,18 +38,62 @@ class ConfigManager:
         with open(self.config_path, "r") as f:
             return yaml.safe_load(f)
 
+    def reload(self):
+        """Re-reads the file; raises (yaml.YAMLError, ConfigError, OSError) without changing anything if it is invalid."""
+        self.config = self._load_config()
+
     def get(self, key, default=None):
-        keys = key.split(".")
-        value = self.config
-        try:
-            for k in keys:
-                value = value[k]
-            return value
-        except (KeyError, TypeError):
-            return default
+        found = self._lookups.get(key)
+        if found is None:
+            value = self.config
+            try:
+                for k in key.split("."):
+                    value = value[k]
+                found = (True, value)
+            except (KeyError, TypeError):
+                found = (False, None)
+            self._lookups[key] = found
+        return found[1] if found[0] else default
 
     def get_window_config(self):
         return self.config.get("window", {})
 
     def get_ability_config(self, ability_name):
         return self.config.get("abilities", {}).get(ability_name, {})
+
+class ConfigWatcher:
+    """
+    Hot reload: poll() once a frame; every `interval` seconds it compares the
+    config file's mtime and, when it changed, reloads it. Returns True when a
+    new config was applied. A file that fails to parse or validate is
+    reported once and the running config kept.
+    """
+    def __init__(self, config_manager, interval=0.5):
+        self.config_manager = config_manager
+        self.interval = interval
+        self.mtime = self._mtime()
+        self.next_check = time.perf_counter() + interval
+
+    def _mtime(self):
+        try:
+            return os.stat(self.config_manager.config_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def poll(self):
+        now = time.perf_counter()
+        if now < self.next_check:
+            return False
+        self.next_check = now + self.interval
+        mtime = self._mtime()
+        if mtime is None or mtime == self.mtime:
+            return False
+        self.mtime = mtime
+
+        try:
+            self.config_manager.reload()
+        except Exception as e:
+            log.error("Config reload failed, keeping the running config: %s", e)
+            return False
+        log.info("Config reloaded from %s", self.config_manager.config_path)
+        return True
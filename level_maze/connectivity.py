@@ -0,0 +1,162 @@
+import numpy as np
+
+# 8-connected, like the moves of Enemy.find_path and FlowField
+NEIGHBOURS = ((0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (-1, -1), (1, -1), (-1, 1))
+
+class NavConnectivity:
+    """
+    Connected regions of the walkable (unblocked) cells of ObstacleManager's
+    nav grid, as a union-find forest over flat cell indices, so a search
+    toward a goal in another region can be rejected in O(1) before it starts.
+
+    Kept in step with the grid lazily, on the first query after the obstacle
+    version changes: cells that became free are unioned with their free
+    neighbours; cells that became blocked may split a region, so just the
+    regions around them are re-flooded. A large change (new layout) is
+    relabelled from scratch. full_builds / incremental_updates count which
+    path each sync took.
+    """
+    REBUILD_FRACTION = 0.125 # Changed cells (share of the grid) above which a full relabel is cheaper
+
+    def __init__(self, obstacle_manager):
+        self.obstacle_manager = obstacle_manager
+        self.version = None
+        self.origin = None
+        self.rows = 0
+        self.cols = 0
+        self.free = None # bool [rows, cols] as of the last sync
+        self.parent = [] # Union-find parent per flat index (meaningful for free cells)
+        self.full_builds = 0
+        self.incremental_updates = 0
+
+    def sync(self, arena):
+        om = self.obstacle_manager
+        blocked = om.ensure_nav_grid(arena) # May rebuild -> read version afterwards
+        if self.version == om.version:
+            return
+        free = ~blocked
+        if self.free is None or self.free.shape != free.shape or self.origin != om.nav_origin:
+            self._build(free)
+        else:
+            changed = np.flatnonzero(self.free != free)
+            if len(changed) > self.REBUILD_FRACTION * free.size:
+                self._build(free)
+            elif len(changed):
+                self._update(free, changed)
+        self.origin = om.nav_origin
+        self.version = om.version
+
+    def find(self, i):
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]] # Path halving
+            i = parent[i]
+        return i
+
+    def _union(self, a, b):
+        ra = self.find(a)
+        rb = self.find(b)
+        if ra != rb:
+            self.parent[rb] = ra
+
+    def _neighbours(self, i):
+        y, x = divmod(i, self.cols)
+        for dx, dy in NEIGHBOURS:
+            nx = x + dx
+            ny = y + dy
+            if 0 <= nx < self.cols and 0 <= ny < self.rows:
+                yield ny * self.cols + nx
+
+    def _build(self, free):
+        self.rows, self.cols = free.shape
+        self.free = free.copy()
+        self.parent = list(range(free.size))
+        flat = self.free.ravel().tolist()
+        cols = self.cols
+        # One raster pass: union each free cell with the already-visited free
+        # cells among its neighbours (west, north-west, north, north-east)
+        for i in np.flatnonzero(self.free).tolist():
+            y, x = divmod(i, cols)
+            if x > 0 and flat[i - 1]:
+                self._union(i - 1, i)
+            if y > 0:
+                up = i - cols
+                if x > 0 and flat[up - 1]:
+                    self._union(up - 1, i)
+                if flat[up]:
+                    self._union(up, i)
+                if x < cols - 1 and flat[up + 1]:
+                    self._union(up + 1, i)
+        self.full_builds += 1
+
+    def _update(self, free, changed):
+        flat = free.ravel()
+        freed = [i for i in changed.tolist() if flat[i]]
+        blocked = [i for i in changed.tolist() if not flat[i]]
+        self.free = free.copy()
+        flat = self.free.ravel().tolist()
+
+        # Reset every freed cell before any union: a freed cell still pointing into
+        # its stale tree would otherwise merge (or, reset after being linked, split) regions
+        for i in freed:
+            self.parent[i] = i
+        for i in freed:
+            for n in self._neighbours(i):
+                if flat[n]:
+                    self._union(n, i)
+
+        if blocked:
+            # Removing cells can split their region; every resulting piece touches a
+            # removed cell, so flooding from their free neighbours relabels all of them
+            seen = set()
+            for i in blocked:
+                for start in self._neighbours(i):
+                    if not flat[start] or start in seen:
+                        continue
+                    seen.add(start)
+                    stack = [start]
+                    while stack:
+                        cell = stack.pop()
+                        self.parent[cell] = start
+                        for n in self._neighbours(cell):
+                            if flat[n] and n not in seen:
+                                seen.add(n)
+                                stack.append(n)
+        self.incremental_updates += 1
+
+    def _index(self, cell):
+        # cell: (x, y) in nav grid coordinates; None outside the grid
+        x = cell[0] - self.origin[0]
+        y = cell[1] - self.origin[1]
+        if 0 <= x < self.cols and 0 <= y < self.rows:
+            return y * self.cols + x
+        return None
+
+    def regions(self, cell):
+        """
+        Regions a search can expand into from cell: its own if it is free,
+        otherwise those of its free neighbours (an enemy hugging an obstacle
+        may stand in a blocked cell).
+        """
+        i = self._index(cell)
+        if i is None:
+            return set()
+        flat = self.free.ravel()
+        if flat[i]:
+            return {self.find(i)}
+        return {self.find(n) for n in self._neighbours(i) if flat[n]}
+
+    def path_exists(self, arena, start, end):
+        """Whether Enemy.find_path can reach cell end from cell start (its goal must be free)."""
+        self.sync(arena)
+        i = self._index(end)
+        if i is None or not self.free.ravel()[i]:
+            return False
+        return self.find(i) in self.regions(start)
+
+    def field_reaches(self, arena, cell, goal):
+        """Whether a FlowField toward goal gives cell a distance (the goal cell may be blocked)."""
+        self.sync(arena)
+        if max(abs(cell[0] - goal[0]), abs(cell[1] - goal[1])) <= 1:
+            return self._index(cell) is not None and self._index(goal) is not None
+        return not self.regions(cell).isdisjoint(self.regions(goal))
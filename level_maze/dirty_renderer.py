@@ -0,0 +1,59 @@
+import pygame
+
+class DirtyRectRenderer:
+    """
+    Opt-in renderer that only repaints what moved (window.dirty_rects).
+    Each frame it restores the previous and current bounds of every moving
+    entity from the BackgroundLayer, redraws the entities and pushes just
+    those regions with pygame.display.update(rects). Falls back to a full
+    redraw + flip whenever the background is rebuilt or after invalidate()
+    (e.g. a menu overlay covered the screen).
+    """
+    def __init__(self, background, draw_entities):
+        self.background = background
+        self.draw_entities = draw_entities # draw_entities(surface, simulation)
+        self.previous = []
+        self.needs_full = True
+
+    def invalidate(self):
+        self.needs_full = True
+
+    def collect_bounds(self, simulation):
+        bounds = []
+        for xtra in simulation.xtra_manager.get_xtras():
+            bounds.extend(xtra.get_draw_bounds())
+        for enemy in simulation.enemies:
+            bounds.extend(enemy.get_draw_bounds())
+        for bomb in simulation.roar_bombs:
+            bounds.extend(bomb.get_draw_bounds())
+        for bb in simulation.brick_bombs:
+            bounds.extend(bb.get_draw_bounds())
+        bounds.extend(simulation.player.get_draw_bounds())
+        # Blinking obstacles change colour without moving
+        bounds.extend(obs.rect.copy() for obs in self.background.blinking)
+        return bounds
+
+    def render(self, screen, simulation):
+        background = self.background
+        rebuilt = background.refresh(screen, simulation.arena, simulation.obstacle_manager)
+        bg_surface = background.surface
+
+        if rebuilt or self.needs_full:
+            screen.blit(bg_surface, (0, 0))
+            background.draw_blinking(screen)
+            self.draw_entities(screen, simulation)
+            pygame.display.flip()
+            self.previous = self.collect_bounds(simulation)
+            self.needs_full = False
+            return
+
+        current = self.collect_bounds(simulation)
+        screen_rect = screen.get_rect()
+        dirty = [r.clip(screen_rect) for r in self.previous + current]
+        dirty = [r for r in dirty if r.width and r.height]
+
+        screen.blits([(bg_surface, r.topleft, r) for r in dirty], doreturn=False)
+        background.draw_blinking(screen)
+        self.draw_entities(screen, simulation)
+        pygame.display.update(dirty)
+        self.previous = current
@@ -2,10 +2,19 @@ import pygame
 import random
 import math
 import heapq
+from level_maze.event_log import log
+from level_maze.telemetry import telemetry
+
+# Enemy.state names; their index is the state's code (EnemyStore.state, telemetry)
+STATES = ("PATROL", "CHASE", "INVESTIGATE", "STUCK_BACKOFF", "PATHFINDING")
+STATE_CODES = {name: code for code, name in enumerate(STATES)}
 
 class Enemy:
-    def __init__(self, x, y, radius=15, color=(255, 50, 50)):
+    def __init__(self, x, y, radius=15, color=(255, 50, 50), rng=None):
         self.position = pygame.Vector2(x, y)
+        # random.Random-like source for AI decisions (Simulation passes its "enemy_ai" stream)
+        self.rng = rng if rng is not None else random
+        self.velocity = pygame.Vector2(0, 0)
         self.radius = radius
         self.color = color
         self.speed = 100 # Slower than player
@@ -27,6 +36,7 @@ class Enemy:
         
         # Pathfinding / Backoff
         self.stuck_backoff_timer = 0.0
+        self.path = []
         self.path_step = 0
         self.repath_timer = 0.0
 
@@ -36,20 +46,33 @@ class Enemy:
 
         self.rect = pygame.Rect(x - radius, y - radius, radius * 2, radius * 2)
 
-    def update(self, dt, player, arena, obstacles):
+    def update(self, dt, player, arena, obstacle_manager, flow_field=None, can_see=None):
+        # flow_field: optional shared FlowField toward the player. When given, PATHFINDING
+        # reads waypoints from it instead of running a private A* search.
+        # can_see: optional precomputed LOS to the player (see line_of_sight.batch_line_of_sight).
+        # Same three phases EnemyStore.update runs for StoredEnemy, with the middle one batched.
+        previous_state = self.state
+        self.think(dt, player, arena, obstacle_manager, flow_field, can_see)
+        if self.state != previous_state:
+            telemetry.enemy_state(self, STATE_CODES[previous_state], STATE_CODES[self.state])
+        next_pos = self.integrate(dt)
+        self.resolve_move(next_pos, arena, obstacle_manager)
+
+    def think(self, dt, player, arena, obstacle_manager, flow_field=None, can_see=None):
+        # AI: state machine + desired velocity. Does not move the enemy.
         # 0. Stuck Detection (Global Check)
         if self.state == "CHASE":
             self.stuck_timer += dt
             if self.stuck_timer >= 1.0:
                 dist_moved = self.position.distance_to(self.last_position)
                 if dist_moved < self.stuck_threshold:
-                    print("Enemy Stuck! Switching to BACKOFF.")
+                    log.debug("Enemy Stuck! Switching to BACKOFF.")
                     self.state = "STUCK_BACKOFF"
-                    self.stuck_backoff_timer = random.uniform(0.5, 1.0)
+                    self.stuck_backoff_timer = self.rng.uniform(0.5, 1.0)
                     
                     # Pick a direction away from current look direction (which is likely into a wall)
                     # Simple heuristic: Reverse + random noise
-                    angle = random.uniform(135, 225) 
+                    angle = self.rng.uniform(135, 225) 
                     current_angle = math.degrees(math.atan2(self.look_direction.y, self.look_direction.x))
                     new_angle = math.radians(current_angle + angle)
                     self.look_direction = pygame.Vector2(math.cos(new_angle), math.sin(new_angle))
@@ -58,14 +81,15 @@ class Enemy:
                 self.last_position = self.position.copy()
 
         # 1. Vision Check (Simple LOS)
-        can_see = self.check_line_of_sight(player, obstacles)
+        if can_see is None:
+            can_see = self.check_line_of_sight(player, obstacle_manager)
         
         if self.state == "STUCK_BACKOFF":
             self.stuck_backoff_timer -= dt
             if self.stuck_backoff_timer <= 0:
-                print("Backoff done. Switching to PATHFINDING.")
+                log.debug("Backoff done. Switching to PATHFINDING.")
                 self.state = "PATHFINDING"
-                self.path = self.find_path(self.position, player.position, obstacles, arena)
+                self.path = self.get_path(player, obstacle_manager, arena, flow_field)
                 self.path_step = 0
                 self.repath_timer = 2.0 # Re-calculate path every 2 seconds if still pathfinding
 
@@ -74,12 +98,17 @@ class Enemy:
             
             # Optimization: If we can see the player again, switch back to Chase!
             if can_see:
-                 print("Regained LOS! Switching to CHASE.")
+                 log.debug("Regained LOS! Switching to CHASE.")
                  self.state = "CHASE"
                  self.target_position = player.position
             
+            elif flow_field is not None:
+                 # Shared field is kept current by the owner; just read the next few cells
+                 self.path = flow_field.waypoints(self.position)
+                 self.path_step = 0
+
             elif self.repath_timer <= 0:
-                 self.path = self.find_path(self.position, player.position, obstacles, arena)
+                 self.path = self.find_path(self.position, player.position, obstacle_manager, arena)
                  self.path_step = 0
                  self.repath_timer = 2.0
             
@@ -97,17 +126,18 @@ class Enemy:
         
         # 2. Behavior
         desired_direction = pygame.Vector2(0, 0)
+        state = self.state
         
-        if self.state == "CHASE" or self.state == "INVESTIGATE":
+        if state == "CHASE" or state == "INVESTIGATE":
             if self.target_position:
                 to_target = self.target_position - self.position
                 if to_target.length() > 10: # Reached target check
                     desired_direction = to_target.normalize()
                 else:
-                    if self.state == "INVESTIGATE":
+                    if state == "INVESTIGATE":
                         self.state = "PATROL" # Arrived at last known, resume patrol
         
-        elif self.state == "PATHFINDING":
+        elif state == "PATHFINDING":
              if self.path and self.path_step < len(self.path):
                  target_node = self.path[self.path_step]
                  to_node = target_node - self.position
@@ -116,45 +146,49 @@ class Enemy:
                  else:
                      desired_direction = to_node.normalize()
 
-        elif self.state == "STUCK_BACKOFF":
+        elif state == "STUCK_BACKOFF":
              desired_direction = self.look_direction
 
-        elif self.state == "PATROL":
+        elif state == "PATROL":
             self.patrol_timer -= dt
             if self.patrol_timer <= 0:
                 # Pick random direction
-                angle = random.uniform(0, 360)
+                angle = self.rng.uniform(0, 360)
                 rad = math.radians(angle)
                 self.look_direction = pygame.Vector2(math.cos(rad), math.sin(rad))
-                self.patrol_timer = random.uniform(1.0, 3.0)
+                self.patrol_timer = self.rng.uniform(1.0, 3.0)
             
             desired_direction = self.look_direction
 
         # 3. Movement (Tank Style: Move in Look Direction)
-        # Combine AI movement with knockback
-        
-        # Decay knockback
-        if self.knockback.length_squared() > 100:
-             self.knockback = self.knockback.move_towards(pygame.Vector2(0,0), self.friction * 200 * dt)
-        else:
-             self.knockback = pygame.Vector2(0,0)
-
-        # Basic velocity
         velocity = pygame.Vector2(0,0)
         if desired_direction.length_squared() > 0:
             self.look_direction = desired_direction # Instant turn
             velocity = self.look_direction * self.speed
+        self.velocity = velocity
+
+    def integrate(self, dt):
+        # Combine AI movement with knockback; returns the proposed next position
         
+        # Decay knockback
+        knockback = self.knockback
+        if knockback.length_squared() > 100:
+             self.knockback = knockback.move_towards(pygame.Vector2(0,0), self.friction * 200 * dt)
+        else:
+             self.knockback = pygame.Vector2(0,0)
+
         # Apply combined velocity
-        total_velocity = velocity + self.knockback
-        next_pos = self.position + total_velocity * dt
-        
+        total_velocity = self.velocity + self.knockback
+        return self.position + total_velocity * dt
+
+    def resolve_move(self, next_pos, arena, obstacle_manager):
+        # Accept next_pos, or bounce off whatever obstacle / arena wall it runs into
         next_rect = self.rect.copy()
         next_rect.center = (int(next_pos.x), int(next_pos.y))
         
         if arena.contains(next_rect):
             # Check collisions
-            colliding_obs = self.get_colliding_obstacle(next_rect, obstacles)
+            colliding_obs = self.get_colliding_obstacle(next_rect, obstacle_manager)
             
             if not colliding_obs:
                 self.position = next_pos
@@ -191,11 +225,11 @@ class Enemy:
                     self.last_bounce_pos = self.position.copy()
                 
                 if self.bounce_count >= 2:
-                    print(f"Enemy stuck bouncing ({self.bounce_count} times)! Randomizing direction.")
+                    log.debug("Enemy stuck bouncing (%d times)! Randomizing direction.", self.bounce_count)
                     # Pick random direction that is NOT the current normal (or close to it)
                     # Heuristic: Just random 360 for now, but ensure it's different enough?
                     # Random 360 is simplest and effective enough for loop breaking.
-                    angle = random.uniform(0, 360)
+                    angle = self.rng.uniform(0, 360)
                     rad = math.radians(angle)
                     self.look_direction = pygame.Vector2(math.cos(rad), math.sin(rad))
                     self.bounce_count = 0 # Reset
@@ -206,7 +240,7 @@ class Enemy:
                 
                 if self.state == "STUCK_BACKOFF":
                      # Pick new random direction
-                     angle = random.uniform(0, 360)
+                     angle = self.rng.uniform(0, 360)
                      rad = math.radians(angle)
                      self.look_direction = pygame.Vector2(math.cos(rad), math.sin(rad))
         else:
@@ -224,35 +258,32 @@ class Enemy:
                  
              if self.state == "PATROL": self.patrol_timer = 0.0
 
-    def check_obstacle_collision(self, rect, obstacles):
-        for obs in obstacles:
-            if rect.colliderect(obs.rect):
-                return True
-        return False
+    def check_obstacle_collision(self, rect, obstacle_manager):
+        return obstacle_manager.collides(rect)
 
-    def get_colliding_obstacle(self, rect, obstacles):
-        for obs in obstacles:
-            if rect.colliderect(obs.rect):
-                return obs
-        return None
+    def get_colliding_obstacle(self, rect, obstacle_manager):
+        return obstacle_manager.first_collision(rect)
 
-    def check_line_of_sight(self, player, obstacles):
+    def check_line_of_sight(self, player, obstacle_manager):
         # Simple Raycast: Line from self to player does not intersect any obstacle
-        line_start = self.position
-        line_end = player.position
-        
-        for obs in obstacles:
-            # clip_line returns the segment of the line inside the rect, or empty if none
-            if obs.rect.clipline(line_start, line_end):
-                return False
-        return True
+        # Only obstacles in the grid cells along the segment are clipline-tested
+        return not obstacle_manager.segment_blocked(self.position, player.position)
+
+    def get_path(self, player, obstacle_manager, arena, flow_field=None):
+        if flow_field is not None:
+            return flow_field.waypoints(self.position)
+        return self.find_path(self.position, player.position, obstacle_manager, arena)
 
-    def find_path(self, start, end, obstacles, arena):
+    def find_path(self, start, end, obstacle_manager, arena):
         """
         Calculates A* path from start Vector2 to end Vector2.
         Uses a coarse grid overlay on the arena.
         """
-        grid_size = 40 # Roughly enemy size + buffer
+        # Blocked cells come pre-rasterized from the ObstacleManager's nav grid
+        # (rebuilt only when obstacles are added or expire), so each neighbor check is O(1)
+        grid_size = obstacle_manager.nav_cell_size
+        blocked = obstacle_manager.get_nav_rows(arena)
+        origin_x, origin_y = obstacle_manager.nav_origin
         
         # Helper to snap pos to grid center
         def to_grid(pos):
@@ -263,6 +294,10 @@ class Enemy:
 
         start_node = to_grid(start)
         end_node = to_grid(end)
+
+        # Goal in another walkable region: A* would flood our whole region and fail anyway
+        if not obstacle_manager.connectivity.path_exists(arena, start_node, end_node):
+            return []
         
         # Arena bounds (in grid coords)
         min_x = int(arena.rect.left // grid_size)
@@ -295,29 +330,8 @@ class Enemy:
                 if not (min_x <= neighbor[0] <= max_x and min_y <= neighbor[1] <= max_y):
                     continue
                 
-                # Collision Check (Check if grid cell overlaps any obstacle)
-                # Create a rect for the grid cell
-                # INFLATE the check slightly to ensure clearance for the enemy (radius 15 -> 30 size)
-                # The grid is 40, so it's already "safe" if centered.
-                # But let's check a slightly larger area to discourage hugging walls too tight
-                
-                check_size = grid_size # 40
-                cell_rect = pygame.Rect(neighbor[0] * grid_size, neighbor[1] * grid_size, check_size, check_size)
-                
-                # Check walls (Arena) - technically handled by bounds but strict check good
-                if not arena.rect.contains(cell_rect):
-                    continue
-                    
-                # Check obstacles
-                blocked = False
-                for obs in obstacles:
-                    # Inflate obstacle for the check?
-                    # or inflate cell?
-                    # If we inflate cell by, say, 10px, we ensure we stand 5px away from any obstacle edge
-                    if cell_rect.inflate(10, 10).colliderect(obs.rect):
-                        blocked = True
-                        break
-                if blocked:
+                # Collision Check: cell outside the arena walls, or its 10px-inflated rect touches an obstacle
+                if blocked[neighbor[1] - origin_y][neighbor[0] - origin_x]:
                     continue
                 
                 # G Score
@@ -364,9 +378,25 @@ class Enemy:
         pygame.draw.rect(surface, (255, 0, 0), (self.position.x - 15, self.position.y - 20, 30, 4))
         pygame.draw.rect(surface, (0, 255, 0), (self.position.x - 15, self.position.y - 20, 30 * (max(0, self.health) / 50.0), 4))
 
+    def get_draw_bounds(self):
+        # Screen rects draw() can touch (dirty-rect rendering)
+        x, y = self.position
+        reach = max(self.radius + 7, 21) # Arrow tip + line width, health bar 20px above
+        bounds = [pygame.Rect(x - reach, y - reach, reach * 2, reach * 2)]
+        if self.state == "PATHFINDING" and self.path_step < len(self.path):
+            bounds.append(self.path_bounds())
+        return bounds
+
+    def path_bounds(self):
+        pts = [self.position] + self.path[self.path_step:]
+        left = min(p.x for p in pts)
+        top = min(p.y for p in pts)
+        rect = pygame.Rect(left, top, max(p.x for p in pts) - left + 1, max(p.y for p in pts) - top + 1)
+        return rect.inflate(12, 12) # Line width + target marker
+
     def take_damage(self, amount):
         self.health -= amount
-        print(f"Enemy took {amount} damage. HP: {self.health}")
+        log.info("Enemy took %s damage. HP: %g", amount, self.health)
 
     def apply_knockback(self, force_vector):
         self.knockback = force_vector
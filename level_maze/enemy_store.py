@@ -0,0 +1,246 @@
+import pygame
+import numpy as np
+from level_maze.enemy import Enemy, STATES, STATE_CODES
+from level_maze.telemetry import telemetry
+
+class StoreField:
+    """
+    Scalar Enemy attribute that lives in an EnemyStore column while the enemy is
+    attached, and in the instance dict (under the plain Enemy name) otherwise.
+    """
+    def __init__(self, column):
+        self.column = column
+
+    def __set_name__(self, owner, name):
+        self.local = name
+
+    def __get__(self, enemy, owner=None):
+        if enemy is None:
+            return self
+        store = enemy._store
+        if store is None:
+            return enemy.__dict__[self.local]
+        return getattr(store, self.column).item(enemy._slot)
+
+    def __set__(self, enemy, value):
+        store = enemy._store
+        if store is None:
+            enemy.__dict__[self.local] = value
+        else:
+            getattr(store, self.column)[enemy._slot] = value
+
+class VectorField(StoreField):
+    """
+    pygame.Vector2 attribute backed by an (N, 2) column. Reads return a fresh
+    Vector2, so `enemy.position += v` works but in-place edits like
+    `enemy.position.x = 5` only stick on a detached enemy.
+    """
+    def __get__(self, enemy, owner=None):
+        if enemy is None:
+            return self
+        store = enemy._store
+        if store is None:
+            return enemy.__dict__[self.local]
+        column = getattr(store, self.column)
+        slot = enemy._slot
+        return pygame.Vector2(column.item(slot, 0), column.item(slot, 1))
+
+    def __set__(self, enemy, value):
+        store = enemy._store
+        if store is None:
+            enemy.__dict__[self.local] = value
+        else:
+            getattr(store, self.column)[enemy._slot] = (value[0], value[1])
+
+class StateField(StoreField):
+    """Enemy.state as its string name, stored as a small int code."""
+    def __get__(self, enemy, owner=None):
+        if enemy is None:
+            return self
+        store = enemy._store
+        if store is None:
+            return enemy.__dict__[self.local]
+        return STATES[store.state.item(enemy._slot)]
+
+    def __set__(self, enemy, value):
+        store = enemy._store
+        if store is None:
+            enemy.__dict__[self.local] = value
+        else:
+            store.state[enemy._slot] = STATE_CODES[value]
+
+class StoredEnemy(Enemy):
+    """
+    Enemy whose kinematic fields route to its EnemyStore row once attached.
+    Detached (before add, or after being dropped) it behaves like a plain Enemy.
+    """
+    _store = None
+    _slot = None
+
+    position = VectorField("pos")
+    velocity = VectorField("vel")
+    knockback = VectorField("knockback")
+    speed = StoreField("speed")
+    friction = StoreField("friction")
+    health = StoreField("health")
+    state = StateField("state")
+
+class EnemyStore:
+    """
+    Structure-of-arrays home for enemy kinematics (position, velocity, knockback,
+    speed, friction, health, state). Attached Enemy objects become thin views
+    onto their row, so AI, drawing and combat code keep using enemy.position etc.
+    update() runs the per-enemy AI, then integrates knockback decay and movement
+    for every enemy in one NumPy pass, then resolves obstacle/arena contacts.
+    Rows stay in the same order as self.enemies.
+    """
+    VECTOR_COLUMNS = ("pos", "vel", "knockback")
+    SCALAR_COLUMNS = (("speed", np.float64), ("friction", np.float64),
+                      ("health", np.float64), ("state", np.int8))
+    # Column -> Enemy field, for attach/detach copies
+    FIELDS = (("pos", "position"), ("vel", "velocity"), ("knockback", "knockback"),
+              ("speed", "speed"), ("friction", "friction"), ("health", "health"),
+              ("state", "state"))
+
+    def __init__(self, capacity=64):
+        self.enemies = []
+        self.capacity = 0
+        self._grow(max(1, capacity))
+
+    def __len__(self):
+        return len(self.enemies)
+
+    def __getstate__(self):
+        # Only the live rows go into a snapshot
+        state = self.__dict__.copy()
+        count = len(self.enemies)
+        for name in self.VECTOR_COLUMNS:
+            state[name] = getattr(self, name)[:count].copy()
+        for name, _ in self.SCALAR_COLUMNS:
+            state[name] = getattr(self, name)[:count].copy()
+        state["capacity"] = 0
+        return state
+
+    def __setstate__(self, state):
+        capacity = max(1, len(state["enemies"]))
+        self.__dict__.update(state)
+        self._restore_capacity(capacity)
+
+    def _restore_capacity(self, capacity):
+        # Columns hold exactly the live rows; give them room to grow again
+        for name in self.VECTOR_COLUMNS:
+            column = np.zeros((capacity, 2), dtype=np.float64)
+            live = getattr(self, name)
+            column[:len(live)] = live
+            setattr(self, name, column)
+        for name, dtype in self.SCALAR_COLUMNS:
+            column = np.zeros(capacity, dtype=dtype)
+            live = getattr(self, name)
+            column[:len(live)] = live
+            setattr(self, name, column)
+        self.capacity = capacity
+
+    def _grow(self, capacity):
+        for name in self.VECTOR_COLUMNS:
+            column = np.zeros((capacity, 2), dtype=np.float64)
+            if self.capacity:
+                column[:self.capacity] = getattr(self, name)
+            setattr(self, name, column)
+        for name, dtype in self.SCALAR_COLUMNS:
+            column = np.zeros(capacity, dtype=dtype)
+            if self.capacity:
+                column[:self.capacity] = getattr(self, name)
+            setattr(self, name, column)
+        self.capacity = capacity
+
+    def add(self, enemy):
+        """Moves the enemy's kinematic state into a new row and attaches it."""
+        if not isinstance(enemy, StoredEnemy):
+            raise TypeError("EnemyStore only holds StoredEnemy instances")
+        if enemy._store is not None:
+            raise ValueError("Enemy already belongs to a store")
+        slot = len(self.enemies)
+        if slot >= self.capacity:
+            self._grow(self.capacity * 2)
+        values = [(field, getattr(enemy, field)) for _, field in self.FIELDS]
+        enemy._store = self
+        enemy._slot = slot
+        for field, value in values:
+            setattr(enemy, field, value)
+        self.enemies.append(enemy)
+        return enemy
+
+    def _detach(self, enemy):
+        values = [(field, getattr(enemy, field)) for _, field in self.FIELDS]
+        enemy._store = None
+        enemy._slot = None
+        for field, value in values:
+            setattr(enemy, field, value)
+
+    def clear(self):
+        for enemy in self.enemies:
+            self._detach(enemy)
+        self.enemies = []
+
+    def retain(self, alive):
+        """
+        Keeps only the enemies in `alive` (a subsequence of self.enemies, e.g. after
+        removing the dead) and compacts the arrays. Dropped enemies are detached
+        with their final values, so they are still readable.
+        """
+        keep = set(map(id, alive))
+        for enemy in self.enemies:
+            if id(enemy) not in keep:
+                self._detach(enemy)
+        rows = np.array([e._slot for e in alive], dtype=np.intp)
+        count = len(rows)
+        for name in self.VECTOR_COLUMNS:
+            column = getattr(self, name)
+            column[:count] = column[rows]
+        for name, _ in self.SCALAR_COLUMNS:
+            column = getattr(self, name)
+            column[:count] = column[rows]
+        for slot, enemy in enumerate(alive):
+            enemy._slot = slot
+        self.enemies = list(alive)
+
+    def positions(self):
+        """Live (N, 2) view of enemy positions, in the same order as self.enemies."""
+        return self.pos[:len(self.enemies)]
+
+    def integrate(self, dt):
+        """
+        Knockback decay + velocity composition for every row (Enemy.integrate, batched).
+        Returns the (N, 2) array of proposed next positions.
+        """
+        n = len(self.enemies)
+        knockback = self.knockback[:n]
+
+        # move_towards(0, friction * 200 * dt) while |knockback| > 10, else zero
+        length = np.sqrt((knockback * knockback).sum(axis=1))
+        step = self.friction[:n] * 200 * dt
+        scale = np.zeros(n)
+        moving = (length > 10) & (length > step)
+        scale[moving] = 1.0 - step[moving] / length[moving]
+        knockback *= scale[:, None]
+
+        return self.pos[:n] + (self.vel[:n] + knockback) * dt
+
+    def update(self, dt, player, arena, obstacle_manager, flow_field=None, visible=None):
+        """
+        Batched Enemy.update over every attached enemy.
+        visible: optional per-enemy line-of-sight flags, in row order.
+        """
+        enemies = self.enemies
+        # State codes live in one column, so changes are found with a single compare
+        previous_states = self.state[:len(enemies)].copy() if telemetry.buffer is not None else None
+        for i, enemy in enumerate(enemies):
+            can_see = None if visible is None else bool(visible[i])
+            enemy.think(dt, player, arena, obstacle_manager, flow_field, can_see)
+        if previous_states is not None:
+            for i in np.flatnonzero(self.state[:len(enemies)] != previous_states).tolist():
+                telemetry.enemy_state(enemies[i], previous_states.item(i), self.state.item(i))
+
+        next_positions = self.integrate(dt)
+        for enemy, (x, y) in zip(enemies, next_positions.tolist()):
+            enemy.resolve_move(pygame.Vector2(x, y), arena, obstacle_manager)
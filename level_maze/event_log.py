@@ -0,0 +1,151 @@
+import sys
+import time
+import atexit
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVELS = {"DEBUG": DEBUG, "INFO": INFO, "WARNING": WARNING, "ERROR": ERROR}
+LEVEL_NAMES = {value: name for name, value in LEVELS.items()}
+
+class EventLog:
+    """
+    Leveled game-event logger that keeps terminal I/O off the frame.
+    log.info("Enemy took %s damage. HP: %g", amount, health)
+    only appends (level, template, args) to a deque (append / popleft are
+    atomic, so producers never take a lock); a daemon thread formats and
+    writes the backlog every `interval` seconds in one write.
+
+    Each message key (the template unless key= is given) has a token bucket
+    of `burst` messages refilled at `rate` per second; messages over the
+    limit are dropped and counted, and the next one that gets through says
+    how many were suppressed. Args are formatted on the writer thread, so
+    pass plain values, not objects that keep changing.
+    """
+    def __init__(self, level=INFO, rate=5.0, burst=10, interval=0.1, stream=None):
+        self.level = level
+        self.rate = rate # Per key, messages per second; None disables rate limiting
+        self.burst = burst
+        self.interval = interval
+        self.stream = stream # None: sys.stdout at write time
+        self.queue = deque()
+        self.buckets = {} # key -> [tokens, last refill time, suppressed count]
+        self.suppressed_total = 0
+        self.local = threading.local()
+        self.wake = threading.Event()
+        self.thread = None
+        self.write_lock = threading.Lock() # Only between the writer thread and flush()
+
+    def configure(self, config):
+        """Applies a `logging:` config section (level, rate_limit, burst, flush_interval)."""
+        self.set_level(config.get("level", LEVEL_NAMES[self.level]))
+        self.rate = config.get("rate_limit", self.rate)
+        self.burst = config.get("burst", self.burst)
+        self.interval = config.get("flush_interval", self.interval)
+
+    def set_level(self, level):
+        """level: a LEVELS name or number. Takes effect for the next message."""
+        if isinstance(level, str):
+            level = LEVELS[level.upper()]
+        self.level = level
+
+    def cycle_level(self):
+        """Steps to the next level (DEBUG -> ... -> ERROR -> DEBUG); returns its name."""
+        order = sorted(LEVEL_NAMES)
+        self.level = order[(order.index(self.level) + 1) % len(order)] if self.level in order else INFO
+        return LEVEL_NAMES[self.level]
+
+    def debug(self, message, *args, key=None):
+        self.log(DEBUG, message, *args, key=key)
+
+    def info(self, message, *args, key=None):
+        self.log(INFO, message, *args, key=key)
+
+    def warning(self, message, *args, key=None):
+        self.log(WARNING, message, *args, key=key)
+
+    def error(self, message, *args, key=None):
+        self.log(ERROR, message, *args, key=key)
+
+    def log(self, level, message, *args, key=None):
+        if level < self.level or getattr(self.local, "suppressed", False):
+            return
+        suppressed = 0
+        if self.rate is not None:
+            key = message if key is None else key
+            now = time.monotonic()
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                bucket = self.buckets[key] = [float(self.burst), now, 0]
+            else:
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+            if bucket[0] < 1.0:
+                bucket[2] += 1
+                self.suppressed_total += 1
+                return
+            bucket[0] -= 1.0
+            suppressed = bucket[2]
+            bucket[2] = 0
+
+        self.queue.append((level, message, args, suppressed))
+        if self.thread is None:
+            self._start()
+        if level >= ERROR:
+            self.wake.set()
+
+    @contextmanager
+    def suppressed(self):
+        """Drops every message logged from this thread inside the block (background generation, benches)."""
+        previous = getattr(self.local, "suppressed", False)
+        self.local.suppressed = True
+        try:
+            yield
+        finally:
+            self.local.suppressed = previous
+
+    def _start(self):
+        self.thread = threading.Thread(target=self._run, name="event-log", daemon=True)
+        self.thread.start()
+        atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            self.wake.wait(self.interval)
+            self.wake.clear()
+            self.flush()
+
+    @staticmethod
+    def format(message, args, suppressed):
+        try:
+            text = message % args if args else message
+        except (TypeError, ValueError):
+            text = f"{message} {args}"
+        if suppressed:
+            text += f" ({suppressed} similar messages suppressed)"
+        return text
+
+    def flush(self):
+        """Writes everything queued so far; safe to call from any thread."""
+        with self.write_lock:
+            lines = []
+            queue = self.queue
+            while queue:
+                _, message, args, suppressed = queue.popleft()
+                lines.append(self.format(message, args, suppressed))
+            if not lines:
+                return
+            stream = self.stream if self.stream is not None else sys.stdout
+            try:
+                stream.write("\n".join(lines) + "\n")
+                stream.flush()
+            except (OSError, ValueError):
+                pass # Stream closed at interpreter exit
+
+# Shared by level_maze and runner_man
+log = EventLog()
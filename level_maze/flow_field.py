@@ -0,0 +1,172 @@
+import math
+import pygame
+import numpy as np
+
+class FlowField:
+    """
+    Shared shortest-path distance field toward one goal (the player) over the
+    ObstacleManager's nav grid. Every PATHFINDING enemy reads its next
+    waypoints from the same field, so pathing cost no longer grows with the
+    number of enemies. The field is only recomputed when the goal moves to
+    a different cell or the obstacle version changes, and only on the first
+    query after that.
+    """
+    # Enemy count from which one field rebuild beats a private A* per enemy
+    # (pathing.astar vs pathing.flow_field in level_maze.bench); below it the
+    # Simulation leaves enemies on A*
+    MIN_ENEMIES = 8
+    # Same moves and costs as Enemy.find_path
+    STRAIGHT_COST = 1.0
+    DIAGONAL_COST = 1.414
+    DIRS = ((0, 1, STRAIGHT_COST), (0, -1, STRAIGHT_COST), (1, 0, STRAIGHT_COST), (-1, 0, STRAIGHT_COST),
+            (1, 1, DIAGONAL_COST), (-1, -1, DIAGONAL_COST), (1, -1, DIAGONAL_COST), (-1, 1, DIAGONAL_COST))
+
+    def __init__(self):
+        self.obstacle_manager = None
+        self.arena = None
+        self.goal_cell = None
+        self.distances = None # rows[y][x] relative to origin, None = unreachable
+        self.computed_goal = None
+        self.computed_version = -1
+        self.recompute_count = 0
+
+    def __getstate__(self):
+        # The field itself is recomputed on the first query after a restore
+        state = self.__dict__.copy()
+        state["distances"] = None
+        state["computed_goal"] = None
+        state["computed_version"] = -1
+        return state
+
+    def set_goal(self, goal_pos, obstacle_manager, arena):
+        """Cheap per-frame call; marks the field stale only if something relevant changed."""
+        cs = obstacle_manager.nav_cell_size
+        self.obstacle_manager = obstacle_manager
+        self.arena = arena
+        self.goal_cell = (int(goal_pos.x // cs), int(goal_pos.y // cs))
+
+    def _ensure(self):
+        om = self.obstacle_manager
+        blocked = om.ensure_nav_grid(self.arena) # May rebuild -> read version afterwards
+        if self.computed_goal == self.goal_cell and self.computed_version == om.version:
+            return
+        self._compute(blocked)
+        self.computed_goal = self.goal_cell
+        self.computed_version = om.version
+        self.recompute_count += 1
+
+    def _compute(self, blocked):
+        # blocked: the nav grid as a bool array [rows, cols]
+        ox, oy = self.obstacle_manager.nav_origin
+        rows, cols = blocked.shape
+        gx = self.goal_cell[0] - ox
+        gy = self.goal_cell[1] - oy
+        if not (0 <= gx < cols and 0 <= gy < rows):
+            self.distances = [[None] * cols for _ in range(rows)]
+            return
+
+        # Reverse search from the goal, as whole-grid relaxation sweeps: each sweep
+        # gives every cell min(own, best neighbour + move cost) until nothing changes,
+        # which takes as many sweeps as the longest shortest path has moves. Like A*,
+        # moving onto a cell requires it to be free, but the cell an enemy starts in
+        # may itself be blocked (hugging an obstacle), so blocked cells get a distance
+        # but never pass one on. The goal cell always does, so a player standing next
+        # to an obstacle can still be reached. Each distance is the same left-to-right
+        # sum of move costs a heap-ordered Dijkstra would produce, bit for bit.
+        expands = ~blocked
+        expands[gy, gx] = True
+        dist = np.full((rows, cols), np.inf)
+        dist[gy, gx] = 0.0
+        # Distances cells pass on, padded with an unreachable border so every
+        # neighbour is a plain shifted view
+        source = np.full((rows + 2, cols + 2), np.inf)
+        inner = source[1:-1, 1:-1]
+        straight = (source[:-2, 1:-1], source[2:, 1:-1], source[1:-1, :-2], source[1:-1, 2:])
+        diagonal = (source[:-2, :-2], source[:-2, 2:], source[2:, :-2], source[2:, 2:])
+        best = np.empty_like(dist)
+        best_diagonal = np.empty_like(dist)
+        while True:
+            np.copyto(inner, dist, where=expands)
+            np.minimum(straight[0], straight[1], out=best)
+            np.minimum(best, straight[2], out=best)
+            np.minimum(best, straight[3], out=best)
+            np.minimum(diagonal[0], diagonal[1], out=best_diagonal)
+            np.minimum(best_diagonal, diagonal[2], out=best_diagonal)
+            np.minimum(best_diagonal, diagonal[3], out=best_diagonal)
+            # min(a, b) + cost == min(a + cost, b + cost): rounding is monotonic
+            best += self.STRAIGHT_COST
+            best_diagonal += self.DIAGONAL_COST
+            np.minimum(best, best_diagonal, out=best)
+            np.minimum(best, dist, out=best)
+            if np.array_equal(best, dist):
+                break
+            dist, best = best, dist
+        # Nested lists read faster than array indexing in the per-enemy walk
+        self.distances = [[None if d == math.inf else d for d in row] for row in dist.tolist()]
+
+    def distance_at(self, pos):
+        """Path cost (in cells) from pos to the goal, or None if unreachable."""
+        self._ensure()
+        cell = self._local_cell(pos)
+        if cell is None:
+            return None
+        return self.distances[cell[1]][cell[0]]
+
+    def _local_cell(self, pos):
+        cs = self.obstacle_manager.nav_cell_size
+        ox, oy = self.obstacle_manager.nav_origin
+        x = int(pos.x // cs) - ox
+        y = int(pos.y // cs) - oy
+        if 0 <= y < len(self.distances) and 0 <= x < len(self.distances[0]):
+            return (x, y)
+        return None
+
+    def _next_cell(self, x, y, blocked):
+        # Free neighbour that continues the shortest path from (x, y)
+        dist = self.distances
+        best = None
+        best_d = None
+        for dx, dy, cost in self.DIRS:
+            nx = x + dx
+            ny = y + dy
+            if not (0 <= ny < len(dist) and 0 <= nx < len(dist[0])):
+                continue
+            d = dist[ny][nx]
+            # The goal cell stays enterable even if the player stands right against an obstacle
+            if d is None or (blocked[ny][nx] and d != 0.0):
+                continue
+            d += cost
+            if best_d is None or d < best_d:
+                best = (nx, ny)
+                best_d = d
+        return best
+
+    def waypoints(self, pos, count=3):
+        """
+        Next `count` cell centers from pos toward the goal (world coordinates).
+        Empty if pos is already in the goal cell or the goal is unreachable.
+        """
+        # Unreachable from here: answer without (re)computing the field
+        cs = self.obstacle_manager.nav_cell_size
+        cell = (int(pos.x // cs), int(pos.y // cs))
+        if not self.obstacle_manager.connectivity.field_reaches(self.arena, cell, self.goal_cell):
+            return []
+        self._ensure()
+        cell = self._local_cell(pos)
+        if cell is None or self.distances[cell[1]][cell[0]] is None:
+            return []
+
+        blocked = self.obstacle_manager.get_nav_rows(self.arena)
+        cs = self.obstacle_manager.nav_cell_size
+        ox, oy = self.obstacle_manager.nav_origin
+        points = []
+        x, y = cell
+        for _ in range(count):
+            if self.distances[y][x] == 0.0:
+                break # Reached goal cell
+            nxt = self._next_cell(x, y, blocked)
+            if nxt is None:
+                break
+            x, y = nxt
+            points.append(pygame.Vector2((x + ox) * cs + cs / 2, (y + oy) * cs + cs / 2))
+        return points
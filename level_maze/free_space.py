@@ -0,0 +1,100 @@
+import pygame
+import numpy as np
+
+class FreeSpaceTable:
+    """
+    Every obstacle-free top-left position for one footprint, on a step-pixel
+    lattice over an area: positions (area.left + i * step, area.top + j * step)
+    whose footprint, grown by clearance, touches no obstacle. free holds their
+    flat indices, so drawing one is a single random index.
+    """
+    def __init__(self, area, size, clearance, step, obstacles):
+        self.area = pygame.Rect(area)
+        self.size = size
+        self.clearance = clearance
+        self.step = step
+        w, h = size
+        self.cols = max(0, (self.area.width - w) // step + 1)
+        self.rows = max(0, (self.area.height - h) // step + 1)
+        self.open = np.ones((self.rows, self.cols), dtype=bool)
+        for obs in obstacles:
+            self.block(self.open, obs.rect, clearance)
+        self.free = np.flatnonzero(self.open)
+
+    def span(self, rect, margin):
+        """Lattice rows/cols whose footprint, grown by margin, overlaps rect (as slices)."""
+        w, h = self.size
+        step = self.step
+        left, top = self.area.left, self.area.top
+        # Strict overlap on both axes, like Rect.colliderect
+        i0 = max(0, (rect.left - w - margin - left) // step + 1)
+        i1 = min(self.cols, -((left - rect.right - margin) // step))
+        j0 = max(0, (rect.top - h - margin - top) // step + 1)
+        j1 = min(self.rows, -((top - rect.bottom - margin) // step))
+        return slice(j0, j1), slice(i0, i1)
+
+    def block(self, grid, rect, margin=0):
+        rows, cols = self.span(rect, margin)
+        if rows.start < rows.stop and cols.start < cols.stop:
+            grid[rows, cols] = False
+
+    def position(self, index):
+        j, i = divmod(int(index), self.cols)
+        return self.area.left + i * self.step, self.area.top + j * self.step
+
+class FreeSpaceSampler:
+    """
+    Draws spawn positions clear of the obstacle layout in O(1). One
+    FreeSpaceTable per (area, footprint, clearance) is built on first use and
+    kept until the layout changes (ObstacleManager.version). Exclusion rects
+    (player safe zone, existing entities) are checked against the footprint
+    itself, without clearance: a few draws are rejection-tested, then the
+    table is masked so a free spot is found whenever one exists.
+    """
+    STEP = 4 # px between candidate positions
+    REJECTION_TRIES = 8
+
+    def __init__(self, obstacle_manager):
+        self.obstacle_manager = obstacle_manager
+        self.tables = {} # (area, size, clearance) -> FreeSpaceTable
+        self.version = None
+
+    def table(self, area, size, clearance=0):
+        if self.version != self.obstacle_manager.version:
+            self.tables = {}
+            self.version = self.obstacle_manager.version
+        key = (tuple(area), tuple(size), clearance)
+        table = self.tables.get(key)
+        if table is None:
+            table = FreeSpaceTable(area, size, clearance, self.STEP, self.obstacle_manager.get_obstacles())
+            self.tables[key] = table
+        return table
+
+    def sample(self, rng, area, size, clearance=0, exclude=()):
+        """
+        Top-left (x, y) of a random size footprint inside area that keeps
+        clearance from every obstacle and overlaps no rect in exclude, or None
+        if there is no such spot. rng is a random.Random-like source.
+        """
+        table = self.table(area, size, clearance)
+        free = table.free
+        if not len(free):
+            return None
+        w, h = size
+        if not exclude:
+            return table.position(free[int(rng.random() * len(free))])
+
+        exclude = list(exclude)
+        for _ in range(self.REJECTION_TRIES):
+            x, y = table.position(free[int(rng.random() * len(free))])
+            if pygame.Rect(x, y, w, h).collidelist(exclude) == -1:
+                return x, y
+
+        # Crowded: mask the exclusions out and draw from what is left
+        grid = table.open.copy()
+        for rect in exclude:
+            table.block(grid, rect)
+        free = np.flatnonzero(grid)
+        if not len(free):
+            return None
+        return table.position(free[int(rng.random() * len(free))])
@@ -1,5 +1,88 @@
 import pygame
 import math
+import copy
+from level_maze.event_log import log
+
+# Actions bound to a key and a gamepad button under controls.keyboard / controls.gamepad
+ACTIONS = ("dash", "roar", "secondary", "menu_wheel")
+DEFAULT_KEYS = {'dash': pygame.K_SPACE, 'roar': pygame.K_LSHIFT, 'secondary': pygame.K_e, 'menu_wheel': pygame.K_q}
+DEFAULT_BUTTONS = {'dash': 0, 'roar': 2, 'secondary': 3, 'menu_wheel': 4}
+# Actions also read from the keyboard; dash and roar only with controls.keyboard_abilities
+KEYBOARD_ACTIONS = ("secondary", "menu_wheel")
+# Menu confirm, sampled alongside the actions so menus get the same edges
+CONFIRM_KEYS = (pygame.K_RETURN, pygame.K_SPACE)
+CONFIRM_BUTTON = 0 # A / Cross
+
+KEY_ALIASES = {
+    'lshift': 'left shift',
+    'rshift': 'right shift',
+    'lctrl': 'left ctrl',
+    'rctrl': 'right ctrl',
+    'lalt': 'left alt',
+    'ralt': 'right alt',
+    'enter': 'return',
+    'esc': 'escape'
+}
+
+# High-rate events the main loop never reads (sticks and the mouse are polled
+# directly, and SDL keeps their state current without the events)
+IGNORED_EVENTS = (pygame.MOUSEMOTION, pygame.JOYAXISMOTION, pygame.JOYBALLMOTION,
+                  pygame.CONTROLLERAXISMOTION, pygame.FINGERMOTION, pygame.TEXTEDITING, pygame.TEXTINPUT)
+
+def parse_key(k_name):
+    """Key code for a config key name (pygame names plus a few aliases); ValueError if unknown."""
+    k_name = k_name.lower().strip()
+    return pygame.key.key_code(KEY_ALIASES.get(k_name, k_name))
+
+class InputFrame:
+    """
+    Snapshot of the player controls for a single simulation step.
+    Exposes the same query methods Player.update() uses on InputHandler,
+    so either one can be handed to the simulation.
+    pressed / released: action names that went down / up since the previous
+    sample (InputHandler.sample also reports "confirm" for menus). A frame
+    built without a previous sample treats the buttons it holds as pressed.
+    """
+    def __init__(self, move=(0, 0), look=(0, 0), dash=False, roar=False, secondary=False, aim_point=None,
+                 menu_wheel=False, pressed=None, released=()):
+        self.move = pygame.Vector2(move)
+        self.look = pygame.Vector2(look)
+        self.dash = dash
+        self.roar = roar
+        self.secondary = secondary
+        self.menu_wheel = menu_wheel
+        # Mouse aiming: look direction is resolved against the player position at query time
+        self.aim_point = pygame.Vector2(aim_point) if aim_point is not None else None
+        self.pressed = self.held() if pressed is None else frozenset(pressed)
+        self.released = frozenset(released)
+
+    def held(self):
+        return frozenset(action for action in ACTIONS if getattr(self, action))
+
+    def with_edges(self, pressed=(), released=()):
+        """Same controls with other edges; with_edges() (none) is the frame for later steps of one sample."""
+        frame = copy.copy(self)
+        frame.pressed = frozenset(pressed)
+        frame.released = frozenset(released)
+        return frame
+
+    def get_move_vector(self):
+        return pygame.Vector2(self.move)
+
+    def get_look_vector(self, player_pos):
+        if self.aim_point is not None:
+            direction = self.aim_point - player_pos
+            if direction.length_squared() > 0:
+                return direction.normalize()
+            return pygame.Vector2(0, 0)
+        return pygame.Vector2(self.look)
+
+    def get_abilities_state(self):
+        # Edge-triggered: holding a button fires it once
+        return {'dash': 'dash' in self.pressed, 'roar': 'roar' in self.pressed}
+
+    def get_secondary_ability_state(self):
+        return self.secondary
 
 class InputHandler:
     def __init__(self, config_manager=None):
@@ -12,53 +95,62 @@ class InputHandler:
         
         self.controller_mode = len(self.joysticks) > 0
         if self.controller_mode:
-            print(f"Controller detected: {self.joysticks[0].get_name()}")
+            log.info("Controller detected: %s", self.joysticks[0].get_name())
             
-        # Load Controls from Config
+        # Load Controls from Config, resolved to key codes / button numbers once here
         self.controls = {
-            'keyboard': {'dash': pygame.K_SPACE, 'roar': pygame.K_LSHIFT},
-            'gamepad': {'dash': 0, 'roar': 2}
+            'keyboard': dict(DEFAULT_KEYS),
+            'gamepad': dict(DEFAULT_BUTTONS)
         }
+        self.keyboard_actions = KEYBOARD_ACTIONS
         
         if config_manager:
-            try:
-                kb_config = config_manager.get("controls.keyboard")
-                gp_config = config_manager.get("controls.gamepad")
-                
-                # Helper to parse key with aliases
-                def parse_key(k_name):
-                    k_name = k_name.lower().strip()
-                    aliases = {
-                        'lshift': 'left shift',
-                        'rshift': 'right shift',
-                        'lctrl': 'left ctrl',
-                        'rctrl': 'right ctrl',
-                        'lalt': 'left alt',
-                        'ralt': 'right alt',
-                        'enter': 'return',
-                        'esc': 'escape'
-                    }
-                    return pygame.key.key_code(aliases.get(k_name, k_name))
-
-                if kb_config:
-                    if 'dash' in kb_config:
-                        try:
-                            self.controls['keyboard']['dash'] = parse_key(kb_config['dash'])
-                        except ValueError as ve:
-                            print(f"Warning: Invalid keyboard key '{kb_config['dash']}' for dash. Using default.")
-                    
-                    if 'roar' in kb_config: 
-                        try:
-                            self.controls['keyboard']['roar'] = parse_key(kb_config['roar'])
-                        except ValueError as ve:
-                            print(f"Warning: Invalid keyboard key '{kb_config['roar']}' for roar. Using default.")
-
-                if gp_config:
-                    if 'dash' in gp_config: self.controls['gamepad']['dash'] = int(gp_config['dash'])
-                    if 'roar' in gp_config: self.controls['gamepad']['roar'] = int(gp_config['roar'])
-                    
-            except Exception as e:
-                print(f"Error loading controls from config: {e}. Using defaults.")
+            # Compiled and type-checked already (level_maze.settings); key names are checked here
+            controls = config_manager.settings.controls
+            for action in ACTIONS:
+                key_name = getattr(controls.keyboard, action)
+                try:
+                    self.controls['keyboard'][action] = parse_key(key_name)
+                except ValueError:
+                    log.warning("Invalid keyboard key '%s' for %s. Using default.", key_name, action)
+                self.controls['gamepad'][action] = getattr(controls.gamepad, action)
+            if controls.keyboard_abilities:
+                self.keyboard_actions = ACTIONS
+
+        self.last_held = frozenset() # Actions down at the previous sample()
+
+        pygame.event.set_blocked(IGNORED_EVENTS)
+
+    def sample(self, player_pos):
+        """
+        Polls the live devices once (one keyboard state read, one pass over
+        the pad) and returns an InputFrame for this step, with edges against
+        the previous sample. Call it every frame, menus included, so a button
+        that confirmed a menu is not a fresh press when play resumes.
+        """
+        keys = pygame.key.get_pressed()
+        held = {action for action in ACTIONS if self.is_held(action, keys)}
+        if self.is_confirm_held(keys):
+            held.add('confirm')
+        held = frozenset(held)
+        pressed = held - self.last_held
+        released = self.last_held - held
+        self.last_held = held
+
+        frame = InputFrame(
+            move=self.read_move_vector(keys),
+            dash='dash' in held,
+            roar='roar' in held,
+            secondary='secondary' in held,
+            menu_wheel='menu_wheel' in held,
+            pressed=pressed,
+            released=released
+        )
+        if self.controller_mode:
+            frame.look = self.get_look_vector(player_pos)
+        else:
+            frame.aim_point = pygame.Vector2(pygame.mouse.get_pos())
+        return frame
 
     def get_move_vector(self):
         """
@@ -66,6 +158,10 @@ class InputHandler:
         Mapped to RIGHT STICK (GDD 2.2).
         Fallback: WASD.
         """
+        return self.read_move_vector(None if self.controller_mode else pygame.key.get_pressed())
+
+    def read_move_vector(self, keys):
+        # keys: get_pressed() result (only read without a controller)
         vector = pygame.Vector2(0, 0)
 
         if self.controller_mode:
@@ -82,7 +178,6 @@ class InputHandler:
                 pass 
         else:
             # Keyboard Fallback (WASD)
-            keys = pygame.key.get_pressed()
             if keys[pygame.K_w]:
                 vector.y -= 1
             if keys[pygame.K_s]:
@@ -126,87 +221,43 @@ class InputHandler:
 
         return vector # Return default or previously known vector logic (handled in player)
 
+    def is_held(self, action, keys=None):
+        """Whether action's gamepad button, or key for keyboard_actions, is down; keys: a get_pressed() result to reuse."""
+        if keys is None:
+            keys = pygame.key.get_pressed()
+        if action in self.keyboard_actions and keys[self.controls['keyboard'][action]]:
+            return True
+        if self.controller_mode:
+            try:
+                return bool(self.joysticks[0].get_button(self.controls['gamepad'][action]))
+            except pygame.error:
+                pass
+        return False
+
+    def is_confirm_held(self, keys):
+        if any(keys[key] for key in CONFIRM_KEYS):
+            return True
+        if self.controller_mode:
+            try:
+                return bool(self.joysticks[0].get_button(CONFIRM_BUTTON))
+            except pygame.error:
+                pass
+        return False
+
     def get_abilities_state(self):
         """
         Returns dict of ability states: {'dash': bool, 'roar': bool}
         Dash: Configured Key / Controller Button
         Roar: Configured Key / Controller Button
         """
-        states = {'dash': False, 'roar': False}
-        
-        dash_btn = self.controls['gamepad']['dash']
-        roar_btn = self.controls['gamepad']['roar']
-        
-        dash_key = self.controls['keyboard']['dash']
-        roar_key = self.controls['keyboard']['roar']
-
-        if self.controller_mode:
-            try:
-                # Dash
-                if self.joysticks[0].get_button(dash_btn):
-                    states['dash'] = True
-                
-                # Roar
-                if self.joysticks[0].get_button(roar_btn):
-                    states['roar'] = True
-            except:
-                pass
-
-        return states
-
-    def get_secondary_ability_state(self):
-        is_secondary = False
-        
-        # Keyboard
         keys = pygame.key.get_pressed()
-        sec_key_name = "e"
-        if 'keyboard' in self.controls:
-             sec_key_name = self.controls.get('keyboard', {}).get('secondary', 'e')
-
-        sec_key = pygame.key.key_code(sec_key_name)
-        if keys[sec_key]:
-            is_secondary = True
-            
-        # Gamepad
-        if self.controller_mode and len(self.joysticks) > 0:
-            sec_btn = 3
-            if 'gamepad' in self.controls:
-                 sec_btn = int(self.controls.get('gamepad', {}).get('secondary', 3))
+        return {'dash': self.is_held('dash', keys), 'roar': self.is_held('roar', keys)}
 
-            try:
-                if self.joysticks[0].get_button(sec_btn):
-                    is_secondary = True
-            except:
-                pass
-                
-        return is_secondary
+    def get_secondary_ability_state(self):
+        return self.is_held('secondary')
 
     def get_menu_wheel_state(self):
-        is_menu = False
-        
-        # Keyboard
-        keys = pygame.key.get_pressed()
-        menu_key_name = "q"
-        if 'keyboard' in self.controls:
-             menu_key_name = self.controls.get('keyboard', {}).get('menu_wheel', 'q')
-             
-        menu_key = pygame.key.key_code(menu_key_name)
-        if keys[menu_key]:
-            is_menu = True
-            
-        # Gamepad
-        if self.controller_mode and len(self.joysticks) > 0:
-            menu_btn = 4
-            if 'gamepad' in self.controls:
-                 menu_btn = int(self.controls.get('gamepad', {}).get('menu_wheel', 4))
-
-            try:
-                if self.joysticks[0].get_button(menu_btn):
-                    is_menu = True
-            except:
-                pass
-                
-        return is_menu
+        return self.is_held('menu_wheel')
 
     def get_ui_state(self, events):
         """
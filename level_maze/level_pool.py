@@ -0,0 +1,91 @@
+import random
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from level_maze.event_log import log
+
+def build_level(config, width, height, seed, attempts=4):
+    """
+    Generates a complete match (obstacles, enemy spawns, player) and returns
+    (seed, Simulation.snapshot()). A layout that could not place every
+    requested obstacle and enemy is rejected and the next seed tried; the
+    last attempt is kept either way. Runs in a pool worker.
+    """
+    from level_maze.config_manager import ConfigManager
+    from level_maze.simulation import Simulation
+
+    config_manager = ConfigManager()
+    config_manager.config = config # The parent's config, not the file's
+    obstacle_count = config_manager.settings.obstacles.count
+    enemy_count = config_manager.settings.enemies.count
+
+    with log.suppressed(): # Generation logs belong to the live game, not the pool
+        for attempt in range(attempts):
+            simulation = Simulation(config_manager, width, height, seed=seed)
+            simulation.reset(seed)
+            placed = simulation.obstacle_manager.generation_stats["placed"]
+            if placed >= obstacle_count and len(simulation.enemies) >= enemy_count:
+                break
+            if attempt < attempts - 1:
+                seed = random.SystemRandom().getrandbits(32)
+    return seed, simulation.snapshot()
+
+class LevelPool:
+    """
+    Keeps up to `size` ready-made levels (Simulation snapshots) generating in
+    the background, so a restart is a Simulation.restore() instead of a full
+    generate-and-spawn. worker "process" generates in a separate process
+    (no GIL contention with the render loop); "thread" in a thread.
+    take() never blocks: it returns None when nothing is ready yet and the
+    caller falls back to Simulation.reset().
+    """
+    def __init__(self, config_manager, width, height, size=2, worker="process"):
+        self.config = config_manager.config
+        self.width = width
+        self.height = height
+        self.size = size
+        if worker == "process":
+            # spawn, not fork: the parent already owns an SDL window
+            self.executor = ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn"))
+        else:
+            self.executor = ThreadPoolExecutor(1, thread_name_prefix="level-pool")
+        self.pending = deque() # Futures in submission order
+        self.hits = 0
+        self.misses = 0
+        self.fill()
+
+    def fill(self):
+        while len(self.pending) < self.size:
+            seed = random.SystemRandom().getrandbits(32)
+            self.pending.append(self.executor.submit(build_level, self.config, self.width, self.height, seed))
+
+    def take(self):
+        """A ready level's snapshot, or None; the queue is topped up either way."""
+        for future in self.pending:
+            if future.done():
+                self.pending.remove(future)
+                break
+        else:
+            self.misses += 1
+            return None
+
+        self.fill()
+        try:
+            _, snapshot = future.result()
+        except Exception as e:
+            log.error("Level generation failed: %s", e)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return snapshot
+
+    def set_config(self, config):
+        """Drops the levels built from the previous config (hot reload) and queues new ones."""
+        self.config = config
+        for future in self.pending:
+            future.cancel()
+        self.pending.clear()
+        self.fill()
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -1,53 +1,56 @@
 import pygame
 import sys
+import os
 import math
-from level_maze.config_manager import ConfigManager
-from level_maze.arena import Arena
-from level_maze.player import Player
-from level_maze.obstacle_manager import ObstacleManager
-from level_maze.obstacle_manager import ObstacleManager
-from level_maze.enemy import Enemy
-import random
+import time
+from level_maze.config_manager import ConfigManager, ConfigWatcher
 from level_maze.input_handler import InputHandler
-from level_maze.combat_system import CombatSystem
 from level_maze.radial_menu import RadialMenu
-from level_maze.xtra_manager import XtraManager
-from level_maze.brick_bomb import BrickBomb
+from level_maze.simulation import Simulation
+from level_maze.background import BackgroundLayer
+from level_maze.dirty_renderer import DirtyRectRenderer
+from level_maze.timestep import FixedTimestep, FramePacer
+from level_maze.replay import ReplayRecorder
+from level_maze.level_pool import LevelPool
+from level_maze.profiler import FrameProfiler, ProfilerOverlay
+from level_maze.event_log import log
+from level_maze.telemetry import telemetry
 
 def main():
     # ... (Config loading) ...
     try:
         config_manager = ConfigManager()
-        window_config = config_manager.get_window_config()
     except Exception as e:
-        print(f"Failed to load configuration: {e}")
+        log.error("Failed to load configuration: %s", e)
         return
 
+    # Game events go through the buffered event log; F8 cycles its level at runtime
+    log.configure(config_manager.get("logging", {}) or {})
+
     # Initialize Pygame
     pygame.init()
     
-    width = window_config.get("width", 800)
-    height = window_config.get("height", 600)
-    title = window_config.get("title", "Level Maze")
-    fps = window_config.get("fps", 60)
+    window_config = config_manager.settings.window
+    width = window_config.width
+    height = window_config.height
+    title = window_config.title
+    fps = window_config.fps
 
     screen = pygame.display.set_mode((width, height))
     pygame.display.set_caption(title)
-    clock = pygame.time.Clock()
-    
-    # Initialize Game Objects
-    arena_width = width - 100
-    arena_height = height - 100
-    arena_x = 50
-    arena_y = 50
-    arena = Arena(arena_x, arena_y, arena_width, arena_height)
+    # "precise": perf_counter deadlines + hybrid sleep; "clock": pygame.time.Clock.tick
+    pacer = FramePacer(fps, window_config.pacing)
     
-    # Placeholder for game objects
-    player = None
+    # Initialize Game Objects (World state lives in the Simulation)
+    simulation = Simulation(config_manager, width, height)
+    # Physics runs in whole ticks of 1 / tick_rate regardless of the display rate
+    fixed_step = FixedTimestep(config_manager.settings.simulation.tick_rate,
+                               config_manager.settings.simulation.max_substeps)
     input_handler = InputHandler(config_manager)
-    obstacle_manager = ObstacleManager()
-    combat_system = CombatSystem()
-    xtra_manager = XtraManager()
+    # Floor, walls and settled obstacles, redrawn only when the layout changes
+    background = BackgroundLayer()
+    # Opt-in: repaint only the regions entities moved through (software-rendered displays)
+    dirty_renderer = DirtyRectRenderer(background, draw_entities) if window_config.dirty_rects else None
     
     # UI Components
     radial_menu = RadialMenu((width // 2, height // 2))
@@ -58,65 +61,41 @@ def main():
         {'id': 'cancel', 'name': 'Cancel'}
     ])
     
-    enemies = []
-    roar_bombs = []
-    brick_bombs = []
-    
-    def reset_game():
-        # Create new player
-        new_player = Player(width // 2, height // 2, config_manager)
-        
-        # Reset Obstacles
-        obstacle_manager.reset()
-        xtra_manager.reset()
-        # Define a safe zone around player for spawning
-        player_safe_zone = pygame.Rect(new_player.position.x - 100, new_player.position.y - 100, 200, 200)
-        obstacle_manager.generate_obstacles(arena, player_safe_zone)
-        
-        # Reset Enemies
-        enemies.clear()
-        enemies.clear()
-        roar_bombs.clear()
-        brick_bombs.clear()
-        enemy_count = config_manager.get("enemies.count", 5)
-        spawn_enemies(enemy_count, new_player)
-        
-        print("Game Reset!")
-        return new_player
+    # Initial Game Start
+    simulation.reset()
+    replay_config = config_manager.get("replay", {}) or {}
+    recorder = start_recording(simulation, replay_config)
+    # "Retry Level" restores this instead of generating a new layout
+    level_start = simulation.snapshot()
+    level_settings = config_manager.settings # What level_start was built with
+    quicksave_path = config_manager.get("snapshots.quicksave", "saves/quicksave.lms")
+    quicksave = None # In-memory checkpoint (F5 saves, F9 loads)
+    # Next levels generate in the background while this one is played
+    pool_size = config_manager.get("levels.pool_size", 2)
+    level_pool = LevelPool(config_manager, width, height, pool_size,
+                           config_manager.get("levels.worker", "process")) if pool_size > 0 else None
 
-    def spawn_enemies(count, player_ref):
-        spawned_count = 0
-        attempts = 0
-        max_attempts = 1000
-        
-        while spawned_count < count and attempts < max_attempts:
-            attempts += 1
-            # Random position in arena (padding for wall)
-            # Enemy radius is 15. Padding 20.
-            ex = random.randint(arena.rect.left + 20, arena.rect.right - 20)
-            ey = random.randint(arena.rect.top + 20, arena.rect.bottom - 20)
-            
-            enemy_rect = pygame.Rect(ex - 15, ey - 15, 30, 30)
-            
-            # Check Obstacles
-            collides = False
-            for obs in obstacle_manager.get_obstacles():
-                # Inflate obstacle slightly to ensure gap
-                if enemy_rect.colliderect(obs.rect.inflate(10, 10)):
-                    collides = True
-                    break
-            
-            if not collides:
-                # Also check player safe zone (don't spawn ON TOP of player)
-                player_rect = pygame.Rect(player_ref.position.x - 50, player_ref.position.y - 50, 100, 100)
-                if not enemy_rect.colliderect(player_rect):
-                    enemies.append(Enemy(ex, ey))
-                    spawned_count += 1
-                    
-        print(f"Spawned {spawned_count} enemies after {attempts} attempts.")
+    # Frame profiler: F3 toggles the HUD, F4 starts/stops per-frame CSV capture.
+    # Spans are no-ops unless one of them is on.
+    profiler_config = config_manager.get("profiler", {}) or {}
+    show_profiler = profiler_config.get("hud", False)
+    profiler = FrameProfiler(enabled=show_profiler, history=profiler_config.get("history", 240))
+    profiler_overlay = ProfilerOverlay(profiler, 1000.0 / fps if fps else 1000.0 / 60)
+    simulation.profiler = profiler
+    span = profiler.span
 
-    # Initial Game Start
-    player = reset_game()
+    # Event records for offline analysis (read with: python -m level_maze.telemetry <file>)
+    telemetry_config = config_manager.get("telemetry", {}) or {}
+    if telemetry_config.get("enabled", False):
+        directory = telemetry_config.get("directory", "telemetry")
+        telemetry.open(os.path.join(directory, time.strftime("%Y%m%d-%H%M%S") + ".lmt"),
+                       telemetry_config.get("capacity", 65536))
+    frame_number = 0
+
+    # Config hot reload: saved edits to config.yaml apply to the running match
+    hot_reload_config = config_manager.get("hot_reload", {}) or {}
+    config_watcher = (ConfigWatcher(config_manager, hot_reload_config.get("interval", 0.5))
+                      if hot_reload_config.get("enabled", True) else None)
     
     # Game State: START, PLAYING, PAUSED
     game_state = "START"
@@ -124,17 +103,13 @@ def main():
     # UI State
     # paused = False # Removed in favor of game_state
     
-    menu_options = ["Resume", "Restart", "Options", "Exit"]
+    menu_options = ["Resume", "Retry Level", "Restart", "Options", "Exit"]
     menu_selection = 0
-    abilities = {'dash': False, 'roar': False}
 
     show_help = False 
     select_pressed_last_frame = False 
     
     running = True
-    # Time Scaling
-    time_scale = 1.0
-    slowmo_timer = 0.0
     start_screen_timer = 0.0
 
     # D-Pad State
@@ -144,27 +119,32 @@ def main():
     running = True
     while running:
         # Time management
-        real_dt = clock.tick(fps) / 1000.0
+        profiler.next_frame()
+        with span("pacing"):
+            real_dt = pacer.tick()
+        frame_number += 1
+        steps = 0
+        simulation_ms = 0.0
         start_screen_timer += real_dt
+
+        if config_watcher is not None and config_watcher.poll():
+            log.configure(config_manager.get("logging", {}) or {})
+            simulation.apply_settings(config_manager.settings)
+            if level_pool is not None:
+                level_pool.set_config(config_manager.config)
+            # The replay header holds the old config; it cannot express the change
+            if recorder is not None:
+                recorder.close()
+                log.info("Replay saved to %s", recorder.path)
+                recorder = None
         
-        # Slow Motion logic only if PLAYING
-        if game_state == "PLAYING" and not radial_menu.active:
-             if slowmo_timer > 0:
-                 slowmo_timer -= real_dt
-                 time_scale = 0.2
-             else:
-                 time_scale = 1.0
-             game_dt = real_dt * time_scale
-             if game_dt > 0.1: game_dt = 0.1
-        else:
-             game_dt = 0 # Pause physics
-             
         # Allow menu Update always? Or only when Playing?
         # Update Menu (Animation always runs)
         # Input Vector for Menu
         menu_input = pygame.Vector2(0,0)
         
         # Event Handling
+        profiler.start("events")
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
@@ -173,14 +153,12 @@ def main():
             is_select_btn = False
             is_nav_up = False
             is_nav_down = False
-            is_confirm_btn = False
             is_menu_wheel_btn = False
             
             if event.type == pygame.JOYBUTTONDOWN:
                 if event.button == 7: is_start_btn = True # Start (Xbox)
                 if event.button == 6: is_select_btn = True # Back
-                if event.button == 0: is_confirm_btn = True # A
-                if event.button == 4: is_menu_wheel_btn = True # LB
+                if event.button == input_handler.controls['gamepad']['menu_wheel']: is_menu_wheel_btn = True # LB by default
             
             if event.type == pygame.JOYHATMOTION:
                 dpad_x = event.value[0]
@@ -208,14 +186,49 @@ def main():
                     if event.key == pygame.K_d or event.key == pygame.K_RIGHT:
                         dpad_x = 1
                         dpad_y = 0
-                    
-                    if event.key == pygame.K_RETURN or event.key == pygame.K_SPACE: is_confirm_btn = True
                 # Keyboard mapping for menu wheel?
-                if event.key == pygame.K_q: is_menu_wheel_btn = True
+                if event.key == input_handler.controls['keyboard']['menu_wheel']: is_menu_wheel_btn = True
+
+                if event.key == pygame.K_F3:
+                    show_profiler = not show_profiler
+                    profiler.set_enabled(show_profiler or profiler.rows is not None)
+                elif event.key == pygame.K_F8:
+                    level_name = log.cycle_level()
+                    # Logged at the new level itself so the notice passes its own filter
+                    log.log(log.level, "Log level: %s", level_name)
+                elif event.key == pygame.K_F4:
+                    if profiler.rows is None:
+                        profiler.set_enabled(True)
+                        profiler.start_capture()
+                        log.info("Profiler capture started (F4 to stop)")
+                    else:
+                        stop_profiler_capture(profiler, profiler_config)
+                        profiler.set_enabled(show_profiler)
+
+                if game_state in ("PLAYING", "PAUSED"):
+                    if event.key == pygame.K_F5:
+                        quicksave = simulation.snapshot()
+                        save_snapshot(quicksave_path, simulation)
+                    elif event.key == pygame.K_F9:
+                        if quicksave is not None:
+                            simulation.restore(quicksave)
+                        elif os.path.exists(quicksave_path):
+                            simulation.load(quicksave_path)
+                        else:
+                            continue
+                        # A replay cannot express the jump back in time
+                        if recorder is not None:
+                            recorder.close()
+                            log.info("Replay saved to %s", recorder.path)
+                            recorder = None
+                        fixed_step.reset()
+                        if dirty_renderer is not None:
+                            dirty_renderer.invalidate()
+                        game_state = "PLAYING"
 
             # STATE: START
             if game_state == "START":
-                if is_start_btn or is_confirm_btn:
+                if is_start_btn:
                     game_state = "PLAYING"
                     # Optional: reset_game() here if we want fresh start on press
                 continue # Skip other input logic
@@ -242,22 +255,7 @@ def main():
                 # Use D-Pad State
                 # ... (Same Logic) ...
                 menu_input = pygame.Vector2(dpad_x, -dpad_y)
-                
-                if is_confirm_btn:
-                    sel_id = radial_menu.get_selection()
-                    if sel_id:
-                        if sel_id == 'roar_bomb':
-                            player.set_active_ability("roar_bomb")
-                        elif sel_id == 'brick_bomb':
-                            player.set_active_ability("brick_bomb")
-                        elif sel_id == 'dash':
-                            # Just visual or set something?
-                            pass
-                        elif sel_id == 'cancel':
-                            pass
-                        
-                    radial_menu.close()
-            
+
             # PAUSE MENU NAVIGATION
             elif game_state == "PAUSED":
                 if is_nav_up:
@@ -265,160 +263,189 @@ def main():
                 if is_nav_down:
                     menu_selection = (menu_selection + 1) % len(menu_options)
                 
-                if is_confirm_btn:
-                    option = menu_options[menu_selection]
-                    if option == "Resume":
-                        game_state = "PLAYING"
-                    elif option == "Restart":
-                        player = reset_game()
-                        game_state = "PLAYING"
-                    elif option == "Options":
-                        print("Options clicked (Not Implemented)")
-                    elif option == "Exit":
-                        running = False
+        profiler.stop("events")
+
+        # Sampled every frame, menus included: a button that confirms a menu
+        # is not a fresh press (SPACE or A may also be an ability) once play resumes
+        input_frame = input_handler.sample(simulation.player.position)
+
+        # MENU CONFIRM (Enter / Space / A, on the press)
+        if 'confirm' in input_frame.pressed and (game_state != "PLAYING" or radial_menu.active):
+            if game_state == "START":
+                game_state = "PLAYING"
+            elif radial_menu.active:
+                sel_id = radial_menu.get_selection()
+                if sel_id:
+                    if sel_id == 'roar_bomb':
+                        simulation.player.set_active_ability("roar_bomb")
+                    elif sel_id == 'brick_bomb':
+                        simulation.player.set_active_ability("brick_bomb")
+                    elif sel_id == 'dash':
+                        # Just visual or set something?
+                        pass
+                    elif sel_id == 'cancel':
+                        pass
+
+                radial_menu.close()
+            elif game_state == "PAUSED":
+                option = menu_options[menu_selection]
+                if option == "Resume":
+                    game_state = "PLAYING"
+                elif option == "Retry Level":
+                    # Same layout and seed: identical to the match's frame 0
+                    simulation.restore(level_start)
+                    fixed_step.reset()
+                    if recorder is not None:
+                        recorder.close()
+                        recorder = None
+                    # A replay rebuilds frame 0 from the seed and the current config;
+                    # a level built before a config reload would not match it
+                    if level_settings == config_manager.settings:
+                        recorder = start_recording(simulation, replay_config)
+                    elif replay_config.get("record", False):
+                        log.info("Retry not recorded: the level predates the config reload")
+                    game_state = "PLAYING"
+                elif option == "Restart":
+                    level = level_pool.take() if level_pool is not None else None
+                    if level is not None:
+                        simulation.restore(level)
+                        log.info("Game Reset! (pre-generated level)")
+                    else:
+                        simulation.reset()
+                    fixed_step.reset()
+                    if recorder is not None:
+                        recorder.close()
+                    recorder = start_recording(simulation, replay_config)
+                    level_start = simulation.snapshot()
+                    level_settings = config_manager.settings
+                    game_state = "PLAYING"
+                elif option == "Options":
+                    log.info("Options clicked (Not Implemented)")
+                elif option == "Exit":
+                    running = False
+            # The press went to the menu
+            input_frame = input_frame.with_edges()
 
         # Update Radial Menu Logic
         radial_menu.update(real_dt, menu_input)
 
         if game_state == "PLAYING" and not radial_menu.active:
-             # Regular Input
-             input_state = input_handler.get_abilities_state()
-             abilities['dash'] = input_state['dash']
-             abilities['roar'] = input_state['roar']
-             
-             if abilities['dash']:
-                player.attempt_dash()
-            
-             if abilities['roar']:
-                if player.attempt_roar():
-                    # Apply Roar Effect (AoE Push)
-                    roar_radius = player.get_roar_radius()
-                    for enemy in enemies:
-                        diff = enemy.position - player.position
-                        dist = diff.length()
-                        if dist < roar_radius:
-                            push_dir = diff.normalize() if dist > 0 else pygame.Vector2(1,0)
-                            roar_force = 500 # Strong impulse
-                            enemy.apply_knockback(push_dir * roar_force)
-
-             # Secondary Ability (Roar Bomb)
-             if input_handler.get_secondary_ability_state():
-                 new_bomb = player.attempt_secondary_ability()
-                 if new_bomb:
-                     if isinstance(new_bomb, BrickBomb):
-                         brick_bombs.append(new_bomb)
-                     else:
-                         roar_bombs.append(new_bomb)
-
-             # Check SlowMo Triggers (Flags from Player)
-             if player.just_dashed:
-                 slowmo_timer = 1.0 # 1 Second SlowMo
-             if player.just_roared:
-                 slowmo_timer = 1.0
-
-             # Collect Pending Bombs
-             if player.pending_bombs:
-                 brick_bombs.extend(player.pending_bombs)
-                 player.pending_bombs = []
-
-             # Update Entities (Use game_dt)
-             # Update Obstacle Manager (Lifespan check)
-             obstacle_manager.update(game_dt)
-             
-             obstacles = obstacle_manager.get_obstacles()
-             player.update(game_dt, input_handler, arena, obstacles)
-             xtra_manager.update(game_dt, arena, obstacles)
-             for enemy in enemies:
-                 enemy.update(game_dt, player, arena, obstacles)
-             
-             # Update Bombs
-             active_bombs = []
-             for bomb in roar_bombs:
-                 bomb.update(game_dt, arena)
-                 if bomb.is_active:
-                     active_bombs.append(bomb)
-             roar_bombs = active_bombs
-             
-             # Update Brick Bombs
-             active_bricks = []
-             bombs_obstacles = obstacle_manager.get_obstacles() # Includes previously solidified
-             for bb in brick_bombs:
-                 # Update against Arena + Obstacles + Enemies
-                 bb.update(game_dt, arena, bombs_obstacles, enemies)
-                 if bb.is_solidified:
-                     # Convert to Obstacle
-                     # Lifespan: 1 Minute (60 seconds)
-                     obstacle_manager.add_dynamic_obstacle(bb.rect, bb.color, lifespan=60.0)
-                     # Remove from active list
-                     pass
-                 else:
-                     active_bricks.append(bb)
-             brick_bombs = active_bricks
-                 
-             combat_system.resolve_collisions(player, enemies, game_dt)
-             combat_system.resolve_enemy_collisions(enemies)
-             combat_system.resolve_bomb_collisions(roar_bombs, enemies)
-             
-             # Xtra Collection
-             for xtra in xtra_manager.get_xtras():
-                 if xtra.active:
-                     if player.rect.colliderect(xtra.rect):
-                         xtra.on_collect(player)
-                         xtra.active = False
-                     else:
-                         for enemy in enemies:
-                             if enemy.rect.colliderect(xtra.rect):
-                                 xtra.on_collect(enemy)
-                                 xtra.active = False
-                                 break
-             
-            # Remove dead enemies and Award XP
-             alive_enemies = []
-             for e in enemies:
-                 if e.health > 0:
-                     alive_enemies.append(e)
-                 else:
-                     player.gain_xp(50) # XP Value for Kill
-             
-             enemies = alive_enemies
+             # Every fixed step this frame owes reuses the one sample.
+             # Slow motion is applied inside advance(); physics stays paused otherwise.
+             simulation_start = time.perf_counter()
+             with span("simulation"):
+                 steps = fixed_step.advance(simulation, real_dt, input_frame)
+             simulation_ms = (time.perf_counter() - simulation_start) * 1000
              
-             # Death Check (Trigger Menu)
-             if player.health <= 0:
-                 print("Player Died!")
+             # Death / Victory (Trigger Menu)
+             if simulation.outcome is not None:
                  game_state = "PAUSED" # Or GAMEOVER
-                 
-             # Victory Check (All enemies dead)
-             if len(enemies) == 0:
-                 print("All Enemies Destroyed!")
-                 game_state = "PAUSED"
+
+        # real_dt spans the whole previous frame, draw and flip included
+        telemetry.frame(frame_number, real_dt * 1000, steps, simulation_ms, len(simulation.enemies))
          
-        # Draw
-        screen.fill((20, 20, 20))
-        arena.draw(screen)
-        obstacle_manager.draw(screen)
-        xtra_manager.draw(screen)
-        for enemy in enemies: enemy.draw(screen)
-        for bomb in roar_bombs: bomb.draw(screen)
-        for bb in brick_bombs: bb.draw(screen)
-        
-        # Only draw player if not start screen? Or draw everything in BG?
-        # User said "when game start... have start overlay". Usually BG is visible.
-        player.draw(screen)
-        
-        # Draw Radial Menu (Always called for animation fade out)
-        if radial_menu.active or radial_menu.anim_progress > 0:
-            radial_menu.draw(screen)
+        # Draw (entities blended between the last two fixed steps)
+        menu_visible = radial_menu.active or radial_menu.anim_progress > 0
+        with fixed_step.interpolator.interpolated(simulation, fixed_step.alpha):
+            if dirty_renderer is not None and game_state == "PLAYING" and not menu_visible and not show_profiler:
+                with span("draw.dirty"):
+                    dirty_renderer.render(screen, simulation)
+                continue
+
+            draw_world(screen, simulation, background)
         
-        if game_state == "PAUSED":
-            draw_pause_menu(screen, width, height, menu_options, menu_selection, config_manager)
-        elif game_state == "START":
-            draw_start_screen(screen, width, height, start_screen_timer)
+        with span("draw.ui"):
+            # Draw Radial Menu (Always called for animation fade out)
+            if menu_visible:
+                radial_menu.draw(screen)
+
+            if game_state == "PAUSED":
+                draw_pause_menu(screen, width, height, menu_options, menu_selection, config_manager)
+            elif game_state == "START":
+                draw_start_screen(screen, width, height, start_screen_timer)
+
+        if show_profiler:
+            with span("draw.profiler"):
+                profiler_overlay.draw(screen)
             
-        pygame.display.flip()
+        with span("display.flip"):
+            pygame.display.flip()
+        if dirty_renderer is not None:
+            # Overlays covered the screen; the next dirty frame must start from a full one
+            dirty_renderer.invalidate()
+
+    if recorder is not None:
+        recorder.close()
+        log.info("Replay saved to %s", recorder.path)
+    if level_pool is not None:
+        level_pool.close()
+    if profiler.rows is not None:
+        stop_profiler_capture(profiler, profiler_config)
+    if telemetry.buffer is not None:
+        log.info("Telemetry: %d records in %s", telemetry.count, telemetry.path)
+        telemetry.close()
 
+    log.flush()
+    stats = pacer.stats()
+    print(f"Frame pacing ({pacer.mode}): mean {stats['mean_ms']:.2f}ms, jitter {stats['jitter_ms']:.2f}ms, "
+          f"worst {stats['max_ms']:.2f}ms over the last {stats['frames']} frames (target {stats['target_ms']:.2f}ms)")
     pygame.quit()
     sys.exit()
 
+def start_recording(simulation, replay_config):
+    """Begins a replay of the match simulation was just reset into, if enabled in config."""
+    if not replay_config.get("record", False):
+        return None
+    directory = replay_config.get("directory", "replays")
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, time.strftime("%Y%m%d-%H%M%S") + f"-{simulation.rng.seed}.lmr")
+    return ReplayRecorder(path, simulation, replay_config.get("keyframe_interval", 600))
+
+def save_snapshot(path, simulation):
+    """Writes a quicksave, creating its directory on first use."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    simulation.save(path)
+    log.info("Saved to %s", path)
+
+def stop_profiler_capture(profiler, profiler_config):
+    """Ends the F4 capture and writes it as CSV under the configured directory."""
+    directory = profiler_config.get("directory", "profiles")
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, time.strftime("%Y%m%d-%H%M%S") + "-frames.csv")
+    frames = profiler.stop_capture(path)
+    if frames:
+        log.info("Profiler: wrote %d frames to %s", frames, path)
+    else:
+        log.info("Profiler: no frames captured")
+
+def draw_world(surface, simulation, background=None):
+    with simulation.profiler.span("draw.background"):
+        if background is not None:
+            background.draw(surface, simulation.arena, simulation.obstacle_manager)
+        else:
+            surface.fill((20, 20, 20))
+            simulation.arena.draw(surface)
+            simulation.obstacle_manager.draw(surface)
+    draw_entities(surface, simulation)
+
+def draw_entities(surface, simulation):
+    # Everything that moves; drawn over the static background
+    span = simulation.profiler.span
+    with span("draw.xtras"):
+        simulation.xtra_manager.draw(surface)
+    with span("draw.enemies"):
+        for enemy in simulation.enemies: enemy.draw(surface)
+    with span("draw.bombs"):
+        for bomb in simulation.roar_bombs: bomb.draw(surface)
+        for bb in simulation.brick_bombs: bb.draw(surface)
+    
+    # Only draw player if not start screen? Or draw everything in BG?
+    # User said "when game start... have start overlay". Usually BG is visible.
+    with span("draw.player"):
+        simulation.player.draw(surface)
+
 def draw_start_screen(surface, width, height, timer):
     # Dim background
     overlay = pygame.Surface((width, height), pygame.SRCALPHA)
@@ -468,10 +495,10 @@ def draw_pause_menu(surface, width, height, options, selection, config_manager):
     
     if config_manager:
         # Keyboard
-        kb_config = config_manager.get("controls.keyboard")
-        if kb_config:
-            if 'dash' in kb_config: kb_dash = kb_config['dash'].upper()
-            if 'roar' in kb_config: kb_roar = kb_config['roar'].upper()
+        controls = config_manager.settings.controls
+        if controls.keyboard_abilities:
+            kb_dash = controls.keyboard.dash.upper()
+            kb_roar = controls.keyboard.roar.upper()
             
         # Gamepad Map
         gp_map = {
@@ -479,10 +506,8 @@ def draw_pause_menu(surface, width, height, options, selection, config_manager):
             4: "LB / L1", 5: "RB / R1", 6: "Back / Select", 7: "Start",
             8: "L3", 9: "R3", 10: "Guide"
         }
-        gp_config = config_manager.get("controls.gamepad")
-        if gp_config:
-            if 'dash' in gp_config: gp_dash = gp_map.get(int(gp_config['dash']), f"Btn {gp_config['dash']}")
-            if 'roar' in gp_config: gp_roar = gp_map.get(int(gp_config['roar']), f"Btn {gp_config['roar']}")
+        gp_dash = gp_map.get(controls.gamepad.dash, f"Btn {controls.gamepad.dash}")
+        gp_roar = gp_map.get(controls.gamepad.roar, f"Btn {controls.gamepad.roar}")
 
     # 1. Info Text Block
     info_lines = [
@@ -1,6 +1,8 @@
 import pygame
 
 class Obstacle:
+    BLINK_TIME = 3.0 # Seconds of lifespan left when the expiry blink starts
+
     def __init__(self, x, y, width, height, color=(150, 50, 50), lifespan=None):
         self.rect = pygame.Rect(x, y, width, height)
         self.color = color
@@ -14,10 +16,14 @@ class Obstacle:
             if self.lifespan <= 0:
                 self.is_expired = True
 
+    def is_blinking(self):
+        # Expiring soon: colour changes frame to frame, so it can't be cached
+        return bool(self.lifespan) and self.lifespan < self.BLINK_TIME
+
     def draw(self, surface):
         # Optional: Blink if expiring soon?
         draw_color = self.color
-        if self.lifespan and self.lifespan < 3.0:
+        if self.is_blinking():
              if int(self.lifespan * 10) % 2 == 0:
                  draw_color = (255, 255, 255)
                  
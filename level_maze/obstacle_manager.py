@@ -1,91 +1,214 @@
 import pygame
 import random
+import itertools
+import time
+import numpy as np
 from level_maze.obstacle import Obstacle
+from level_maze.spatial_hash import SpatialHash
+from level_maze.free_space import FreeSpaceSampler
+from level_maze.connectivity import NavConnectivity
+
+# Process-wide version numbers: a cache keyed on version can never confuse
+# two managers (e.g. the live world and one restored from a snapshot)
+_versions = itertools.count(1)
 
 class ObstacleManager:
     def __init__(self):
         self.obstacles = []
         self.min_gap = 45 # 1.5 * Player Diameter (30)
+        # Bucketed index over obstacle rects for collision / sight queries
+        self.spatial_hash = SpatialHash(cell_size=64)
+        # Outcome of the last generate_obstacles() call
+        self.generation_stats = None
+
+        # Bumped whenever the obstacle set changes (added, expired, reset).
+        # Caches derived from the layout (nav grid rows, etc.) key off this.
+        self.version = next(_versions)
+
+        # Navigation Grid (rasterized blocked cells for enemy pathfinding)
+        self.nav_cell_size = 40 # Roughly enemy size + buffer
+        self.nav_clearance = 10 # Cell is inflated by this before the obstacle test (5px each side)
+        self.nav_arena_rect = None
+        self.nav_origin = (0, 0) # Grid coords of nav_blocked[0, 0]
+        self.nav_walls = None # bool [rows, cols]: cell not fully inside the arena
+        self.nav_counts = None # int16 [rows, cols]: obstacles overlapping the inflated cell
+        self.nav_blocked = None # bool [rows, cols]: walls | counts > 0
+        self._nav_rows = None
+        self._nav_rows_version = -1
+        # Obstacle bounds as an (M, 4) array for batched sight tests
+        self._boxes = None
+        self._boxes_version = -1
+        # Spawn-position tables per footprint, rebuilt when the layout changes
+        self.free_space = FreeSpaceSampler(self)
+        # Walkable regions of the nav grid, so unreachable goals fail before any search
+        self.connectivity = NavConnectivity(self)
+
+    def __getstate__(self):
+        # Snapshots keep the obstacles and grid geometry; the spatial hash and
+        # nav rasters are derived from them and rebuilt on restore
+        state = self.__dict__.copy()
+        for name in ("nav_walls", "nav_counts", "nav_blocked", "_nav_rows", "_boxes"):
+            state[name] = None
+        state["spatial_hash"] = SpatialHash(self.spatial_hash.cell_size)
+        state["free_space"] = None
+        state["connectivity"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        for obs in self.obstacles:
+            self.spatial_hash.insert(obs, obs.rect)
+        # Nav grid is re-rasterized on the next ensure_nav_grid()
+        self.nav_arena_rect = None
+        self._nav_rows_version = -1
+        self._boxes_version = -1
+        self.free_space = FreeSpaceSampler(self)
+        self.connectivity = NavConnectivity(self)
+        self.version = next(_versions)
 
     def reset(self):
         self.obstacles = []
+        self.spatial_hash.clear()
+        if self.nav_counts is not None:
+            self.nav_counts.fill(0)
+            self.nav_blocked[:] = self.nav_walls
+        self.version = next(_versions)
 
     def add_dynamic_obstacle(self, rect, color=(100, 100, 100), lifespan=None):
         new_obs = Obstacle(rect.x, rect.y, rect.width, rect.height, color=color, lifespan=lifespan)
-        self.obstacles.append(new_obs)
+        self._add(new_obs)
         
+    def _add(self, obs):
+        self.obstacles.append(obs)
+        self.spatial_hash.insert(obs, obs.rect)
+        self._rasterize(obs.rect, 1)
+        self.version = next(_versions)
+
+    def set_obstacles(self, obstacles):
+        """Replaces the whole obstacle set and rebuilds the index."""
+        self.reset()
+        for obs in obstacles:
+            self._add(obs)
+
     def update(self, dt):
         active_obstacles = []
         for obs in self.obstacles:
             obs.update(dt)
             if not obs.is_expired:
                 active_obstacles.append(obs)
+            else:
+                self.spatial_hash.remove(obs)
+                self._rasterize(obs.rect, -1)
+                self.version = next(_versions)
         self.obstacles = active_obstacles
     
-    def generate_obstacles(self, arena, player_safe_zone, num_obstacles=10):
-        self.obstacles = []
-        
+    def generate_obstacles(self, arena, player_safe_zone, num_obstacles=10, rng=random):
+        """
+        Bucketed dart throwing (Poisson-disk style). The spawn area is split
+        into cells of min_size + gap, small enough that no two obstacles'
+        top-left corners can share one, so a background grid with one slot per
+        cell finds every obstacle a dart could touch in a few lookups. Darts
+        land in a random live cell. A cell is retired once it
+        takes an obstacle, once a neighbour's gap (or the player safe zone)
+        covers it for every possible size, or after dart_tries misses, so
+        generation ends when the layout is full rather than after a fixed
+        attempt budget.
+        rng: random.Random-like layout source (defaults to the global module).
+        Returns (and keeps in self.generation_stats) requested / placed /
+        attempts / elapsed_ms; placed < requested means the arena is saturated.
+        """
+        start = time.perf_counter()
+        self.reset()
+        self.build_nav_grid(arena)
+
+        min_size, max_size = 30, 80
+        # Obstacle edges keep this far from the arena walls and from each other
+        # (> 1.5 * player diameter, so the player never gets wedged)
+        gap_required = 50
+        dart_tries = 8
+
+        spawn_area = arena.rect.inflate(-(gap_required * 2), -(gap_required * 2))
+        safe_zone = player_safe_zone.inflate(self.min_gap, self.min_gap)
+        cell = min_size + gap_required
+        cols = max(0, -(-spawn_area.width // cell))
+        rows = max(0, -(-spawn_area.height // cell))
+
+        def covered(cx, cy, rect, margin):
+            # True when every dart in the cell hits rect grown by margin, even at min_size
+            left = spawn_area.left + cx * cell
+            top = spawn_area.top + cy * cell
+            return (left > rect.left - margin - min_size and left + cell <= rect.right + margin
+                    and top > rect.top - margin - min_size and top + cell <= rect.bottom + margin)
+
+        grid = [None] * (rows * cols) # Placed rect whose top-left lies in each cell
+        active = [(cx, cy) for cy in range(rows) for cx in range(cols) if not covered(cx, cy, safe_zone, 0)]
+        slots = {key: i for i, key in enumerate(active)}
+        misses = {}
+
+        def retire(key):
+            # Swap-remove keeps picks O(1)
+            i = slots.pop(key, None)
+            if i is None:
+                return
+            last = active.pop()
+            if last != key:
+                active[i] = last
+                slots[last] = i
+
+        # Darts are drawn with rng.random() (one C call each) rather than randint
+        uniform = rng.random
+        size_span = max_size - min_size + 1
+        reach = gap_required + max_size # Furthest apart two conflicting top-left corners can be, in px
         attempts = 0
-        max_attempts = 1000
-        
-        while len(self.obstacles) < num_obstacles and attempts < max_attempts:
+        while len(self.obstacles) < num_obstacles and active:
             attempts += 1
-            
-            # Random size
-            w = random.randint(30, 80)
-            h = random.randint(30, 80)
-            
-            # Random position within arena
-            # Enforce gap from walls. 
-            # We want the obstacle EDGES to be at least `gap_required` from the arena inner walls (arena.rect).
-            # arena.rect is the playable area boundary.
-            
-            gap_required = 50 # Defined below, logic pulled up
-            
-            # Spawn area should be reduced by gap_required on all sides.
-            # arena.inflate(-gap*2, -gap*2)
-            
-            spawn_area = arena.rect.inflate(-(gap_required*2), -(gap_required*2)) 
-            
-            if spawn_area.width <= w or spawn_area.height <= h:
-                continue
-
-            x = random.randint(spawn_area.left, spawn_area.right - w)
-            y = random.randint(spawn_area.top, spawn_area.bottom - h)
-            
-            new_rect = pygame.Rect(x, y, w, h)
-            
-            # Check Player Safe Zone
-            if new_rect.colliderect(player_safe_zone.inflate(self.min_gap, self.min_gap)):
-                continue
-                
-            # Check overlap with existing obstacles with minimum gap (1.5 * Player Diameter)
-            # Player Radius = 15 => Diameter = 30. 1.5 * 30 = 45.
-            # Using 50 for safety.
-            # ALSO need to check distance between edges/corners as requested.
-            # Valid check: Inflate BOTH by gap/2? Or inflate one by gap?
-            # If we inflate existing by gap, we ensure new rect doesn't touch inflated area.
-            
-            gap_required = 50 # > 1.5 * 30 (45)
-            
-            valid = True
-            for obs in self.obstacles:
-                # 1. Simple Rect Overlap with Gap
-                check_rect = obs.rect.inflate(gap_required * 2, gap_required * 2) # inflate adds to width/height, so 2x gap total
-                if new_rect.colliderect(check_rect):
-                    valid = False
-                    break
-                
-                # 2. Strict distance check for corners (optional but requested "check distances between edges and corners")
-                # The colliderect with inflation covers "Manhattan" distance or box distance.
-                # If we need Euclidean distance between corners (e.g. diagonal gap), it's more complex.
-                # However, for a maze, box gaps are usually sufficient to prevent 
-                # creating "diagonal squeezes" where player clips.
-                # Since we use AABB collision for player, box inflation is actually CORRECT. 
-                # If we inflated by gap, we ensure minimal axis-aligned space.
-            
-            if valid:
-                self.obstacles.append(Obstacle(x, y, w, h))
+            cx, cy = active[int(uniform() * len(active))]
+
+            w = min_size + int(uniform() * size_span)
+            h = min_size + int(uniform() * size_span)
+            # Top-left corner inside this cell, obstacle inside the spawn area
+            left = spawn_area.left + cx * cell
+            top = spawn_area.top + cy * cell
+            x_span = min(cell, spawn_area.right - w - left + 1)
+            y_span = min(cell, spawn_area.bottom - h - top + 1)
+
+            if x_span > 0 and y_span > 0:
+                new_rect = pygame.Rect(left + int(uniform() * x_span), top + int(uniform() * y_span), w, h)
+                # Box (not Euclidean) gap is right for AABB player collision
+                if not new_rect.colliderect(safe_zone):
+                    x0 = max(0, (new_rect.x - reach - spawn_area.left) // cell)
+                    x1 = min(cols - 1, (new_rect.x + reach - spawn_area.left) // cell)
+                    y0 = max(0, (new_rect.y - reach - spawn_area.top) // cell)
+                    y1 = min(rows - 1, (new_rect.y + reach - spawn_area.top) // cell)
+                    neighbours = [rect for ny in range(y0, y1 + 1) for rect in grid[ny * cols + x0:ny * cols + x1 + 1]
+                                  if rect is not None]
+                    if neighbours and new_rect.inflate(gap_required * 2, gap_required * 2).collidelist(neighbours) != -1:
+                        new_rect = None
+                else:
+                    new_rect = None
+
+                if new_rect is not None:
+                    self._add(Obstacle(new_rect.x, new_rect.y, w, h))
+                    grid[cy * cols + cx] = new_rect
+                    retire((cx, cy))
+                    span = reach // cell + 1
+                    for ny in range(max(0, cy - span), min(rows, cy + span + 1)):
+                        for nx in range(max(0, cx - span), min(cols, cx + span + 1)):
+                            if (nx, ny) in slots and covered(nx, ny, new_rect, gap_required):
+                                retire((nx, ny))
+                    continue
+
+            misses[cx, cy] = misses.get((cx, cy), 0) + 1
+            if misses[cx, cy] >= dart_tries:
+                retire((cx, cy))
+
+        self.generation_stats = {
+            "requested": num_obstacles,
+            "placed": len(self.obstacles),
+            "attempts": attempts,
+            "elapsed_ms": (time.perf_counter() - start) * 1000
+        }
+        return self.generation_stats
 
     def draw(self, surface):
         for obs in self.obstacles:
@@ -93,3 +216,100 @@ class ObstacleManager:
 
     def get_obstacles(self):
         return self.obstacles
+
+    # Spatial Queries (use these instead of scanning get_obstacles())
+    def query_rect(self, rect):
+        """All obstacles colliding with rect, in list order."""
+        return self.spatial_hash.query_rect(rect)
+
+    def first_collision(self, rect):
+        hits = self.spatial_hash.query_rect(rect)
+        return hits[0] if hits else None
+
+    def collides(self, rect):
+        return self.spatial_hash.any_rect(rect)
+
+    def query_segment(self, start, end):
+        """All obstacles the segment start -> end passes through."""
+        return self.spatial_hash.query_segment(start, end)
+
+    def segment_blocked(self, start, end):
+        return self.spatial_hash.any_segment(start, end)
+
+    def get_obstacle_boxes(self):
+        """
+        Obstacle bounds as a float (M, 4) array of inclusive pixel edges
+        [left, top, right - 1, bottom - 1], the layout line_of_sight expects.
+        Rebuilt only when the obstacle version changes.
+        """
+        if self._boxes_version != self.version:
+            boxes = np.empty((len(self.obstacles), 4), dtype=np.float64)
+            for i, obs in enumerate(self.obstacles):
+                r = obs.rect
+                boxes[i] = (r.left, r.top, r.right - 1, r.bottom - 1)
+            self._boxes = boxes
+            self._boxes_version = self.version
+        return self._boxes
+
+    # Navigation Grid
+    def build_nav_grid(self, arena):
+        """
+        Rasterizes the arena into nav_cell_size cells (same grid Enemy.find_path walks).
+        A cell is blocked if it is not fully inside the arena or if the cell,
+        inflated by nav_clearance, touches any obstacle.
+        """
+        cs = self.nav_cell_size
+        min_x = arena.rect.left // cs
+        max_x = arena.rect.right // cs
+        min_y = arena.rect.top // cs
+        max_y = arena.rect.bottom // cs
+
+        cell_left = np.arange(min_x, max_x + 1) * cs
+        cell_top = np.arange(min_y, max_y + 1) * cs
+        inside_x = (cell_left >= arena.rect.left) & (cell_left + cs <= arena.rect.right)
+        inside_y = (cell_top >= arena.rect.top) & (cell_top + cs <= arena.rect.bottom)
+
+        self.nav_arena_rect = arena.rect.copy()
+        self.nav_origin = (min_x, min_y)
+        self.nav_walls = ~(inside_y[:, None] & inside_x[None, :])
+        self.nav_counts = np.zeros(self.nav_walls.shape, dtype=np.int16)
+        self.nav_blocked = self.nav_walls.copy()
+        for obs in self.obstacles:
+            self._rasterize(obs.rect, 1)
+        self.version = next(_versions)
+
+    def ensure_nav_grid(self, arena):
+        if self.nav_blocked is None or self.nav_arena_rect != arena.rect:
+            self.build_nav_grid(arena)
+        return self.nav_blocked
+
+    def _nav_cell_span(self, rect):
+        # Grid cells whose inflated rect collides with `rect`, clipped to the grid
+        cs = self.nav_cell_size
+        half = self.nav_clearance // 2
+        ox, oy = self.nav_origin
+        rows, cols = self.nav_blocked.shape
+        x0 = max((rect.left - cs - half) // cs + 1 - ox, 0)
+        x1 = min((rect.right + half - 1) // cs - ox + 1, cols)
+        y0 = max((rect.top - cs - half) // cs + 1 - oy, 0)
+        y1 = min((rect.bottom + half - 1) // cs - oy + 1, rows)
+        return slice(y0, max(y0, y1)), slice(x0, max(x0, x1))
+
+    def _rasterize(self, rect, delta):
+        if self.nav_blocked is None:
+            return
+        span = self._nav_cell_span(rect)
+        self.nav_counts[span] += delta
+        self.nav_blocked[span] = self.nav_walls[span] | (self.nav_counts[span] > 0)
+
+    def get_nav_rows(self, arena):
+        """
+        Blocked grid as nested lists (rows[y][x], relative to nav_origin).
+        Plain list indexing is faster than per-element NumPy access inside A*;
+        the conversion only reruns when the obstacle version changes.
+        """
+        self.ensure_nav_grid(arena)
+        if self._nav_rows_version != self.version:
+            self._nav_rows = self.nav_blocked.tolist()
+            self._nav_rows_version = self.version
+        return self._nav_rows
@@ -1,35 +1,31 @@
 from level_maze.vfx import VFXManager
 from level_maze.roar_bomb import RoarBomb
 from level_maze.brick_bomb import BrickBomb
+from level_maze.sprite_cache import glow_sprites
+from level_maze.event_log import log
 import random
 import pygame
 import math
+import dataclasses
 
 class Player:
-    def __init__(self, x, y, config_manager, radius=15, color=(0, 100, 255)):
+    def __init__(self, x, y, config_manager, radius=15, color=(0, 100, 255), rng=None):
         self.position = pygame.Vector2(x, y)
         self.radius = radius
         self.color = color
-        self.speed = 300 # Pixels per second
+        self.speed = 300 # Pixels per second (settings.player.speed)
         self.look_direction = pygame.Vector2(1, 0) # Facing right initially
         self.health = 100
         self.knockback = pygame.Vector2(0, 0)
         self.friction = 5.0 # Friction for knockback decay
         
-        # Abilities Config
-        self.dash_config = config_manager.get_ability_config("dash")
-        self.roar_config = config_manager.get_ability_config("roar")
-        self.bomb_config = config_manager.get("abilities.roar_bomb") # Direct get as it might not be in default helper
-        self.brick_bomb_config = config_manager.get("abilities.brick_bomb")
-        
-        self.dash_cooldown_max = self.dash_config.get("cooldown", 10.0)
-        self.dash_dist_mult = self.dash_config.get("distance_multiplier", 2.0)
-        
-        self.roar_cooldown_max = self.roar_config.get("cooldown", 30.0)
-        self.roar_push_mult = self.roar_config.get("push_distance_multiplier", 5.0)
-        
-        self.bomb_cooldown_max = self.bomb_config.get("cooldown", 15.0) if self.bomb_config else 15.0
-        self.brick_bomb_cooldown_max = self.brick_bomb_config.get("cooldown", 5.0) if self.brick_bomb_config else 5.0
+        # XP System
+        self.xp = 0
+        self.level = 1
+        self.xp_to_next_level = 100
+
+        # Abilities Config (speed, cooldowns and bomb parameters; see apply_settings)
+        self.apply_settings(config_manager.settings)
         
         self.dash_timer = 0.0
         self.dash_active_timer = 0.0 # Timer for i-frames
@@ -43,16 +39,11 @@ class Player:
         self.is_radial_menu_open = False
         self.available_abilities = ["roar_bomb", "brick_bomb"] # Extendable
         
-        # XP System
-        self.xp = 0
-        self.level = 1
-        self.xp_to_next_level = 100
-        
         # Rect for simple collision (centered on position)
         self.rect = pygame.Rect(x - radius, y - radius, radius * 2, radius * 2)
 
         # VFX State
-        self.vfx = VFXManager()
+        self.vfx = VFXManager(rng=rng) # rng: particle spread source (Simulation's "vfx" stream)
         self.trail_ghosts = [] # List of tuples: (position_vector, alpha_int, color_tuple)
         self.roar_waves = [] # List of objects: {'pos': vec, 'radius': float, 'alpha': int, 'max_radius': float, 'thickness': int}
         
@@ -64,7 +55,7 @@ class Player:
         self.brick_charge_duration = 0.0
         self.pending_bombs = []
 
-    def update(self, delta_time, input_handler, arena, obstacles):
+    def update(self, delta_time, input_handler, arena, obstacle_manager):
         # Reset frame flags
         self.just_dashed = False
         self.just_roared = False
@@ -140,19 +131,17 @@ class Player:
         velocity = (move_vec * self.speed) + self.knockback
         
         # Calculate potential new position
+        # position stays the float source of truth; rect is derived from it
+        # (as on Enemy), so sub-pixel motion accumulates at any tick rate
         potential_pos = self.position + velocity * delta_time
-        potential_rect = self.rect.copy()
-        potential_rect.center = (int(potential_pos.x), int(potential_pos.y))
         
         # 4. Arena & Obstacle Collision
-        # First check simple arena bounds
-        clamped_rect = arena.clamp(potential_rect)
-        
-        # Then check obstacles
-        if not self.check_obstacle_collision(clamped_rect, obstacles):
+        # First check simple arena bounds, then obstacles
+        pos, rect = self.place(potential_pos, arena)
+        if not self.check_obstacle_collision(rect, obstacle_manager):
             # No collision, apply move
-            self.rect = clamped_rect
-            self.position = pygame.Vector2(self.rect.centerx, self.rect.centery)
+            self.position = pos
+            self.rect = rect
         else:
             # Collision!
             # Simple response: Stop.
@@ -160,70 +149,69 @@ class Player:
             # Attempt sliding (x only, then y only)
             
             # X Only
-            pos_x = pygame.Vector2(potential_pos.x, self.position.y)
-            rect_x = self.rect.copy()
-            rect_x.center = (int(pos_x.x), int(pos_x.y))
-            rect_x = arena.clamp(rect_x)
+            pos_x, rect_x = self.place(pygame.Vector2(potential_pos.x, self.position.y), arena)
             
-            if not self.check_obstacle_collision(rect_x, obstacles):
-                 self.position.x = pos_x.x
+            if not self.check_obstacle_collision(rect_x, obstacle_manager):
+                 self.position = pos_x
                  self.rect = rect_x
             else:
                 # Y Only
-                pos_y = pygame.Vector2(self.position.x, potential_pos.y)
-                rect_y = self.rect.copy()
-                rect_y.center = (int(pos_y.x), int(pos_y.y))
-                rect_y = arena.clamp(rect_y)
+                pos_y, rect_y = self.place(pygame.Vector2(self.position.x, potential_pos.y), arena)
                 
-                if not self.check_obstacle_collision(rect_y, obstacles):
-                     self.position.y = pos_y.y
+                if not self.check_obstacle_collision(rect_y, obstacle_manager):
+                     self.position = pos_y
                      self.rect = rect_y
                 # Else: Blocked completely (Corner usually)
-    
-    def check_obstacle_collision(self, rect, obstacles):
-        for obs in obstacles:
-            if rect.colliderect(obs.rect):
-                return True
-        return False
 
-    def check_obstacle_collision(self, rect, obstacles):
-        for obs in obstacles:
-            if rect.colliderect(obs.rect):
-                return True
-        return False
+    def place(self, position, arena):
+        """(position, rect) for a move to position, clamped inside the arena walls."""
+        rect = self.rect.copy()
+        rect.center = (int(position.x), int(position.y))
+        clamped = arena.clamp(rect)
+        # Clamping shifts by whole pixels; carry the same shift into the float position
+        return position + (clamped.x - rect.x, clamped.y - rect.y), clamped
+    
+    def check_obstacle_collision(self, rect, obstacle_manager):
+        return obstacle_manager.collides(rect)
 
     def set_active_ability(self, ability_name):
         if ability_name in self.available_abilities:
             self.selected_ability = ability_name
-            print(f"Ability set to: {ability_name}")
+            log.info("Ability set to: %s", ability_name)
 
     def draw(self, surface):
         # Draw Dash Ghosts (Additive)
+        # Sprites come from the shared glow cache (quantized radius / alpha)
         for pos, alpha, col in self.trail_ghosts:
-            ghost_surf = pygame.Surface((self.radius * 2, self.radius * 2), pygame.SRCALPHA)
             # Tint color towards Cyan for juice
-            c = (col[0], col[1], col[2], int(alpha))
-            pygame.draw.circle(ghost_surf, c, (self.radius, self.radius), self.radius)
+            ghost_surf = glow_sprites.disc(col, self.radius, alpha)
             surface.blit(ghost_surf, (pos.x - self.radius, pos.y - self.radius), special_flags=pygame.BLEND_ADD)
             
         # Draw Roar Waves (Glowing Rings)
         for wave in self.roar_waves:
-            max_r = int(wave['max_radius'])
-            wave_surf = pygame.Surface((max_r * 2, max_r * 2), pygame.SRCALPHA)
-            center = (max_r, max_r)
-            
-            # Glowing Orange/Gold
-            alpha = int(wave['alpha'])
-            color = (255, 150, 50, alpha) 
-            
-            # Draw multiple rings for "thick" pulse
-            pygame.draw.circle(wave_surf, color, center, int(wave['radius']), wave['thickness'])
-            # Inner faint ring
-            if wave['radius'] > 10:
-                pygame.draw.circle(wave_surf, (255, 200, 100, int(alpha/2)), center, int(wave['radius'] - 5), 2)
+            radius = glow_sprites.quantize_radius(wave['radius'])
+            alpha = glow_sprites.quantize_alpha(wave['alpha'])
+            thickness = wave['thickness']
+
+            def render(radius=radius, alpha=alpha, thickness=thickness):
+                # 1px margin so the outer ring is never clipped by the sprite edge
+                wave_surf = pygame.Surface((radius * 2 + 2, radius * 2 + 2), pygame.SRCALPHA)
+                center = (radius + 1, radius + 1)
+
+                # Glowing Orange/Gold
+                color = (255, 150, 50, alpha)
+
+                # Draw multiple rings for "thick" pulse
+                pygame.draw.circle(wave_surf, color, center, radius, thickness)
+                # Inner faint ring
+                if radius > 10:
+                    pygame.draw.circle(wave_surf, (255, 200, 100, int(alpha/2)), center, radius - 5, 2)
+                return wave_surf
+
+            wave_surf = glow_sprites.get(("roar_wave", radius, thickness, alpha), render)
             
             # Blit at position where roar occurred
-            draw_pos = (wave['pos'].x - max_r, wave['pos'].y - max_r)
+            draw_pos = (wave['pos'].x - radius - 1, wave['pos'].y - radius - 1)
             surface.blit(wave_surf, draw_pos, special_flags=pygame.BLEND_ADD)
             
         # Draw Particles
@@ -278,17 +266,31 @@ class Player:
 
 
 
+    def get_draw_bounds(self):
+        # Screen rects draw() can touch (dirty-rect rendering)
+        x, y = self.position
+        # Body, arrow tip, XP/health bars above, cooldown bars below
+        bounds = [pygame.Rect(x - 24, y - 34, 48, 60)]
+        r = self.radius
+        for pos, alpha, col in self.trail_ghosts:
+            bounds.append(pygame.Rect(pos.x - r, pos.y - r, r * 2, r * 2))
+        for wave in self.roar_waves:
+            max_r = int(wave['max_radius']) + 2 # Quantized sprite radius + margin
+            bounds.append(pygame.Rect(wave['pos'].x - max_r, wave['pos'].y - max_r, max_r * 2, max_r * 2))
+        bounds.extend(self.vfx.get_draw_bounds())
+        return bounds
+
     def take_damage(self, amount):
         if self.is_invulnerable():
-            print("Player Invulnerable! Damage blocked.")
+            log.debug("Player Invulnerable! Damage blocked.")
             return
 
         self.health -= amount
-        print(f"Player took {amount} damage. HP: {self.health}")
+        log.info("Player took %s damage. HP: %s", amount, self.health)
 
     def gain_xp(self, amount):
         self.xp += amount
-        print(f"Player gained {amount} XP. Total: {self.xp}")
+        log.info("Player gained %s XP. Total: %s", amount, self.xp)
         if self.xp >= self.xp_to_next_level:
             self.level_up()
 
@@ -304,7 +306,29 @@ class Player:
         self.brick_bomb_cooldown_max *= 0.9
         self.health = 100 # Full heal on level up?
         
-        print(f"LEVEL UP! Level {self.level}. Cooldowns reduced.")
+        log.info("LEVEL UP! Level %d. Cooldowns reduced.", self.level)
+
+    def apply_settings(self, settings):
+        """
+        Takes speed, cooldowns and bomb parameters from a compiled Settings;
+        also used to hot-reload them mid-match. Level-up cooldown reductions
+        carry over onto the new values.
+        """
+        abilities = settings.abilities
+        self.speed = settings.player.speed
+        self.dash_config = abilities.dash
+        self.roar_config = abilities.roar
+        self.bomb_config = abilities.roar_bomb
+        self.brick_bomb_config = abilities.brick_bomb
+
+        self.dash_dist_mult = abilities.dash.distance_multiplier
+        self.roar_push_mult = abilities.roar.push_distance_multiplier
+
+        scale = 0.9 ** (self.level - 1)
+        self.dash_cooldown_max = abilities.dash.cooldown * scale
+        self.roar_cooldown_max = abilities.roar.cooldown * scale
+        self.bomb_cooldown_max = abilities.roar_bomb.cooldown * scale
+        self.brick_bomb_cooldown_max = abilities.brick_bomb.cooldown * scale
 
     def apply_knockback(self, force_vector):
         self.knockback = force_vector
@@ -332,7 +356,7 @@ class Player:
             self.dash_timer = self.dash_cooldown_max
             self.dash_active_timer = self.dash_duration # Trigger invulnerability
             self.just_dashed = True
-            print("Player Dashed!")
+            log.info("Player Dashed!")
             return True
         return False
 
@@ -358,14 +382,14 @@ class Player:
             self.vfx.emit(self.position, 60, (255, 100, 0), 100, 300, size_max=6, life=0.6)
             
             self.just_roared = True
-            print("Player Roared!")
+            log.info("Player Roared!")
             return True 
         return False
         
     def fire_brick_bomb(self):
         # Calculate Size based on charge
         # Base: 40. Max Charge (2.0s): 120 (3x?)
-        base_size = self.brick_bomb_config.get("size", 40)
+        base_size = self.brick_bomb_config.size
         
         # Scaling
         charge_factor = self.brick_charge_duration / 2.0 # 0 to 1
@@ -373,18 +397,14 @@ class Player:
         
         direction = -self.look_direction
         
-        # Pass final_size to config override? Or custom init?
-        # BrickBomb init takes config. We can inject size into a copy of config or pass extra arg.
-        # BrickBomb(..., config, ...). config['size'] is used.
-        # Let's pass a modified config dict.
-        bomb_cfg = self.brick_bomb_config.copy()
-        bomb_cfg['size'] = final_size
+        # BrickBomb reads its size from the settings; hand it a copy with the charged size
+        bomb_cfg = dataclasses.replace(self.brick_bomb_config, size=final_size)
         
         brick = BrickBomb(self.position, direction, bomb_cfg, player_diameter=self.radius*2)
         self.pending_bombs.append(brick)
         
         self.brick_bomb_timer = self.brick_bomb_cooldown_max
-        print(f"Player fired Charged Brick Bomb! Size: {final_size}")
+        log.info("Player fired Charged Brick Bomb! Size: %s", final_size)
 
     def attempt_secondary_ability(self):
         if self.selected_ability == "roar_bomb":
@@ -395,14 +415,14 @@ class Player:
                 direction = -self.look_direction
                 
                 bomb = RoarBomb(self.position, direction, self.bomb_config)
-                print("Player threw Roar Bomb!")
+                log.info("Player threw Roar Bomb!")
                 return bomb
             else:
-                print("Bomb on cooldown")
+                log.debug("Bomb on cooldown")
         elif self.selected_ability == "brick_bomb":
             # Handled in update() via charging logic
             if self.brick_bomb_timer > 0 and self.brick_charge_duration == 0:
-                 print("Brick Bomb on cooldown")
+                 log.debug("Brick Bomb on cooldown")
             return None
                  
         return None
@@ -0,0 +1,181 @@
+import pygame
+import csv
+import time
+from collections import deque
+from contextlib import nullcontext
+
+class _Span:
+    # Reused per name; adds its elapsed time to the profiler's current frame
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        frame = self.profiler.frame
+        frame[self.name] = frame.get(self.name, 0.0) + (time.perf_counter() - self.start)
+        return False
+
+_NULL_SPAN = nullcontext()
+
+class FrameProfiler:
+    """
+    Named-span frame profiler for the main loop and Simulation.step.
+        with profiler.span("enemies"): ...
+    Times are summed per frame (a span hit by several fixed steps counts once,
+    in total) and kept for the last `history` frames. Spans may nest; each
+    name only ever reports its own wall time. While disabled, span() hands
+    back one shared no-op context manager and next_frame() returns at once.
+    """
+    def __init__(self, enabled=False, history=240):
+        self.enabled = enabled
+        self.history = history
+        self.spans = {} # name -> _Span
+        self.samples = {} # name -> deque of per-frame seconds (0 when the span did not run)
+        self.frame_times = deque(maxlen=history)
+        self.frame = {}
+        self.frame_start = None
+        self.frame_count = 0
+        self.rows = None # Per-frame dicts while CSV capture is on
+
+    def span(self, name):
+        if not self.enabled:
+            return _NULL_SPAN
+        span = self.spans.get(name)
+        if span is None:
+            span = self.spans[name] = _Span(self, name)
+        return span
+
+    def start(self, name):
+        """start()/stop() pair for phases too long to indent under a with-block."""
+        if self.enabled:
+            self.span(name).__enter__()
+
+    def stop(self, name):
+        if self.enabled:
+            span = self.spans.get(name)
+            if span is not None and span.start:
+                span.__exit__()
+                span.start = 0.0
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        self.frame = {}
+        self.frame_start = None
+        for span in self.spans.values():
+            span.start = 0.0
+
+    def next_frame(self):
+        """Closes the frame in progress (if any) and starts timing the next one."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self.frame_start is not None:
+            self._record(now - self.frame_start)
+        self.frame_start = now
+        self.frame = {}
+
+    def _record(self, frame_time):
+        self.frame_count += 1
+        self.frame_times.append(frame_time)
+        frame = self.frame
+        for name in frame.keys() - self.samples.keys():
+            # Pad so every name's history lines up with frame_times
+            self.samples[name] = deque([0.0] * (len(self.frame_times) - 1), maxlen=self.history)
+        for name, samples in self.samples.items():
+            samples.append(frame.get(name, 0.0))
+        if self.rows is not None:
+            self.rows.append((self.frame_count, frame_time, frame))
+
+    def stats(self):
+        """name -> (mean_ms, p99_ms, max_ms) over the history, slowest mean first; "frame" is the whole frame."""
+        result = {}
+        for name, samples in [("frame", self.frame_times)] + list(self.samples.items()):
+            if not samples:
+                continue
+            ordered = sorted(samples)
+            p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+            result[name] = (sum(ordered) / len(ordered) * 1000, p99 * 1000, ordered[-1] * 1000)
+        return dict(sorted(result.items(), key=lambda item: -item[1][0]))
+
+    # Per-frame CSV capture
+    def start_capture(self):
+        self.rows = []
+
+    def stop_capture(self, path):
+        """Writes the frames captured since start_capture() to path; returns how many."""
+        rows, self.rows = self.rows, None
+        if not rows:
+            return 0
+        names = sorted({name for _, _, frame in rows for name in frame})
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "frame_ms"] + [f"{name}_ms" for name in names])
+            for index, frame_time, frame in rows:
+                writer.writerow([index, f"{frame_time * 1000:.4f}"] +
+                                [f"{frame.get(name, 0.0) * 1000:.4f}" for name in names])
+        return len(rows)
+
+class ProfilerOverlay:
+    """
+    HUD for a FrameProfiler: a table of mean / p99 / max per span and a
+    frame-time graph against the frame budget. The table text is re-rendered
+    a few times a second, not every frame.
+    """
+    REFRESH = 0.25 # Seconds between table re-renders
+    ROWS = 14
+
+    def __init__(self, profiler, budget_ms=1000 / 60):
+        self.profiler = profiler
+        self.budget_ms = budget_ms
+        self.font = None
+        self.lines = []
+        self.last_refresh = 0.0
+
+    def _refresh(self):
+        if self.font is None:
+            self.font = pygame.font.SysFont("Consolas", 14)
+        stats = self.profiler.stats()
+        text = [f"{'span':<28}{'mean':>7}{'p99':>7}{'max':>7}  ms"]
+        for name, (mean, p99, worst) in list(stats.items())[:self.ROWS]:
+            text.append(f"{name[:27]:<28}{mean:7.2f}{p99:7.2f}{worst:7.2f}")
+        capture = self.profiler.rows
+        if capture is not None:
+            text.append(f"CSV capture: {len(capture)} frames")
+        self.lines = [self.font.render(line, True, (230, 230, 230)) for line in text]
+
+    def draw(self, surface):
+        now = time.perf_counter()
+        if now - self.last_refresh >= self.REFRESH or not self.lines:
+            self._refresh()
+            self.last_refresh = now
+
+        line_height = self.lines[0].get_height() if self.lines else 16
+        width = max([line.get_width() for line in self.lines] + [240]) + 16
+        graph_height = 60
+        height = len(self.lines) * line_height + graph_height + 24
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 180))
+        surface.blit(panel, (8, 8))
+        for i, line in enumerate(self.lines):
+            surface.blit(line, (16, 14 + i * line_height))
+
+        # Frame-time history; the budget line sits at half the graph height
+        frame_times = self.profiler.frame_times
+        top = 14 + len(self.lines) * line_height + 6
+        left = 16
+        graph_width = width - 16
+        budget_y = top + graph_height // 2
+        pygame.draw.line(surface, (80, 160, 80), (left, budget_y), (left + graph_width, budget_y))
+        if len(frame_times) > 1:
+            scale = (graph_height / 2) / self.budget_ms
+            step = graph_width / (frame_times.maxlen - 1)
+            points = [(left + i * step, top + graph_height - min(graph_height, t * 1000 * scale))
+                      for i, t in enumerate(frame_times)]
+            pygame.draw.lines(surface, (255, 200, 60), False, points)
@@ -0,0 +1,317 @@
+"""
+Deterministic match recording and uncapped playback.
+
+A match is fully determined by the Simulation's seed (see level_maze.rng)
+plus the (dt, InputFrame) pair fed to every Simulation.step, so that is all
+a replay stores, along with periodic keyframes (full world snapshots) for
+seeking.
+
+Usage:
+    python -m level_maze.replay match.lmr                 # play to the end, headless
+    python -m level_maze.replay match.lmr --seek 3600     # jump to step 3600
+    python -m level_maze.replay match.lmr --verify        # re-simulate, check every keyframe
+
+File layout (little-endian):
+    MAGIC, u32 header length, JSON header (seed, size, config, ...)
+    raw-deflate body of records:
+        input:    u8 'I', f64 dt, f64 move x/y, f64 look x/y, f64 aim x/y, u8 flags
+        keyframe: u8 'K', u32 frame, u32 length, snapshot bytes
+    index (appended on close): (u32 frame, u64 body offset) per keyframe,
+    then u32 count and INDEX_MAGIC.
+The compressor is fully flushed before every keyframe, so decoding can start
+at any indexed offset. Files cut short by a crash have no index and are read
+sequentially up to the last complete record.
+"""
+
+import json
+import os
+import struct
+import sys
+import time
+import zlib
+import argparse
+from level_maze.config_manager import ConfigManager
+from level_maze.input_handler import InputFrame
+
+MAGIC = b"LMREPLAY"
+INDEX_MAGIC = b"LMRINDEX"
+VERSION = 5 # 2: Poisson-disk obstacle layouts, 3: free-space spawning, 4: compiled settings, 5: pressed edges
+
+INPUT_RECORD = struct.Struct("<B7dB")
+KEYFRAME_HEADER = struct.Struct("<BII")
+INDEX_ENTRY = struct.Struct("<IQ")
+FOOTER = struct.Struct("<I8s")
+HEADER_LENGTH = struct.Struct("<I")
+
+TAG_INPUT = ord("I")
+TAG_KEYFRAME = ord("K")
+
+FLAG_DASH = 1
+FLAG_ROAR = 2
+FLAG_SECONDARY = 4
+FLAG_AIM = 8
+# Edges the simulation reads (abilities fire on the press)
+FLAG_DASH_PRESSED = 16
+FLAG_ROAR_PRESSED = 32
+
+class ReplayError(Exception):
+    pass
+
+def encode_input(dt, input_frame):
+    flags = 0
+    if input_frame.dash: flags |= FLAG_DASH
+    if input_frame.roar: flags |= FLAG_ROAR
+    if input_frame.secondary: flags |= FLAG_SECONDARY
+    if 'dash' in input_frame.pressed: flags |= FLAG_DASH_PRESSED
+    if 'roar' in input_frame.pressed: flags |= FLAG_ROAR_PRESSED
+    aim = input_frame.aim_point
+    if aim is not None:
+        flags |= FLAG_AIM
+    else:
+        aim = (0.0, 0.0)
+    move = input_frame.move
+    look = input_frame.look
+    return INPUT_RECORD.pack(TAG_INPUT, dt, move[0], move[1], look[0], look[1], aim[0], aim[1], flags)
+
+def decode_input(values):
+    # values: INPUT_RECORD fields after the tag
+    dt, mx, my, lx, ly, ax, ay, flags = values
+    input_frame = InputFrame(
+        move=(mx, my),
+        look=(lx, ly),
+        dash=bool(flags & FLAG_DASH),
+        roar=bool(flags & FLAG_ROAR),
+        secondary=bool(flags & FLAG_SECONDARY),
+        aim_point=(ax, ay) if flags & FLAG_AIM else None,
+        pressed=[action for action, flag in (('dash', FLAG_DASH_PRESSED), ('roar', FLAG_ROAR_PRESSED))
+                 if flags & flag]
+    )
+    return dt, input_frame
+
+def world_fingerprint(simulation):
+    """The gameplay-relevant state of a world, for comparing two runs."""
+    player = simulation.player
+    return (
+        simulation.frame,
+        tuple(player.position), player.health, player.xp,
+        tuple((tuple(e.position), e.health, e.state) for e in simulation.enemies),
+        tuple(tuple(bomb.position) for bomb in simulation.roar_bombs),
+        tuple(tuple(bb.rect) for bb in simulation.brick_bombs),
+        tuple(tuple(obs.rect) for obs in simulation.obstacle_manager.get_obstacles()),
+        tuple((name, stream.getstate()) for name, stream in sorted(simulation.rng.streams.items()))
+    )
+
+class ReplayRecorder:
+    """
+    Streams one match to disk. Attaches itself to the Simulation, whose step()
+    calls record() with the exact dt and input it is about to apply.
+    Create it right after Simulation.reset(); call close() when the match ends.
+    """
+    def __init__(self, path, simulation, keyframe_interval=600, level=6):
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        self.file = open(path, "wb")
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, -15) # Raw deflate: restartable at flush points
+        self.body_start = 0
+        self.body_size = 0
+        self.index = [] # (frame, body offset) per keyframe
+        self.frames = 0
+
+        header = json.dumps({
+            "version": VERSION,
+            "seed": simulation.rng.seed,
+            "width": simulation.width,
+            "height": simulation.height,
+            "keyframe_interval": keyframe_interval,
+            "config": simulation.config_manager.config,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z")
+        }).encode("utf-8")
+        self.file.write(MAGIC + HEADER_LENGTH.pack(len(header)) + header)
+        self.body_start = self.file.tell()
+
+        self.simulation = simulation
+        simulation.recorder = self
+
+    def _write(self, data):
+        if data:
+            self.file.write(data)
+            self.body_size += len(data)
+
+    def record(self, simulation, dt, input_frame):
+        if simulation.frame % self.keyframe_interval == 0:
+            # Decoding can restart here: flush so the keyframe starts a fresh deflate block
+            self._write(self.compressor.flush(zlib.Z_FULL_FLUSH))
+            self.file.flush()
+            self.index.append((simulation.frame, self.body_size))
+            snapshot = simulation.snapshot()
+            self._write(self.compressor.compress(KEYFRAME_HEADER.pack(TAG_KEYFRAME, simulation.frame, len(snapshot))))
+            self._write(self.compressor.compress(snapshot))
+        self._write(self.compressor.compress(encode_input(dt, input_frame)))
+        self.frames += 1
+
+    def close(self):
+        if self.file is None:
+            return
+        if self.simulation.recorder is self:
+            self.simulation.recorder = None
+        self._write(self.compressor.flush(zlib.Z_FINISH))
+        for frame, offset in self.index:
+            self.file.write(INDEX_ENTRY.pack(frame, offset))
+        self.file.write(FOOTER.pack(len(self.index), INDEX_MAGIC))
+        self.file.close()
+        self.file = None
+
+class ReplayPlayer:
+    """
+    Reads a replay written by ReplayRecorder and drives a Simulation with it,
+    uncapped and without rendering.
+    """
+    CHUNK_SIZE = 1 << 16
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ReplayError(f"{path} is not a level_maze replay")
+            (length,) = HEADER_LENGTH.unpack(f.read(HEADER_LENGTH.size))
+            self.header = json.loads(f.read(length).decode("utf-8"))
+            if self.header.get("version") != VERSION:
+                raise ReplayError(f"Unsupported replay version {self.header.get('version')}")
+            self.body_start = f.tell()
+            self.index = self._read_index(f)
+
+    def _read_index(self, f):
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+        if end - self.body_start < FOOTER.size:
+            return None
+        f.seek(end - FOOTER.size)
+        count, magic = FOOTER.unpack(f.read(FOOTER.size))
+        if magic != INDEX_MAGIC:
+            return None # Unfinished recording
+        f.seek(end - FOOTER.size - count * INDEX_ENTRY.size)
+        return [INDEX_ENTRY.unpack(f.read(INDEX_ENTRY.size)) for _ in range(count)]
+
+    def create_simulation(self):
+        """A Simulation with the recorded seed, size and config, reset to frame 0."""
+        from level_maze.simulation import Simulation
+
+        config_manager = ConfigManager()
+        config_manager.config = self.header["config"]
+        simulation = Simulation(config_manager, self.header["width"], self.header["height"], seed=self.header["seed"])
+        simulation.reset(self.header["seed"])
+        return simulation
+
+    def records(self, offset=0):
+        """
+        Yields ("input", (dt, InputFrame)) and ("keyframe", (frame, snapshot))
+        from the body, starting at a flush point (0 or an index offset).
+        """
+        decompressor = zlib.decompressobj(-15)
+        buffer = b""
+        pos = 0
+        with open(self.path, "rb") as f:
+            f.seek(self.body_start + offset)
+            while not decompressor.eof:
+                chunk = f.read(self.CHUNK_SIZE)
+                if not chunk:
+                    break # Truncated file: stop at the last complete record
+                buffer = buffer[pos:] + decompressor.decompress(chunk)
+                pos = 0
+                while pos < len(buffer):
+                    tag = buffer[pos]
+                    if tag == TAG_INPUT:
+                        if len(buffer) - pos < INPUT_RECORD.size:
+                            break
+                        values = INPUT_RECORD.unpack_from(buffer, pos)
+                        pos += INPUT_RECORD.size
+                        yield "input", decode_input(values[1:])
+                    elif tag == TAG_KEYFRAME:
+                        if len(buffer) - pos < KEYFRAME_HEADER.size:
+                            break
+                        _, frame, length = KEYFRAME_HEADER.unpack_from(buffer, pos)
+                        end = pos + KEYFRAME_HEADER.size + length
+                        if len(buffer) < end:
+                            break
+                        yield "keyframe", (frame, buffer[pos + KEYFRAME_HEADER.size:end])
+                        pos = end
+                    else:
+                        raise ReplayError(f"Corrupt replay record (tag {tag})")
+
+    def play(self, simulation, until=None, offset=0, on_keyframe=None):
+        """
+        Steps simulation with the recorded inputs, from the flush point at
+        offset (which must match simulation's current state), until frame
+        `until`, the end of the file, or the match outcome. Returns simulation.frame.
+        """
+        for kind, payload in self.records(offset):
+            if kind == "keyframe":
+                if on_keyframe is not None:
+                    on_keyframe(simulation, *payload)
+                continue
+            if until is not None and simulation.frame >= until:
+                break
+            dt, input_frame = payload
+            if simulation.step(dt, input_frame):
+                break
+        return simulation.frame
+
+    def seek(self, simulation, frame):
+        """Restores the nearest keyframe at or before frame, then fast-forwards to it."""
+        offset = 0
+        if self.index:
+            for keyframe, keyframe_offset in self.index:
+                if keyframe > frame:
+                    break
+                offset = keyframe_offset
+        if offset:
+            for kind, payload in self.records(offset):
+                if kind == "keyframe":
+                    simulation.restore(payload[1])
+                break
+        else:
+            # Frame 0 (or no index): replay from the start
+            simulation.restore(self.create_simulation().snapshot())
+        return self.play(simulation, until=frame, offset=offset)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play back a level_maze replay without a display.")
+    parser.add_argument("path", help="Replay file (.lmr)")
+    parser.add_argument("--seek", type=int, default=None, help="Stop at this step, seeking via keyframes")
+    parser.add_argument("--verify", action="store_true",
+                        help="Replay from the start and compare the world against every keyframe")
+    args = parser.parse_args(argv)
+
+    player = ReplayPlayer(args.path)
+    simulation = player.create_simulation()
+    print(f"Replay seed {player.header['seed']}, "
+          f"{len(player.index) if player.index is not None else 'no'} indexed keyframes")
+
+    start = time.perf_counter()
+    mismatches = []
+    if args.seek is not None:
+        player.seek(simulation, args.seek)
+    elif args.verify:
+        recorded = player.create_simulation()
+
+        def check(sim, frame, snapshot):
+            recorded.restore(snapshot)
+            if world_fingerprint(sim) != world_fingerprint(recorded):
+                mismatches.append(frame)
+        player.play(simulation, on_keyframe=check)
+    else:
+        player.play(simulation)
+    elapsed = time.perf_counter() - start
+
+    print(f"Stopped at step {simulation.frame} ({simulation.elapsed:.1f}s game time) in {elapsed:.2f}s. "
+          f"Outcome: {simulation.outcome}, enemies left: {len(simulation.enemies)}, "
+          f"player HP: {simulation.player.health}")
+    if args.verify:
+        if mismatches:
+            print(f"Diverged at keyframes: {mismatches}")
+            return 1
+        print("All keyframes match.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
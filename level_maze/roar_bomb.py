@@ -1,18 +1,19 @@
 import pygame
 import math
+from level_maze.sprite_cache import glow_sprites
 
 class RoarBomb:
     def __init__(self, start_pos, direction, config):
         self.position = pygame.Vector2(start_pos)
         self.config = config
         
-        speed = self.config.get("throw_speed", 500.0)
+        speed = self.config.throw_speed
         self.velocity = direction.normalize() * speed
         self.friction = 2.0 # Slow down over time
         
-        self.duration = self.config.get("duration", 10.0)
-        self.max_radius = self.config.get("radius", 150.0)
-        self.push_force = self.config.get("push_force", 300.0)
+        self.duration = self.config.duration
+        self.max_radius = self.config.radius
+        self.push_force = self.config.push_force
         
         self.life_timer = self.duration
         self.is_active = True
@@ -83,27 +84,25 @@ class RoarBomb:
             
         return pygame.Vector2(0,0)
 
+    def get_draw_bounds(self):
+        # Screen rects draw() can touch (dirty-rect rendering)
+        r = int(max([self.max_radius, 8] + [wave['radius'] for wave in self.waves])) + 2 # Quantized sprite radius
+        return [pygame.Rect(self.position.x - r, self.position.y - r, r * 2, r * 2)]
+
     def draw(self, surface):
         # Draw Bomb Core
         core_color = (255, 100, 0)
         pygame.draw.circle(surface, core_color, (int(self.position.x), int(self.position.y)), 8)
         
-        # Draw Waves
+        # Draw Waves (cached ring sprites, shared with every other bomb)
         for wave in self.waves:
-            r = int(wave['radius'])
-            wave_surf = pygame.Surface((r * 2, r * 2), pygame.SRCALPHA)
-            
             alpha = int(max(0, min(255, wave['alpha'])))
-            color = (255, 150, 0, alpha)
-            
-            center = (r, r)
-            pygame.draw.circle(wave_surf, color, center, r, wave['thickness'])
+            wave_surf, r = glow_sprites.ring((255, 150, 0), wave['radius'], wave['thickness'], alpha)
             
             # Blit centered
             surface.blit(wave_surf, (self.position.x - r, self.position.y - r), special_flags=pygame.BLEND_ADD)
         
         # Draw faint area tint logic removed in favor of waves, or keep?
         # Let's keep a very faint static ring to show the actual boundary
-        radius_surf = pygame.Surface((int(self.max_radius * 2), int(self.max_radius * 2)), pygame.SRCALPHA)
-        pygame.draw.circle(radius_surf, (255, 100, 0, 20), (int(self.max_radius), int(self.max_radius)), int(self.max_radius), 2)
-        surface.blit(radius_surf, (self.position.x - self.max_radius, self.position.y - self.max_radius), special_flags=pygame.BLEND_ADD)
+        radius_surf, r = glow_sprites.ring((255, 100, 0), self.max_radius, 2, 20)
+        surface.blit(radius_surf, (self.position.x - r, self.position.y - r), special_flags=pygame.BLEND_ADD)
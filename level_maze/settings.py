@@ -0,0 +1,149 @@
+from dataclasses import dataclass, field, fields, is_dataclass
+
+class ConfigError(ValueError):
+    pass
+
+def setting(default, minimum=None, choices=None):
+    """A settings field with a default and optional validation (numeric minimum, allowed values)."""
+    return field(default=default, metadata={"min": minimum, "choices": choices})
+
+def section(cls):
+    return field(default_factory=cls)
+
+# Gameplay sections of config.yaml, compiled once per load into frozen objects
+# so hot paths read plain attributes. Keys the YAML leaves out take these defaults.
+
+@dataclass(frozen=True)
+class WindowSettings:
+    width: int = setting(800, 1)
+    height: int = setting(600, 1)
+    title: str = "Level Maze"
+    fps: int = setting(60, 0)
+    dirty_rects: bool = False
+    pacing: str = setting("precise", choices=("precise", "clock"))
+
+@dataclass(frozen=True)
+class SimulationSettings:
+    tick_rate: int = setting(120, 1)
+    max_substeps: int = setting(8, 1)
+
+@dataclass(frozen=True)
+class DashSettings:
+    cooldown: float = setting(10.0, 0)
+    distance_multiplier: float = setting(2.0, 0)
+
+@dataclass(frozen=True)
+class RoarSettings:
+    cooldown: float = setting(30.0, 0)
+    push_distance_multiplier: float = setting(5.0, 0)
+
+@dataclass(frozen=True)
+class RoarBombSettings:
+    cooldown: float = setting(15.0, 0)
+    duration: float = setting(10.0, 0)
+    radius: float = setting(150.0, 0)
+    push_force: float = setting(300.0, 0)
+    throw_speed: float = setting(500.0, 0)
+
+@dataclass(frozen=True)
+class BrickBombSettings:
+    cooldown: float = setting(5.0, 0)
+    fuse_time: float = setting(3.0, 0)
+    throw_speed: float = setting(400.0, 0)
+    size: int = setting(40, 1)
+    clearance_factor: float = setting(1.5, 0)
+
+@dataclass(frozen=True)
+class AbilitySettings:
+    dash: DashSettings = section(DashSettings)
+    roar: RoarSettings = section(RoarSettings)
+    roar_bomb: RoarBombSettings = section(RoarBombSettings)
+    brick_bomb: BrickBombSettings = section(BrickBombSettings)
+
+@dataclass(frozen=True)
+class PlayerSettings:
+    speed: float = setting(300.0, 0)
+
+@dataclass(frozen=True)
+class ObstacleSettings:
+    count: int = setting(10, 0)
+
+@dataclass(frozen=True)
+class EnemySettings:
+    count: int = setting(5, 0)
+    speed: float = setting(100.0, 0)
+    batched_kinematics: bool = True
+
+@dataclass(frozen=True)
+class KeyboardControls:
+    # Key names as pygame.key.key_code() spells them (InputHandler resolves them)
+    dash: str = "space"
+    roar: str = "left shift"
+    secondary: str = "e"
+    menu_wheel: str = "q"
+
+@dataclass(frozen=True)
+class GamepadControls:
+    dash: int = setting(0, 0)
+    roar: int = setting(2, 0)
+    secondary: int = setting(3, 0)
+    menu_wheel: int = setting(4, 0)
+
+@dataclass(frozen=True)
+class ControlSettings:
+    keyboard: KeyboardControls = section(KeyboardControls)
+    gamepad: GamepadControls = section(GamepadControls)
+    keyboard_abilities: bool = False # Also read dash / roar from their keyboard keys
+
+@dataclass(frozen=True)
+class Settings:
+    window: WindowSettings = section(WindowSettings)
+    simulation: SimulationSettings = section(SimulationSettings)
+    abilities: AbilitySettings = section(AbilitySettings)
+    player: PlayerSettings = section(PlayerSettings)
+    obstacles: ObstacleSettings = section(ObstacleSettings)
+    enemies: EnemySettings = section(EnemySettings)
+    controls: ControlSettings = section(ControlSettings)
+
+def _coerce(spec, value, path):
+    kind = spec.type
+    if kind is bool:
+        ok = isinstance(value, bool)
+    elif kind is int:
+        ok = isinstance(value, int) and not isinstance(value, bool)
+    elif kind is float:
+        ok = isinstance(value, (int, float)) and not isinstance(value, bool)
+        value = float(value) if ok else value
+    else:
+        ok = isinstance(value, kind)
+    if not ok:
+        raise ConfigError(f"{path}: expected {kind.__name__}, got {value!r}")
+
+    minimum = spec.metadata.get("min")
+    if minimum is not None and value < minimum:
+        raise ConfigError(f"{path}: must be at least {minimum}, got {value!r}")
+    choices = spec.metadata.get("choices")
+    if choices is not None and value not in choices:
+        raise ConfigError(f"{path}: must be one of {', '.join(choices)}, got {value!r}")
+    return value
+
+def compile_settings(data, cls=Settings, path=""):
+    """
+    Builds cls from a parsed YAML mapping, recursing into nested sections.
+    Missing keys keep their defaults and unknown keys are ignored; a value
+    of the wrong type or out of range raises ConfigError naming its key.
+    """
+    if data is None:
+        data = {}
+    if not isinstance(data, dict):
+        raise ConfigError(f"{path or 'config'}: expected a mapping, got {data!r}")
+    values = {}
+    for spec in fields(cls):
+        if spec.name not in data:
+            continue
+        key = f"{path}.{spec.name}" if path else spec.name
+        if is_dataclass(spec.type):
+            values[spec.name] = compile_settings(data[spec.name], spec.type, key)
+        else:
+            values[spec.name] = _coerce(spec, data[spec.name], key)
+    return cls(**values)
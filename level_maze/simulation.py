@@ -0,0 +1,410 @@
+import pygame
+import sys
+import pickle
+import time
+import zlib
+import argparse
+from level_maze.config_manager import ConfigManager
+from level_maze.arena import Arena
+from level_maze.player import Player
+from level_maze.obstacle_manager import ObstacleManager
+from level_maze.enemy import Enemy
+from level_maze.enemy_store import EnemyStore, StoredEnemy
+from level_maze.combat_system import CombatSystem
+from level_maze.xtra_manager import XtraManager
+from level_maze.brick_bomb import BrickBomb
+from level_maze.input_handler import InputFrame
+from level_maze.flow_field import FlowField
+from level_maze.line_of_sight import batch_line_of_sight
+from level_maze.rng import RandomStreams
+from level_maze.profiler import FrameProfiler
+from level_maze.event_log import log
+from level_maze.telemetry import telemetry, BOMB_ROAR, BOMB_BRICK, TARGET_PLAYER, TARGET_ENEMY
+
+class Simulation:
+    """
+    Display-free owner of the level_maze world.
+    step() advances every entity by dt from an InputFrame instead of live
+    pygame input, so matches can run uncapped without a window or Surfaces.
+    """
+    SLOWMO_SCALE = 0.2 # Game seconds per real second while slow-mo is active
+    SAVE_MAGIC = b"LMSAVE02" # 02: compiled settings objects in the player
+
+    def __init__(self, config_manager, width=None, height=None, seed=None):
+        self.config_manager = config_manager
+        # Every random draw in the world comes from these named streams, so a seed
+        # (plus the input stream) reproduces a match exactly; see level_maze.replay
+        self.rng = RandomStreams(seed)
+        # Settings the world was built with; apply_settings() moves it to newer ones
+        self.settings = config_manager.settings
+        self.width = width if width is not None else self.settings.window.width
+        self.height = height if height is not None else self.settings.window.height
+
+        # Arena leaves a 50px margin around the window
+        self.arena = Arena(50, 50, self.width - 100, self.height - 100)
+
+        self.obstacle_manager = ObstacleManager()
+        self.combat_system = CombatSystem()
+        self.xtra_manager = XtraManager(self.rng.get("xtras"))
+        # One shared path field toward the player for every PATHFINDING enemy
+        self.flow_field = FlowField()
+        # Optional structure-of-arrays enemy kinematics (integrated in one NumPy pass)
+        self.enemy_store = EnemyStore() if self.settings.enemies.batched_kinematics else None
+
+        self.player = None
+        self.enemies = []
+        self.roar_bombs = []
+        self.brick_bombs = []
+
+        # Time Scaling (Slow Motion after dash/roar)
+        self.slowmo_timer = 0.0
+        self.time_scale = 1.0
+
+        # Result of the last step: None, "PLAYER_DIED" or "VICTORY" (also when the player died on the last kill)
+        self.outcome = None
+        self.frame = 0
+        self.elapsed = 0.0
+
+        # Optional replay.ReplayRecorder; sees every step's dt and input
+        self.recorder = None
+        # Times the phases of step(); disabled (no-op spans) unless the owner turns it on
+        self.profiler = FrameProfiler()
+
+    def __getstate__(self):
+        # The config and recorder belong to whoever restores the snapshot;
+        # caches (nav grid, flow field, broadphase cells) are dropped by their owners
+        state = self.__dict__.copy()
+        state["config_manager"] = None
+        state["recorder"] = None
+        state["profiler"] = None
+        return state
+
+    def snapshot(self):
+        """Whole world state (entities, paths, obstacles, bombs, timers, RNG streams) as bytes."""
+        return pickle.dumps(self, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def restore(self, snapshot):
+        """
+        Replaces this world's state with one from snapshot(); the config,
+        recorder and profiler stay attached. A blob can be restored any number of times
+        (restart the same level, A/B checkpoints).
+        """
+        config_manager = self.config_manager
+        recorder = self.recorder
+        profiler = self.profiler
+        self.__dict__.update(pickle.loads(snapshot).__dict__)
+        self.config_manager = config_manager
+        self.recorder = recorder
+        self.profiler = profiler
+        # The snapshot may predate a config reload (retry, quickload, pre-built level)
+        self.apply_settings(config_manager.settings, spawn=False)
+
+    def apply_settings(self, settings, spawn=True):
+        """
+        Moves the running match onto new settings (config hot reload): player
+        speed, cooldowns and bomb parameters, enemy speed, and, with spawn,
+        extra enemies when enemies.count went up. The rest (obstacle count,
+        enemy count going down) takes effect from the next reset().
+        """
+        previous = self.settings
+        if settings == previous:
+            return
+        self.settings = settings
+        if self.player is None:
+            return
+        if settings.abilities != previous.abilities or settings.player != previous.player:
+            self.player.apply_settings(settings)
+        if settings.enemies.speed != previous.enemies.speed:
+            for enemy in self.enemies:
+                enemy.speed = settings.enemies.speed
+        if spawn and settings.enemies.count > previous.enemies.count:
+            self.spawn_enemies(settings.enemies.count - previous.enemies.count)
+
+    def save(self, path):
+        """Writes a compressed snapshot to path."""
+        with open(path, "wb") as f:
+            f.write(self.SAVE_MAGIC + zlib.compress(self.snapshot()))
+
+    def load(self, path):
+        """Restores a world written by save()."""
+        with open(path, "rb") as f:
+            data = f.read()
+        if not data.startswith(self.SAVE_MAGIC):
+            raise ValueError(f"{path} is not a level_maze save")
+        self.restore(zlib.decompress(data[len(self.SAVE_MAGIC):]))
+
+    def reset(self, seed=None):
+        """
+        Starts a new match. seed reseeds every random stream; None keeps the
+        seed the Simulation was created with on the first reset and picks a
+        fresh one on every later reset (restarts get new layouts).
+        """
+        if seed is not None or self.player is not None:
+            self.rng.reseed(seed)
+
+        self.settings = self.config_manager.settings
+        # Create new player
+        self.player = Player(self.width // 2, self.height // 2, self.config_manager, rng=self.rng.get("vfx"))
+
+        # Reset Obstacles
+        self.obstacle_manager.reset()
+        self.xtra_manager.reset()
+        # Define a safe zone around player for spawning
+        player_safe_zone = pygame.Rect(self.player.position.x - 100, self.player.position.y - 100, 200, 200)
+        stats = self.obstacle_manager.generate_obstacles(self.arena, player_safe_zone,
+                                                         self.settings.obstacles.count,
+                                                         rng=self.rng.get("obstacles"))
+        log.info("Placed %d/%d obstacles in %.1fms.", stats['placed'], stats['requested'], stats['elapsed_ms'])
+
+        # Reset Enemies
+        if self.enemy_store is not None:
+            self.enemy_store.clear()
+        self.enemies.clear()
+        self.roar_bombs.clear()
+        self.brick_bombs.clear()
+        self.spawn_enemies(self.settings.enemies.count)
+
+        self.slowmo_timer = 0.0
+        self.time_scale = 1.0
+        self.outcome = None
+        self.frame = 0
+        self.elapsed = 0.0
+
+        log.info("Game Reset!")
+        return self.player
+
+    def spawn_enemies(self, count):
+        rng = self.rng.get("enemies")
+        ai_rng = self.rng.get("enemy_ai")
+        # Enemy radius is 15: centres keep 20px from the walls, bodies keep the
+        # 5px obstacle margin and stay off the player and each other
+        area = self.arena.rect.inflate(-10, -10)
+        player_rect = pygame.Rect(self.player.position.x - 50, self.player.position.y - 50, 100, 100)
+        exclude = [player_rect] + [enemy.rect for enemy in self.enemies]
+        spawned_count = 0
+
+        while spawned_count < count:
+            spot = self.obstacle_manager.free_space.sample(rng, area, (30, 30), clearance=5, exclude=exclude)
+            if spot is None:
+                break
+            ex, ey = spot[0] + 15, spot[1] + 15
+            if self.enemy_store is not None:
+                enemy = self.enemy_store.add(StoredEnemy(ex, ey, rng=ai_rng))
+            else:
+                enemy = Enemy(ex, ey, rng=ai_rng)
+            enemy.speed = self.settings.enemies.speed
+            self.enemies.append(enemy)
+            exclude.append(enemy.rect)
+            spawned_count += 1
+
+        log.info("Spawned %d/%d enemies.", spawned_count, count)
+
+    def enemy_visibility(self):
+        """Bool array: True where enemy i has a clear line of sight to the player."""
+        if self.enemy_store is not None:
+            starts = self.enemy_store.positions()
+        else:
+            starts = [(e.position.x, e.position.y) for e in self.enemies]
+        target = (self.player.position.x, self.player.position.y)
+        return batch_line_of_sight(starts, target, self.obstacle_manager.get_obstacle_boxes())
+
+    def advance_slowmo(self, real_dt):
+        """Ticks the slow-mo timer in real time and returns the current time scale."""
+        if self.slowmo_timer > 0:
+            self.slowmo_timer -= real_dt
+            self.time_scale = self.SLOWMO_SCALE
+        else:
+            self.time_scale = 1.0
+        return self.time_scale
+
+    def game_time(self, real_dt):
+        """
+        Game seconds owed for real_dt of wall time. Unlike real_dt * advance_slowmo(),
+        a frame that straddles the end of slow-mo is split at that point, so the
+        result does not depend on the frame rate.
+        """
+        slow = min(real_dt, max(self.slowmo_timer, 0.0))
+        self.advance_slowmo(real_dt)
+        return slow * self.SLOWMO_SCALE + (real_dt - slow)
+
+    def step(self, dt, input_frame):
+        """
+        Advances the world by dt seconds of game time.
+        input_frame is an InputFrame (or anything exposing the same queries).
+        """
+        if self.recorder is not None:
+            self.recorder.record(self, dt, input_frame)
+
+        player = self.player
+        self.outcome = None
+        span = self.profiler.span
+
+        with span("step.abilities"):
+            # Abilities
+            input_state = input_frame.get_abilities_state()
+            if input_state['dash']:
+                player.attempt_dash()
+
+            if input_state['roar']:
+                if player.attempt_roar():
+                    # Apply Roar Effect (AoE Push)
+                    roar_radius = player.get_roar_radius()
+                    for enemy in self.enemies:
+                        diff = enemy.position - player.position
+                        dist = diff.length()
+                        if dist < roar_radius:
+                            push_dir = diff.normalize() if dist > 0 else pygame.Vector2(1,0)
+                            roar_force = 500 # Strong impulse
+                            enemy.apply_knockback(push_dir * roar_force)
+
+            # Secondary Ability (Roar Bomb)
+            if input_frame.get_secondary_ability_state():
+                new_bomb = player.attempt_secondary_ability()
+                if new_bomb:
+                    if isinstance(new_bomb, BrickBomb):
+                        self.brick_bombs.append(new_bomb)
+                        telemetry.bomb(BOMB_BRICK, new_bomb.position)
+                    else:
+                        self.roar_bombs.append(new_bomb)
+                        telemetry.bomb(BOMB_ROAR, new_bomb.position)
+
+            # Check SlowMo Triggers (Flags from Player)
+            if player.just_dashed:
+                self.slowmo_timer = 1.0 # 1 Second SlowMo
+            if player.just_roared:
+                self.slowmo_timer = 1.0
+
+            # Collect Pending Bombs
+            if player.pending_bombs:
+                self.brick_bombs.extend(player.pending_bombs)
+                for bomb in player.pending_bombs:
+                    telemetry.bomb(BOMB_BRICK, bomb.position)
+                player.pending_bombs = []
+
+        # Update Obstacle Manager (Lifespan check)
+        with span("step.obstacles"):
+            self.obstacle_manager.update(dt)
+
+        obstacle_manager = self.obstacle_manager
+        with span("step.player"):
+            player.update(dt, input_frame, self.arena, obstacle_manager)
+        with span("step.xtras"):
+            self.xtra_manager.update(dt, self.arena, obstacle_manager)
+        with span("step.enemies"):
+            # Recomputed lazily, only after the player changes cell or obstacles change.
+            # With few enemies their own A* every 2 seconds is cheaper than the shared field.
+            flow_field = None
+            if len(self.enemies) >= FlowField.MIN_ENEMIES:
+                flow_field = self.flow_field
+                flow_field.set_goal(player.position, obstacle_manager, self.arena)
+            # Every enemy's sight line in one pass. Enemies only move themselves in
+            # update(), so testing from the start-of-loop positions gives the same answers.
+            visible = self.enemy_visibility()
+            if self.enemy_store is not None:
+                self.enemy_store.update(dt, player, self.arena, obstacle_manager, flow_field, visible)
+            else:
+                for enemy, can_see in zip(self.enemies, visible):
+                    enemy.update(dt, player, self.arena, obstacle_manager, flow_field, bool(can_see))
+
+        with span("step.bombs"):
+            # Update Bombs
+            active_bombs = []
+            for bomb in self.roar_bombs:
+                bomb.update(dt, self.arena)
+                if bomb.is_active:
+                    active_bombs.append(bomb)
+            self.roar_bombs = active_bombs
+
+            # Update Brick Bombs
+            active_bricks = []
+            for bb in self.brick_bombs:
+                # Update against Arena + Obstacles (incl. previously solidified) + Enemies
+                bb.update(dt, self.arena, obstacle_manager, self.enemies)
+                if bb.is_solidified:
+                    # Convert to Obstacle
+                    # Lifespan: 1 Minute (60 seconds)
+                    self.obstacle_manager.add_dynamic_obstacle(bb.rect, bb.color, lifespan=60.0)
+                else:
+                    active_bricks.append(bb)
+            self.brick_bombs = active_bricks
+
+        positions = self.enemy_store.positions() if self.enemy_store is not None else None
+        with span("combat.resolve_collisions"):
+            self.combat_system.resolve_collisions(player, self.enemies, dt, positions)
+        with span("combat.resolve_enemy_collisions"):
+            self.combat_system.resolve_enemy_collisions(self.enemies, positions)
+        with span("combat.resolve_bomb_collisions"):
+            self.combat_system.resolve_bomb_collisions(self.roar_bombs, self.enemies, positions)
+
+        with span("step.xtra_collection"):
+            # Xtra Collection
+            for xtra in self.xtra_manager.get_xtras():
+                if xtra.active:
+                    if player.rect.colliderect(xtra.rect):
+                        self.collect_xtra(xtra, player, TARGET_PLAYER)
+                    else:
+                        for enemy in self.enemies:
+                            if enemy.rect.colliderect(xtra.rect):
+                                self.collect_xtra(xtra, enemy, TARGET_ENEMY)
+                                break
+
+        # Remove dead enemies and Award XP
+        alive_enemies = []
+        for e in self.enemies:
+            if e.health > 0:
+                alive_enemies.append(e)
+            else:
+                player.gain_xp(50) # XP Value for Kill
+        if self.enemy_store is not None and len(alive_enemies) != len(self.enemies):
+            self.enemy_store.retain(alive_enemies)
+        self.enemies = alive_enemies
+
+        # Death Check
+        if player.health <= 0:
+            log.info("Player Died!")
+            self.outcome = "PLAYER_DIED"
+
+        # Victory Check (All enemies dead), independent of the death check as in the original loop
+        if len(self.enemies) == 0:
+            log.info("All Enemies Destroyed!")
+            self.outcome = "VICTORY"
+
+        self.frame += 1
+        self.elapsed += dt
+        return self.outcome
+
+    def collect_xtra(self, xtra, entity, collector):
+        health = entity.health
+        xtra.on_collect(entity)
+        xtra.active = False
+        telemetry.xtra_pickup(collector, entity.health - health, entity.health, entity.position)
+
+def main(argv=None):
+    """
+    Headless soak run: steps the world uncapped with idle input and reports throughput.
+    Usage: python -m level_maze.simulation --frames 10000 --dt 0.016
+    """
+    parser = argparse.ArgumentParser(description="Run level_maze without a display.")
+    parser.add_argument("--frames", type=int, default=10000, help="Number of steps to simulate")
+    parser.add_argument("--dt", type=float, default=1.0 / 60.0, help="Game seconds per step")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for the world's random streams")
+    args = parser.parse_args(argv)
+
+    sim = Simulation(ConfigManager(), seed=args.seed)
+    sim.reset()
+    idle = InputFrame()
+
+    start = time.perf_counter()
+    for _ in range(args.frames):
+        if sim.step(args.dt, idle):
+            break
+    elapsed = time.perf_counter() - start
+
+    steps_per_sec = sim.frame / elapsed if elapsed > 0 else float("inf")
+    log.flush()
+    print(f"Simulated {sim.frame} steps ({sim.elapsed:.1f}s game time) in {elapsed:.2f}s "
+          f"-> {steps_per_sec:.0f} steps/s, {sim.elapsed / elapsed:.1f}x real time. "
+          f"Enemies left: {len(sim.enemies)}, Player HP: {sim.player.health}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
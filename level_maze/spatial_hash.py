@@ -0,0 +1,143 @@
+import math
+
+class SpatialHash:
+    """
+    Uniform bucketed grid over world space.
+    Each item is stored with its pygame.Rect in every cell the rect touches,
+    so rect and segment queries only test the handful of items near them
+    instead of the whole list. Results come back in insertion order, which
+    matches a linear scan over the original list.
+    """
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.buckets = {} # Key: (cx, cy), Value: list of items
+        self.entries = {} # Key: item, Value: (seq, rect, cells)
+        self.next_seq = 0
+
+    def clear(self):
+        self.buckets = {}
+        self.entries = {}
+        self.next_seq = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _cells_for_rect(self, rect):
+        cs = self.cell_size
+        x0 = rect.left // cs
+        y0 = rect.top // cs
+        x1 = max(rect.left, rect.right - 1) // cs
+        y1 = max(rect.top, rect.bottom - 1) // cs
+        return [(cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1)]
+
+    def insert(self, item, rect):
+        if item in self.entries:
+            self.remove(item)
+        # 1px margin so segment queries still find rects that clipline
+        # reports as touching right on a cell boundary
+        cells = self._cells_for_rect(rect.inflate(2, 2))
+        for cell in cells:
+            bucket = self.buckets.get(cell)
+            if bucket is None:
+                self.buckets[cell] = [item]
+            else:
+                bucket.append(item)
+        self.entries[item] = (self.next_seq, rect, cells)
+        self.next_seq += 1
+
+    def remove(self, item):
+        entry = self.entries.pop(item, None)
+        if entry is None:
+            return
+        for cell in entry[2]:
+            bucket = self.buckets.get(cell)
+            if bucket is None:
+                continue
+            bucket.remove(item)
+            if not bucket:
+                del self.buckets[cell]
+
+    def _collect(self, cells, test):
+        found = []
+        seen = set()
+        buckets = self.buckets
+        entries = self.entries
+        for cell in cells:
+            bucket = buckets.get(cell)
+            if not bucket:
+                continue
+            for item in bucket:
+                if item in seen:
+                    continue
+                seen.add(item)
+                if test(entries[item][1]):
+                    found.append(item)
+        if len(found) > 1:
+            found.sort(key=lambda item: entries[item][0])
+        return found
+
+    def _any(self, cells, test):
+        # Early-out variant of _collect for yes/no queries
+        buckets = self.buckets
+        entries = self.entries
+        for cell in cells:
+            bucket = buckets.get(cell)
+            if not bucket:
+                continue
+            for item in bucket:
+                if test(entries[item][1]):
+                    return True
+        return False
+
+    def any_rect(self, rect):
+        return self._any(self._cells_for_rect(rect), rect.colliderect)
+
+    def any_segment(self, start, end):
+        return self._any(self._cells_for_segment(start, end), lambda r: r.clipline(start, end))
+
+    def query_rect(self, rect):
+        """Returns every item whose rect collides with the given rect."""
+        return self._collect(self._cells_for_rect(rect), rect.colliderect)
+
+    def query_segment(self, start, end):
+        """Returns every item whose rect is crossed by the segment start -> end."""
+        return self._collect(self._cells_for_segment(start, end), lambda r: r.clipline(start, end))
+
+    def _cells_for_segment(self, start, end):
+        # Grid traversal (Amanatides & Woo): visit each cell the segment passes through
+        cs = self.cell_size
+        x0, y0 = start[0], start[1]
+        x1, y1 = end[0], end[1]
+        cx = int(math.floor(x0 / cs))
+        cy = int(math.floor(y0 / cs))
+        end_cx = int(math.floor(x1 / cs))
+        end_cy = int(math.floor(y1 / cs))
+
+        dx = x1 - x0
+        dy = y1 - y0
+        step_x = 1 if dx > 0 else -1
+        step_y = 1 if dy > 0 else -1
+
+        if dx != 0:
+            next_x = (cx + 1) * cs if dx > 0 else cx * cs
+            t_max_x = (next_x - x0) / dx
+            t_delta_x = cs / abs(dx)
+        else:
+            t_max_x = t_delta_x = math.inf
+        if dy != 0:
+            next_y = (cy + 1) * cs if dy > 0 else cy * cs
+            t_max_y = (next_y - y0) / dy
+            t_delta_y = cs / abs(dy)
+        else:
+            t_max_y = t_delta_y = math.inf
+
+        cells = [(cx, cy)]
+        for _ in range(abs(end_cx - cx) + abs(end_cy - cy)):
+            if t_max_x < t_max_y:
+                cx += step_x
+                t_max_x += t_delta_x
+            else:
+                cy += step_y
+                t_max_y += t_delta_y
+            cells.append((cx, cy))
+        return cells
@@ -0,0 +1,123 @@
+import pygame
+from collections import OrderedDict
+
+class GlowSpriteCache:
+    """
+    Shared LRU cache of pre-rendered SRCALPHA sprites for additive glow effects
+    (roar rings, dash ghosts, particles). Radius and alpha are quantized so an
+    expanding, fading wave or a shrinking particle keeps hitting the same few
+    sprites instead of allocating and rasterizing a new Surface every frame.
+    Bounded both by entry count and by pixel bytes, since one roar ring
+    outweighs a thousand particle dots. hits / misses / evictions count
+    lookups since the last reset_stats().
+    """
+    RADIUS_STEP = 2 # px
+    DISC_STEP = 0.5 # px; discs are small, so finer steps
+    ALPHA_STEP = 8 # 32 alpha levels
+
+    def __init__(self, max_entries=2048, max_bytes=32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sprites = OrderedDict() # key -> Surface, least recently used first
+        self.bytes = 0
+        self.reset_stats()
+
+    def __len__(self):
+        return len(self.sprites)
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.sprites),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+    def clear(self):
+        self.sprites.clear()
+        self.bytes = 0
+
+    def quantize_radius(self, radius):
+        step = self.RADIUS_STEP
+        return max(step, int(round(radius / step)) * step)
+
+    def quantize_alpha(self, alpha):
+        # Snap up, so a sprite never fades out before the effect does
+        step = self.ALPHA_STEP
+        alpha = int(alpha)
+        if alpha <= 0:
+            return 0
+        return min(255, (alpha + step - 1) // step * step)
+
+    def get(self, key, render):
+        """Cached sprite for key; render() builds it on a miss."""
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.sprites.move_to_end(key)
+            self.hits += 1
+            return sprite
+
+        self.misses += 1
+        sprite = render()
+        self.sprites[key] = sprite
+        self.bytes += self._size(sprite)
+        while len(self.sprites) > 1 and (len(self.sprites) > self.max_entries or self.bytes > self.max_bytes):
+            _, evicted = self.sprites.popitem(last=False)
+            self.bytes -= self._size(evicted)
+            self.evictions += 1
+        return sprite
+
+    @staticmethod
+    def _size(sprite):
+        return sprite.get_width() * sprite.get_height() * sprite.get_bytesize()
+
+    def ring(self, color, radius, thickness, alpha):
+        """
+        (2r, 2r) sprite with a ring of radius r centred at (r, r), r being the
+        quantized radius; blit it at center - r. Returns (sprite, r).
+        """
+        r = self.quantize_radius(radius)
+        a = self.quantize_alpha(alpha)
+
+        def render():
+            sprite = pygame.Surface((r * 2, r * 2), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, (color[0], color[1], color[2], a), (r, r), r, thickness)
+            return sprite
+
+        return self.get(("ring", color[:3], r, thickness, a), render), r
+
+    def disc(self, color, radius, alpha):
+        """
+        Filled-circle counterpart of ring(): radius snaps to DISC_STEP and alpha
+        to ALPHA_STEP. The sprite is (2 * int(r), 2 * int(r)) with the disc
+        centred at (r, r), r being the snapped radius; blit it at center - r.
+        """
+        return self.disc_sprite(color[:3], max(1, int(round(radius / self.DISC_STEP))), self.quantize_alpha(alpha))
+
+    def disc_sprite(self, rgb, steps, alpha):
+        """disc() for a radius already snapped (in DISC_STEP units) and an alpha already quantized."""
+        key = ("disc", rgb, steps, alpha)
+        # Hits skip get()'s render closure: particles look up many discs a frame
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.sprites.move_to_end(key)
+            self.hits += 1
+            return sprite
+        return self.get(key, lambda: self._render_disc(*key[1:]))
+
+    def _render_disc(self, color, steps, alpha):
+        r = steps * self.DISC_STEP
+        sprite = pygame.Surface((int(r) * 2, int(r) * 2), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, (color[0], color[1], color[2], alpha), (r, r), r)
+        return sprite
+
+# Shared by every Player, RoarBomb and VFXManager
+glow_sprites = GlowSpriteCache()
@@ -0,0 +1,221 @@
+"""
+Gameplay telemetry: fixed-size binary event records in a memory-mapped ring
+buffer file, for offline (or live) analysis of a session.
+
+Emitting is a struct pack straight into the mapping plus a store of the
+record count; there is no lock, no syscall and no allocation on the game
+thread, and nothing at all while the writer is closed.
+
+Usage:
+    python -m level_maze.telemetry session.lmt             # summary per event kind
+    python -m level_maze.telemetry session.lmt --dump      # one line per record
+    python -m level_maze.telemetry session.lmt --follow    # tail a running game
+
+File layout (little-endian):
+    header (HEADER_SIZE bytes): MAGIC, u32 record size, u32 capacity,
+        u64 records written so far
+    capacity record slots: u64 seq, f64 time, u16 kind, u32 id,
+        f32 a, b, c, d, u64 seq again
+Record n (1-based seq) lives in slot (n - 1) % capacity. The writer fills the
+slot front to back (leading seq first, trailing seq last) before publishing
+the new count, so a reader never needs a lock: it reads the count, then reads
+each slot in the opposite order (trailing seq, fields, leading seq) and
+accepts it only if both seq copies equal the seq it expects. A mismatch means
+the writer lapped the reader and overwrote the slot before or while it was
+read.
+
+Record fields by kind:
+    FRAME        id frame number, a frame ms, b fixed steps run, c simulation ms, d enemies
+    ENEMY_STATE  id enemy handle, a old state code, b new state code, c x, d y
+    DAMAGE       id target (TARGET_PLAYER / TARGET_ENEMY), a amount, b health after, c x, d y
+    BOMB         id bomb (BOMB_ROAR / BOMB_BRICK), a x, b y
+    XTRA_PICKUP  id collector (TARGET_PLAYER / TARGET_ENEMY), a amount restored, b health after, c x, d y
+State codes are indices into level_maze.enemy.STATES; enemy handles are the
+low 32 bits of the Enemy's id(), stable while it lives.
+"""
+import os
+import sys
+import mmap
+import time
+import struct
+import argparse
+from collections import Counter, namedtuple
+
+MAGIC = b"LMTELEM1"
+HEADER = struct.Struct("<8sIIQ")
+HEADER_SIZE = 64 # Header padded so slots start cache-line aligned
+COUNT = struct.Struct("<Q")
+COUNT_OFFSET = 16
+RECORD = struct.Struct("<QdHxxIffffQ")
+SEQ = struct.Struct("<Q")
+TRAILING_SEQ_OFFSET = RECORD.size - SEQ.size
+
+FRAME = 1
+ENEMY_STATE = 2
+DAMAGE = 3
+BOMB = 4
+XTRA_PICKUP = 5
+KIND_NAMES = {FRAME: "FRAME", ENEMY_STATE: "ENEMY_STATE", DAMAGE: "DAMAGE", BOMB: "BOMB",
+              XTRA_PICKUP: "XTRA_PICKUP"}
+
+TARGET_PLAYER = 0
+TARGET_ENEMY = 1
+BOMB_ROAR = 0
+BOMB_BRICK = 1
+
+Record = namedtuple("Record", "seq time kind id a b c d")
+
+class TelemetryWriter:
+    """
+    Appends records to a ring buffer file once open()ed; every emit is a
+    no-op while closed. One writer per file, on one thread (the game loop).
+    """
+    def __init__(self):
+        self.buffer = None
+        self.path = None
+        self.capacity = 0
+        self.count = 0
+        self.start = 0.0
+
+    def open(self, path, capacity=65536):
+        self.close()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        size = HEADER_SIZE + capacity * RECORD.size
+        with open(path, "w+b") as f:
+            f.truncate(size)
+            self.buffer = mmap.mmap(f.fileno(), size)
+        HEADER.pack_into(self.buffer, 0, MAGIC, RECORD.size, capacity, 0)
+        self.path = path
+        self.capacity = capacity
+        self.count = 0
+        self.start = time.perf_counter()
+
+    def close(self):
+        if self.buffer is not None:
+            self.buffer.flush()
+            self.buffer.close()
+            self.buffer = None
+
+    def emit(self, kind, id=0, a=0.0, b=0.0, c=0.0, d=0.0):
+        buffer = self.buffer
+        if buffer is None:
+            return
+        seq = self.count + 1
+        # pack_into stores the fields in order: the leading seq goes in first
+        RECORD.pack_into(buffer, HEADER_SIZE + (self.count % self.capacity) * RECORD.size,
+                         seq, time.perf_counter() - self.start, kind, id, a, b, c, d, seq)
+        COUNT.pack_into(buffer, COUNT_OFFSET, seq) # Publish only after the slot is complete
+        self.count = seq
+
+    def frame(self, number, frame_ms, steps, simulation_ms, enemies):
+        self.emit(FRAME, number, frame_ms, steps, simulation_ms, enemies)
+
+    def enemy_state(self, enemy, old_code, new_code):
+        if self.buffer is not None:
+            position = enemy.position
+            self.emit(ENEMY_STATE, id(enemy) & 0xFFFFFFFF, old_code, new_code, position.x, position.y)
+
+    def damage(self, target, amount, health, position):
+        if self.buffer is not None:
+            self.emit(DAMAGE, target, amount, health, position.x, position.y)
+
+    def bomb(self, kind, position):
+        if self.buffer is not None:
+            self.emit(BOMB, kind, position.x, position.y)
+
+    def xtra_pickup(self, collector, amount, health, position):
+        if self.buffer is not None:
+            self.emit(XTRA_PICKUP, collector, amount, health, position.x, position.y)
+
+class TelemetryReader:
+    """
+    Reads a telemetry file, possibly while the game is still writing it.
+    poll() returns the records written since the last call; lost counts
+    records the writer overwrote before they could be read.
+    """
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, record_size, self.capacity, _ = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC or record_size != RECORD.size:
+            raise ValueError(f"{path} is not a level_maze telemetry file")
+        self.cursor = 0 # Last seq returned
+        self.lost = 0
+
+    def written(self):
+        return COUNT.unpack_from(self.buffer, COUNT_OFFSET)[0]
+
+    def poll(self):
+        count = self.written()
+        if count - self.cursor > self.capacity:
+            # Lapped: the oldest unread records are gone
+            self.lost += count - self.capacity - self.cursor
+            self.cursor = count - self.capacity
+        records = []
+        for seq in range(self.cursor + 1, count + 1):
+            record = self.read_slot(seq)
+            if record is None:
+                self.lost += 1 # Overwritten while we were reading
+                continue
+            records.append(record)
+        self.cursor = count
+        return records
+
+    def read_slot(self, seq):
+        """
+        Record seq, or None if its slot was overwritten. Seqlock order: a
+        writer that starts on the slot after the trailing seq was read changes
+        the leading seq before any field, so rechecking it last catches a torn read.
+        """
+        buffer = self.buffer
+        offset = HEADER_SIZE + ((seq - 1) % self.capacity) * RECORD.size
+        if SEQ.unpack_from(buffer, offset + TRAILING_SEQ_OFFSET)[0] != seq:
+            return None
+        fields = RECORD.unpack_from(buffer, offset)
+        if SEQ.unpack_from(buffer, offset)[0] != seq:
+            return None
+        return Record(*fields[:-1])
+
+    def close(self):
+        self.buffer.close()
+
+def format_record(record):
+    return (f"{record.seq:>8} {record.time:10.4f}s {KIND_NAMES.get(record.kind, record.kind):<12}"
+            f" id={record.id:<10} {record.a:10.3f} {record.b:10.3f} {record.c:10.3f} {record.d:10.3f}")
+
+# Shared by the game loop, CombatSystem and Enemy; opened by main() when enabled in config
+telemetry = TelemetryWriter()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Read a level_maze telemetry ring buffer.")
+    parser.add_argument("path", help="Telemetry file (.lmt)")
+    parser.add_argument("--dump", action="store_true", help="Print every record")
+    parser.add_argument("--follow", action="store_true", help="Keep printing records as the game writes them")
+    args = parser.parse_args(argv)
+
+    reader = TelemetryReader(args.path)
+    if args.follow:
+        try:
+            while True:
+                for record in reader.poll():
+                    print(format_record(record))
+                time.sleep(0.1)
+        except KeyboardInterrupt:
+            return 0
+
+    records = reader.poll()
+    if args.dump:
+        for record in records:
+            print(format_record(record))
+    counts = Counter(KIND_NAMES.get(record.kind, record.kind) for record in records)
+    print(f"{len(records)} records ({reader.lost} overwritten before reading): "
+          + ", ".join(f"{name} {count}" for name, count in sorted(counts.items())))
+    frames = [record.a for record in records if record.kind == FRAME]
+    if frames:
+        print(f"Frames: mean {sum(frames) / len(frames):.2f}ms, worst {max(frames):.2f}ms over {len(frames)}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
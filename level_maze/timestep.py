@@ -0,0 +1,157 @@
+import pygame
+import time
+import math
+from collections import deque
+from contextlib import contextmanager
+
+class FixedTimestep:
+    """
+    Accumulator loop: real frame time (scaled by the Simulation's slow-mo) is
+    banked, then spent in whole steps of 1 / tick_rate game seconds, so physics
+    behaves the same at any display rate. At most max_substeps run per frame;
+    any backlog beyond that is dropped instead of snowballing.
+    alpha is how far game time has got into the next, not yet simulated, step
+    (0..1); renderers interpolate the last two states with it.
+    A sample's button edges (InputFrame.pressed / released) go to the first
+    step it drives, and wait for the next frame when this one runs none.
+    """
+    def __init__(self, tick_rate=120, max_substeps=8):
+        self.step_dt = 1.0 / tick_rate
+        self.max_substeps = max_substeps
+        self.accumulator = 0.0
+        self.alpha = 0.0
+        self.interpolator = StateInterpolator()
+        self.pending_edges = (frozenset(), frozenset()) # (pressed, released) no step has seen yet
+
+    def reset(self):
+        self.accumulator = 0.0
+        self.alpha = 0.0
+        self.interpolator.clear()
+        self.pending_edges = (frozenset(), frozenset())
+
+    def advance(self, simulation, real_dt, input_frame):
+        """Runs the whole steps owed for real_dt; returns how many ran."""
+        self.accumulator += simulation.game_time(real_dt)
+        pressed, released = self.pending_edges
+        if pressed or released:
+            input_frame = input_frame.with_edges(pressed | input_frame.pressed, released | input_frame.released)
+
+        steps = 0
+        while self.accumulator >= self.step_dt and steps < self.max_substeps:
+            self.interpolator.capture(simulation)
+            simulation.step(self.step_dt, input_frame)
+            if steps == 0:
+                input_frame = input_frame.with_edges()
+            self.accumulator -= self.step_dt
+            steps += 1
+            if simulation.outcome is not None:
+                break
+        self.pending_edges = (input_frame.pressed, input_frame.released)
+
+        if self.accumulator >= self.step_dt:
+            # Spiral-of-death guard: the world slows down rather than the frame rate collapsing
+            self.accumulator %= self.step_dt
+        self.alpha = self.accumulator / self.step_dt
+        return steps
+
+class StateInterpolator:
+    """
+    Remembers where the moving entities were before the latest step so a frame
+    can be drawn part way between that and the current state. Entities that
+    did not exist before the step are drawn where they are.
+    """
+    def __init__(self):
+        self.previous = {} # id(entity) -> (entity, position before the step)
+
+    def clear(self):
+        self.previous = {}
+
+    def moving_entities(self, simulation):
+        yield simulation.player
+        yield from simulation.enemies
+        yield from simulation.roar_bombs
+        yield from simulation.brick_bombs
+
+    def capture(self, simulation):
+        self.previous = {id(e): (e, e.position.copy()) for e in self.moving_entities(simulation)}
+
+    @contextmanager
+    def interpolated(self, simulation, alpha):
+        """Moves entities to their blended positions for the duration of the block."""
+        restore = []
+        if alpha > 0:
+            previous = self.previous
+            for entity in self.moving_entities(simulation):
+                entry = previous.get(id(entity))
+                if entry is None or entry[0] is not entity:
+                    continue
+                # Keep the original objects: enemies alias player.position as their target
+                current = entity.position
+                rect = getattr(entity, "rect", None)
+                restore.append((entity, current, rect, rect.copy() if rect is not None else None))
+
+                blended = entry[1].lerp(current, alpha)
+                entity.position = blended
+                if rect is not None:
+                    rect.center = (int(blended.x), int(blended.y))
+        try:
+            yield
+        finally:
+            for entity, current, rect, saved_rect in restore:
+                entity.position = current
+                if rect is not None:
+                    rect.update(saved_rect)
+
+class FramePacer:
+    """
+    Caps the render loop at fps and keeps frame-time statistics.
+    mode "clock" uses pygame.time.Clock.tick (millisecond granularity).
+    mode "precise" schedules against time.perf_counter deadlines: it sleeps
+    until spin_margin before the deadline, then busy-waits the rest, which
+    trades a little CPU for sub-millisecond pacing.
+    """
+    def __init__(self, fps=60, mode="precise", spin_margin=0.002, history=240):
+        self.fps = fps
+        self.mode = mode
+        self.frame_time = 1.0 / fps if fps else 0.0
+        self.spin_margin = spin_margin
+        self.clock = pygame.time.Clock()
+        self.last = time.perf_counter()
+        self.deadline = self.last + self.frame_time
+        self.samples = deque(maxlen=history) # Recent real frame durations (s)
+
+    def tick(self):
+        """Waits out the rest of the frame; returns the real seconds since the last tick."""
+        if self.mode == "clock":
+            self.clock.tick(self.fps)
+        elif self.frame_time:
+            remaining = self.deadline - time.perf_counter()
+            if remaining > self.spin_margin:
+                time.sleep(remaining - self.spin_margin)
+            while time.perf_counter() < self.deadline:
+                pass
+
+        now = time.perf_counter()
+        dt = now - self.last
+        self.last = now
+        # Next deadline follows the schedule; resync if we fell a whole frame behind
+        self.deadline += self.frame_time
+        if self.deadline < now:
+            self.deadline = now + self.frame_time
+        self.samples.append(dt)
+        return dt
+
+    def stats(self):
+        """Frame-time mean / jitter (standard deviation) / worst, in milliseconds."""
+        samples = self.samples
+        if not samples:
+            return {"frames": 0, "mean_ms": 0.0, "jitter_ms": 0.0, "max_ms": 0.0, "target_ms": self.frame_time * 1000}
+        mean = sum(samples) / len(samples)
+        variance = sum((s - mean) ** 2 for s in samples) / len(samples)
+        return {
+            "frames": len(samples),
+            "mean_ms": mean * 1000,
+            "jitter_ms": math.sqrt(variance) * 1000,
+            "max_ms": max(samples) * 1000,
+            "target_ms": self.frame_time * 1000
+        }
@@ -1,80 +1,176 @@
 import pygame
 import random
 import math
+import numpy as np
+from level_maze.sprite_cache import GlowSpriteCache, glow_sprites
 
-class Particle:
-    def __init__(self, pos, vel, color, size, life, decay_rate=1.0):
-        self.pos = pygame.Vector2(pos)
-        self.vel = pygame.Vector2(vel)
+class VFXManager:
+    """
+    Particles live in parallel NumPy arrays (structure-of-arrays), one row each:
+    pos/vel (N, 2), life, max_life, decay, size, and an index into self.palette.
+    update() moves and ages every row at once and compacts out the dead ones.
+    draw() blits disc sprites from the shared glow_sprites cache, keyed by
+    (color, quantized size, quantized alpha), in a single Surface.blits call
+    instead of building a Surface per particle.
+    """
+    SIZE_STEP = GlowSpriteCache.DISC_STEP # px; sprite radius granularity
+    ALPHA_STEP = GlowSpriteCache.ALPHA_STEP # alpha granularity (32 levels)
+    SIZE_CODES = 1 << 16 # Size steps a draw() code can hold
+
+    def __init__(self, capacity=256, rng=None):
+        self.rng = rng if rng is not None else random # Emission spread
+        self.count = 0
+        self.capacity = 0
+        self.palette = [] # Index -> RGB tuple
+        self.palette_index = {} # RGB tuple -> index
+        self._grow(capacity)
+
+    def __len__(self):
+        return self.count
+
+    COLUMNS = ("pos", "vel", "life", "max_life", "decay", "size", "color")
+
+    def __getstate__(self):
+        # Only the live rows of each column are kept
+        state = self.__dict__.copy()
+        for name in self.COLUMNS:
+            state[name] = getattr(self, name)[:self.count].copy()
+        state["capacity"] = self.count
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._grow(max(self.count, 64))
+
+    def _grow(self, capacity):
+        n = self.count
+        columns = (("pos", (capacity, 2)), ("vel", (capacity, 2)), ("life", (capacity,)),
+                   ("max_life", (capacity,)), ("decay", (capacity,)), ("size", (capacity,)))
+        for name, shape in columns:
+            column = np.zeros(shape, dtype=np.float64)
+            if n:
+                column[:n] = getattr(self, name)[:n]
+            setattr(self, name, column)
+        color = np.zeros(capacity, dtype=np.intp)
+        if n:
+            color[:n] = self.color[:n]
         self.color = color
-        self.size = size
-        self.life = life # seconds
-        self.max_life = life
-        self.decay_rate = decay_rate
+        self.capacity = capacity
 
-    def update(self, dt):
-        self.pos += self.vel * dt
-        self.life -= self.decay_rate * dt
-        
-    def is_alive(self):
-        return self.life > 0
+    def _color_index(self, color):
+        color = tuple(color[:3])
+        index = self.palette_index.get(color)
+        if index is None:
+            index = len(self.palette)
+            self.palette.append(color)
+            self.palette_index[color] = index
+        return index
 
-class VFXManager:
-    def __init__(self):
-        self.particles = []
+    def _append(self, pos, vels, sizes, lives, color, decay_rate=1.0):
+        added = len(vels)
+        if not added:
+            return
+        start = self.count
+        end = start + added
+        if end > self.capacity:
+            self._grow(max(end, self.capacity * 2))
+        self.pos[start:end] = (pos[0], pos[1])
+        self.vel[start:end] = vels
+        self.life[start:end] = lives
+        self.max_life[start:end] = lives
+        self.decay[start:end] = decay_rate
+        self.size[start:end] = sizes
+        self.color[start:end] = self._color_index(color)
+        self.count = end
 
     def emit(self, pos, count, color, speed_min, speed_max, size_min=2, size_max=5, life=0.5):
+        # Same random draws, in the same order, as the old per-Particle emitter
+        vels, sizes, lives = [], [], []
         for _ in range(count):
-            angle = random.uniform(0, 360)
+            angle = self.rng.uniform(0, 360)
             rad = math.radians(angle)
-            speed = random.uniform(speed_min, speed_max)
-            vel = pygame.Vector2(math.cos(rad) * speed, math.sin(rad) * speed)
-            
+            speed = self.rng.uniform(speed_min, speed_max)
+            vels.append((math.cos(rad) * speed, math.sin(rad) * speed))
+
             # Randomize color slightly?
-            p_size = random.uniform(size_min, size_max)
-            p_life = random.uniform(life * 0.5, life * 1.5)
-            
-            self.particles.append(Particle(pos, vel, color, p_size, p_life))
+            sizes.append(self.rng.uniform(size_min, size_max))
+            lives.append(self.rng.uniform(life * 0.5, life * 1.5))
+
+        self._append(pos, vels, sizes, lives, color)
 
     def emit_directional(self, pos, direction, count, color, speed, spread_angle=30):
         # direction is Vector2
         base_angle = math.degrees(math.atan2(direction.y, direction.x))
-        
+
+        vels, sizes, lives = [], [], []
         for _ in range(count):
-            angle = base_angle + random.uniform(-spread_angle, spread_angle)
+            angle = base_angle + self.rng.uniform(-spread_angle, spread_angle)
             rad = math.radians(angle)
-            s = speed * random.uniform(0.8, 1.2)
-            vel = pygame.Vector2(math.cos(rad) * s, math.sin(rad) * s)
-            
-            self.particles.append(Particle(pos, vel, color, random.uniform(2, 4), random.uniform(0.3, 0.6)))
+            s = speed * self.rng.uniform(0.8, 1.2)
+            vels.append((math.cos(rad) * s, math.sin(rad) * s))
+            sizes.append(self.rng.uniform(2, 4))
+            lives.append(self.rng.uniform(0.3, 0.6))
+
+        self._append(pos, vels, sizes, lives, color)
 
     def update(self, dt):
-        alive_particles = []
-        for p in self.particles:
-            p.update(dt)
-            if p.is_alive():
-                alive_particles.append(p)
-        self.particles = alive_particles
+        n = self.count
+        if not n:
+            return
+        self.pos[:n] += self.vel[:n] * dt
+        life = self.life[:n]
+        life -= self.decay[:n] * dt
+
+        alive = life > 0
+        if alive.all():
+            return
+        # Compact survivors to the front, keeping emission order
+        rows = np.flatnonzero(alive)
+        kept = len(rows)
+        for column in (getattr(self, name) for name in self.COLUMNS):
+            column[:kept] = column[rows]
+        self.count = kept
+
+    def get_sprite(self, color_index, size_steps, alpha):
+        # draw() has snapped size and alpha to the cache's steps already
+        return glow_sprites.disc_sprite(self.palette[color_index], size_steps, alpha)
+
+    def get_draw_bounds(self):
+        """One rect around every live particle (dirty-rect rendering); empty when idle."""
+        n = self.count
+        if not n:
+            return []
+        reach = self.size[:n] + 1
+        pos = self.pos[:n]
+        left, top = (pos - reach[:, None]).min(axis=0)
+        right, bottom = (pos + reach[:, None]).max(axis=0)
+        return [pygame.Rect(int(left), int(top), int(right - left) + 2, int(bottom - top) + 2)]
 
     def draw(self, surface):
-        # Use a separate surface for additive blending if needed, 
-        # or just blit special surfaces. 
-        # For simple particles, direct drawing with BLEND_ADD is fast.
-        
-        for p in self.particles:
-            # Alpha based on life
-            alpha = int(255 * (p.life / p.max_life))
-            if alpha <= 0: continue
-            
-            # Create a small surface for the particle to handle Alpha + Blend
-            s = pygame.Surface((int(p.size)*2, int(p.size)*2), pygame.SRCALPHA)
-            
-            # Draw circle on it
-            # Color tuple needs to not have alpha for the draw, alpha is handled by blit or surface alpha
-            # Actually, let's use the surface alpha
-            c = (p.color[0], p.color[1], p.color[2], alpha)
-            pygame.draw.circle(s, c, (p.size, p.size), p.size)
-            
-            # Blit with ADD
-            dest = (p.pos.x - p.size, p.pos.y - p.size)
-            surface.blit(s, dest, special_flags=pygame.BLEND_ADD)
+        n = self.count
+        if not n:
+            return
+
+        # Alpha based on life, snapped up to the next cached level
+        alpha = (255 * (self.life[:n] / self.max_life[:n])).astype(np.int64)
+        visible = np.flatnonzero(alpha > 0)
+        if not len(visible):
+            return
+        step = self.ALPHA_STEP
+        alpha = np.minimum(255, (alpha[visible] + step - 1) // step * step)
+        size_steps = np.maximum(1, np.rint(self.size[visible] / self.SIZE_STEP)).astype(np.int64)
+        radius = size_steps * self.SIZE_STEP
+        dest = self.pos[visible] - radius[:, None]
+
+        # One cache lookup per distinct (color, size, alpha) in the frame, not per
+        # particle: pack the three into one integer code and take the unique codes
+        codes = (self.color[visible] * self.SIZE_CODES + size_steps) * 256 + alpha
+        unique, which = np.unique(codes, return_inverse=True)
+        sprites = [self.get_sprite(code // 256 // self.SIZE_CODES, code // 256 % self.SIZE_CODES, code % 256)
+                   for code in unique.tolist()]
+
+        blend = pygame.BLEND_ADD
+        surface.blits(
+            [(sprites[i], (x, y), None, blend) for i, (x, y) in zip(which.tolist(), dest.tolist())],
+            doreturn=False
+        )
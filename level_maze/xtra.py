@@ -1,4 +1,6 @@
 import pygame
+from level_maze.enemy import Enemy
+from level_maze.event_log import log
 
 class Xtra:
     def __init__(self, x, y, width, height, lifetime=10.0):
@@ -16,6 +18,10 @@ class Xtra:
         if self.active:
             pygame.draw.rect(surface, self.color, self.rect)
     
+    def get_draw_bounds(self):
+        # Screen rects draw() can touch (dirty-rect rendering)
+        return [self.rect.copy()] if self.active else []
+
     def on_collect(self, entity):
         pass
 
@@ -41,9 +47,9 @@ class HealthPack(Xtra):
             # GDD: Player 100%, Enemy 50%
             is_player = hasattr(entity, 'flash_dash') or type(entity).__name__ == 'Player' # Hacky check or purely largely based on context. 
             # Better: Player class name is 'Player'
-            if type(entity).__name__ == 'Enemy':
+            if isinstance(entity, Enemy): # Includes EnemyStore views (StoredEnemy)
                 restore = self.value * 0.5
             
             entity.health = min(entity.health + restore, 100 if type(entity).__name__ == 'Player' else 50) # Cap? GDD didn't specify Max HP strictly but implied default is max.
             # Assuming max HP is starting HP
-            print(f"{type(entity).__name__} collected HealthPack. Healed {restore}. HP: {entity.health}")
+            log.info("%s collected HealthPack. Healed %s. HP: %s", type(entity).__name__, restore, entity.health)
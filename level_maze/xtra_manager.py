@@ -1,9 +1,10 @@
-import pygame
 import random
 from level_maze.xtra import HealthPack
+from level_maze.event_log import log
 
 class XtraManager:
-    def __init__(self):
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else random # Spawn timing / placement
         self.xtras = []
         self.spawn_timer = 0
         self.spawn_interval_min = 5.0
@@ -15,7 +16,7 @@ class XtraManager:
         self.spawn_timer = 0
         self.next_spawn_time = 5.0
 
-    def update(self, dt, arena, obstacles):
+    def update(self, dt, arena, obstacle_manager):
         # Update existing
         for xtra in self.xtras:
             xtra.update(dt)
@@ -27,30 +28,18 @@ class XtraManager:
         self.spawn_timer += dt
         if self.spawn_timer >= self.next_spawn_time:
             self.spawn_timer = 0
-            self.next_spawn_time = random.uniform(self.spawn_interval_min, self.spawn_interval_max)
-            self.spawn_xtra(arena, obstacles)
+            self.next_spawn_time = self.rng.uniform(self.spawn_interval_min, self.spawn_interval_max)
+            self.spawn_xtra(arena, obstacle_manager)
 
-    def spawn_xtra(self, arena, obstacles):
-        # Try to find valid spot
-        for _ in range(10): # 10 attempts
-            w, h = 20, 20
-            spawn_area = arena.rect.inflate(-40, -40)
-            x = random.randint(spawn_area.left, spawn_area.right - w)
-            y = random.randint(spawn_area.top, spawn_area.bottom - h)
-            new_rect = pygame.Rect(x, y, w, h)
-            
-            # Check collision with obstacles
-            valid = True
-            for obs in obstacles:
-                if new_rect.colliderect(obs.rect):
-                    valid = False
-                    break
-            
-            if valid:
-                # Add Health Pack (Only type for now)
-                self.xtras.append(HealthPack(x, y))
-                print("Spawned Health Pack")
-                break
+    def spawn_xtra(self, arena, obstacle_manager):
+        # Any obstacle-free spot not on top of another xtra; none if the arena is full
+        spawn_area = arena.rect.inflate(-40, -40)
+        spot = obstacle_manager.free_space.sample(self.rng, spawn_area, (20, 20),
+                                                  exclude=[xtra.rect for xtra in self.xtras])
+        if spot is not None:
+            # Add Health Pack (Only type for now)
+            self.xtras.append(HealthPack(*spot))
+            log.info("Spawned Health Pack")
 
     def draw(self, surface):
         for xtra in self.xtras:
@@ -2,6 +2,7 @@ import pygame
 import sys
 from runner_man.player import Player
 from runner_man.obstacle_manager import ObstacleManager
+from level_maze.event_log import log
 
 def main():
     pygame.init()
@@ -47,7 +48,7 @@ def main():
                     inputs['jump'] = True
                 if event.key == pygame.K_u:
                     obstacle_manager.toggle()
-                    print(f"Obstacles {'Enabled' if obstacle_manager.enabled else 'Disabled'}")
+                    log.info("Obstacles %s", 'Enabled' if obstacle_manager.enabled else 'Disabled')
                 if event.key == pygame.K_ESCAPE:
                     running = False
                 # Restart on game over
@@ -99,7 +100,7 @@ def main():
                 
             # Game Over Check: Pushed off screen (Left)
             if player.rect.right < 0:
-                print("Game Over! Pushed off screen.")
+                log.info("Game Over! Pushed off screen.")
                 game_over = True
                 
             score += SCROLL_SPEED * dt / 100.0
@@ -1,4 +1,5 @@
 import pygame
+from level_maze.event_log import log
 
 class Player:
     def __init__(self, x, y):
@@ -40,7 +41,7 @@ class Player:
                     self.sprites.append(scaled_frame)
                     
         except Exception as e:
-            print(f"Failed to load sprites: {e}")
+            log.error("Failed to load sprites: %s", e)
             self.sprites = [] # Fallback to stickman
 
     def update(self, dt, inputs):
@@ -0,0 +1,16 @@
+import json
+import os
+import subprocess
+import sys
+
+def test_stdout_is_pure_json():
+    # What `python -m level_maze.bench > run.json` writes must load as JSON
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy")
+    env.pop("PYGAME_HIDE_SUPPORT_PROMPT", None)
+    result = subprocess.run(
+        [sys.executable, "-m", "level_maze.bench", "--quick", "--filter", "event_log",
+         "--min-time", "0.01", "--min-samples", "3", "--max-samples", "3"],
+        capture_output=True, text=True, env=env, check=True)
+    report = json.loads(result.stdout)
+    assert report["results"]
+    assert all("event_log" in case["name"] for case in report["results"])
@@ -0,0 +1,66 @@
+import random
+
+import pygame
+import pytest
+
+from level_maze.broadphase import UniformGridBroadphase
+from level_maze.combat_system import CombatSystem
+from level_maze.enemy import Enemy
+
+def brute_force_enemy_collisions(enemies):
+    # Reference: CombatSystem.resolve_enemy_collisions before the broadphase, every pair in (i, j) order
+    for i in range(len(enemies)):
+        e1 = enemies[i]
+        for j in range(i + 1, len(enemies)):
+            e2 = enemies[j]
+            dist_vec = e1.position - e2.position
+            radius_sum = e1.radius + e2.radius
+            if dist_vec.length_squared() < radius_sum * radius_sum:
+                dist = dist_vec.length()
+                if dist == 0:
+                    dist_vec = pygame.Vector2(1, 0)
+                    dist = 1.0
+                normal = dist_vec.normalize()
+                separation = normal * ((radius_sum - dist) / 2.0)
+                e1.position += separation
+                e2.position -= separation
+                e1.rect.center = (int(e1.position.x), int(e1.position.y))
+                e2.rect.center = (int(e2.position.x), int(e2.position.y))
+                e1.apply_knockback(normal * 200)
+                e2.apply_knockback(-normal * 200)
+
+def crowd(seed, count, spread):
+    rng = random.Random(seed)
+    return [Enemy(rng.uniform(0, spread), rng.uniform(0, spread)) for _ in range(count)]
+
+@pytest.mark.parametrize("seed", range(10))
+def test_enemy_collisions_match_brute_force(seed):
+    # Dense enough that pushes chain into pairs the grid did not see at build time
+    enemies = crowd(seed, 60, 220)
+    reference = crowd(seed, 60, 220)
+    combat = CombatSystem()
+    for _ in range(3):
+        combat.resolve_enemy_collisions(enemies)
+        brute_force_enemy_collisions(reference)
+        assert [tuple(e.position) for e in enemies] == [tuple(e.position) for e in reference]
+
+@pytest.mark.parametrize("seed", range(5))
+def test_queries_cover_brute_force(seed):
+    enemies = crowd(seed, 200, 1000)
+    grid = UniformGridBroadphase()
+    grid.build(enemies)
+    pairs = set(grid.candidate_pairs())
+    for i, a in enumerate(enemies):
+        for j in range(i + 1, len(enemies)):
+            if a.position.distance_to(enemies[j].position) < a.radius + enemies[j].radius:
+                assert (i, j) in pairs
+
+    rng = random.Random(seed)
+    for _ in range(20):
+        rect = pygame.Rect(rng.uniform(0, 900), rng.uniform(0, 900), rng.uniform(1, 120), rng.uniform(1, 120))
+        found = set(grid.query_rect(rect))
+        assert {i for i, e in enumerate(enemies) if rect.colliderect(e.rect)} <= found
+        center = pygame.Vector2(rng.uniform(0, 1000), rng.uniform(0, 1000))
+        radius = rng.uniform(10, 200)
+        found = set(grid.query_circle(center, radius))
+        assert {i for i, e in enumerate(enemies) if e.position.distance_to(center) < radius} <= found
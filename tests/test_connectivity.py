@@ -0,0 +1,65 @@
+import random
+from collections import deque
+
+import pygame
+import pytest
+
+from level_maze.arena import Arena
+from level_maze.obstacle_manager import ObstacleManager
+
+def flood_labels(free):
+    # Reference: 8-connected BFS labelling of the free cells, keyed (x, y)
+    rows, cols = free.shape
+    labels = {}
+    for y in range(rows):
+        for x in range(cols):
+            if not free[y, x] or (x, y) in labels:
+                continue
+            label = len(labels)
+            labels[(x, y)] = label
+            queue = deque([(x, y)])
+            while queue:
+                cx, cy = queue.popleft()
+                for dx in (-1, 0, 1):
+                    for dy in (-1, 0, 1):
+                        nx, ny = cx + dx, cy + dy
+                        if 0 <= nx < cols and 0 <= ny < rows and free[ny, nx] and (nx, ny) not in labels:
+                            labels[(nx, ny)] = label
+                            queue.append((nx, ny))
+    return labels
+
+def assert_matches_flood(om, arena):
+    labels = flood_labels(~om.ensure_nav_grid(arena))
+    ox, oy = om.nav_origin
+    cells = list(labels)
+    for start in cells:
+        for end in cells[::5]:
+            expected = labels[start] == labels[end]
+            got = om.connectivity.path_exists(arena, (start[0] + ox, start[1] + oy), (end[0] + ox, end[1] + oy))
+            assert got == expected, (start, end)
+
+@pytest.mark.parametrize("seed", range(12))
+def test_path_exists_matches_flood_fill_through_obstacle_expiry(seed):
+    rng = random.Random(seed)
+    arena = Arena(50, 50, 700, 500)
+    om = ObstacleManager()
+    om.generate_obstacles(arena, pygame.Rect(300, 250, 50, 50), 10, rng=rng)
+    for _ in range(40):
+        if rng.random() < 0.6 or not om.obstacles:
+            rect = pygame.Rect(rng.randint(50, 700), rng.randint(50, 500), rng.randint(10, 120), rng.randint(10, 120))
+            om.add_dynamic_obstacle(rect, lifespan=rng.uniform(0.1, 3.0))
+        om.update(rng.uniform(0.0, 0.5)) # Expires some, freeing their cells
+        assert_matches_flood(om, arena)
+    assert om.connectivity.incremental_updates > 0
+
+def test_blocked_goal_is_unreachable():
+    arena = Arena(50, 50, 700, 500)
+    om = ObstacleManager()
+    om.build_nav_grid(arena)
+    om.add_dynamic_obstacle(pygame.Rect(200, 200, 100, 100))
+    cs = om.nav_cell_size
+    goal = (250 // cs, 250 // cs) # Under the obstacle
+    start = (600 // cs, 400 // cs)
+    assert om.ensure_nav_grid(arena)[goal[1] - om.nav_origin[1], goal[0] - om.nav_origin[0]]
+    assert not om.connectivity.path_exists(arena, start, goal)
+    assert om.connectivity.path_exists(arena, start, (100 // cs, 100 // cs))
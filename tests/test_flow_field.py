@@ -0,0 +1,55 @@
+import heapq
+import random
+
+import pygame
+import pytest
+
+from level_maze.arena import Arena
+from level_maze.flow_field import FlowField
+from level_maze.obstacle_manager import ObstacleManager
+
+def dijkstra(blocked, goal):
+    # Reference: heap-ordered reverse search; blocked cells get a distance but are not expanded
+    rows, cols = len(blocked), len(blocked[0])
+    gx, gy = goal
+    dist = [[None] * cols for _ in range(rows)]
+    dist[gy][gx] = 0.0
+    heap = [(0.0, gx, gy)]
+    while heap:
+        d, x, y = heapq.heappop(heap)
+        if d > dist[y][x] or (blocked[y][x] and (x, y) != (gx, gy)):
+            continue
+        for dx, dy, cost in FlowField.DIRS:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < cols and 0 <= ny < rows and (dist[ny][nx] is None or d + cost < dist[ny][nx]):
+                dist[ny][nx] = d + cost
+                heapq.heappush(heap, (d + cost, nx, ny))
+    return dist
+
+@pytest.mark.parametrize("seed", range(4))
+def test_field_matches_dijkstra(seed):
+    rng = random.Random(seed)
+    arena = Arena(50, 50, 1000, 700)
+    om = ObstacleManager()
+    om.generate_obstacles(arena, pygame.Rect(500, 350, 50, 50), 40, rng=rng)
+    blocked = om.get_nav_rows(arena)
+    ox, oy = om.nav_origin
+    for _ in range(10):
+        goal = pygame.Vector2(rng.uniform(50, 1050), rng.uniform(50, 750))
+        field = FlowField()
+        field.set_goal(goal, om, arena)
+        field.distance_at(goal)
+        gx, gy = field.goal_cell
+        assert field.distances == dijkstra(blocked, (gx - ox, gy - oy)) # Exact: waypoint ties depend on it
+
+def test_walled_in_goal_is_unreachable():
+    arena = Arena(50, 50, 700, 500)
+    om = ObstacleManager()
+    om.build_nav_grid(arena)
+    for wall in (pygame.Rect(200, 200, 200, 20), pygame.Rect(200, 380, 200, 20),
+                 pygame.Rect(200, 200, 20, 200), pygame.Rect(380, 200, 20, 200)):
+        om.add_dynamic_obstacle(wall)
+    field = FlowField()
+    field.set_goal(pygame.Vector2(300, 300), om, arena)
+    assert field.distance_at(pygame.Vector2(600, 500)) is None
+    assert field.waypoints(pygame.Vector2(600, 500)) == []
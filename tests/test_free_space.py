@@ -0,0 +1,62 @@
+import random
+
+import pygame
+import pytest
+
+from level_maze.arena import Arena
+from level_maze.free_space import FreeSpaceSampler
+from level_maze.obstacle_manager import ObstacleManager
+
+def footprint_clear(x, y, size, clearance, obstacles, exclude=()):
+    # Reference: the footprint grown by clearance misses every obstacle, and the bare footprint every exclusion
+    rect = pygame.Rect(x, y, *size)
+    grown = rect.inflate(clearance * 2, clearance * 2)
+    if any(grown.colliderect(obs.rect) for obs in obstacles):
+        return False
+    return rect.collidelist(list(exclude)) == -1
+
+def layout(seed):
+    rng = random.Random(seed)
+    arena = Arena(50, 50, 700, 500)
+    om = ObstacleManager()
+    om.generate_obstacles(arena, pygame.Rect(375, 275, 50, 50), 12, rng=rng)
+    return om, arena, rng
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("size, clearance", [((20, 20), 0), ((40, 40), 10), ((13, 27), 3)])
+def test_table_matches_per_position_check(seed, size, clearance):
+    om, arena, _ = layout(seed)
+    table = FreeSpaceSampler(om).table(arena.rect, size, clearance)
+    obstacles = om.get_obstacles()
+    for j in range(table.rows):
+        for i in range(table.cols):
+            x, y = table.position(j * table.cols + i)
+            assert pygame.Rect(x, y, *size).right <= arena.rect.right
+            assert pygame.Rect(x, y, *size).bottom <= arena.rect.bottom
+            assert table.open[j, i] == footprint_clear(x, y, size, clearance, obstacles), (x, y)
+
+@pytest.mark.parametrize("seed", range(6))
+def test_samples_respect_obstacles_and_exclusions(seed):
+    om, arena, rng = layout(seed)
+    sampler = FreeSpaceSampler(om)
+    size, clearance = (30, 30), 8
+    exclude = [pygame.Rect(rng.randint(50, 650), rng.randint(50, 450), 120, 120) for _ in range(6)]
+    for _ in range(50):
+        spot = sampler.sample(rng, arena.rect, size, clearance, exclude)
+        assert spot is not None
+        assert arena.rect.contains(pygame.Rect(spot, size))
+        assert footprint_clear(*spot, size, clearance, om.get_obstacles(), exclude)
+
+def test_crowded_area_falls_back_to_masking_and_reports_none_when_full():
+    om, arena, rng = layout(0)
+    sampler = FreeSpaceSampler(om)
+    # Only a thin strip on the right is left; rejection tries alone would almost always miss it
+    exclude = [pygame.Rect(arena.rect.left, arena.rect.top, arena.rect.width - 40, arena.rect.height)]
+    table = sampler.table(arena.rect, (20, 20))
+    assert any(footprint_clear(*table.position(index), (20, 20), 0, [], exclude) for index in table.free)
+    for _ in range(20):
+        spot = sampler.sample(rng, arena.rect, (20, 20), exclude=exclude)
+        assert spot is not None
+        assert footprint_clear(*spot, (20, 20), 0, om.get_obstacles(), exclude)
+
+    assert sampler.sample(rng, arena.rect, (20, 20), exclude=[arena.rect]) is None
@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+
+import pygame
+import pytest
+
+from level_maze.config_manager import ConfigManager
+from level_maze.input_handler import InputFrame, InputHandler
+from level_maze.replay import INPUT_RECORD, decode_input, encode_input
+from level_maze.timestep import FixedTimestep
+
+class RecordingWorld:
+    """Just enough of a Simulation for FixedTimestep: logs the frame each step gets."""
+    def __init__(self):
+        self.player = SimpleNamespace(position=pygame.Vector2())
+        self.enemies = self.roar_bombs = self.brick_bombs = []
+        self.outcome = None
+        self.frames = []
+
+    def game_time(self, real_dt):
+        return real_dt
+
+    def step(self, dt, input_frame):
+        self.frames.append(input_frame)
+
+class KeyState:
+    """A pygame.key.get_pressed() stand-in with the given keys down."""
+    def __init__(self, *keys):
+        self.keys = set(keys)
+
+    def __getitem__(self, key):
+        return key in self.keys
+
+def test_frame_without_history_treats_held_buttons_as_pressed():
+    frame = InputFrame(dash=True, secondary=True)
+    assert frame.pressed == {"dash", "secondary"}
+    assert frame.get_abilities_state() == {"dash": True, "roar": False}
+    assert InputFrame(dash=True, pressed=()).get_abilities_state() == {"dash": False, "roar": False}
+
+def test_edges_go_to_the_first_step_of_a_sample_only():
+    world, fixed_step = RecordingWorld(), FixedTimestep(tick_rate=120)
+    fixed_step.advance(world, 3.5 / 120, InputFrame(dash=True, pressed={"dash"}))
+    assert [frame.pressed for frame in world.frames] == [{"dash"}, frozenset(), frozenset()]
+    assert all(frame.dash for frame in world.frames)
+
+def test_edges_wait_for_a_frame_that_runs_a_step():
+    world, fixed_step = RecordingWorld(), FixedTimestep(tick_rate=120)
+    assert fixed_step.advance(world, 0.4 / 120, InputFrame(roar=True, pressed={"roar"})) == 0
+    assert fixed_step.advance(world, 0.4 / 120, InputFrame(roar=True, pressed=(), released={"dash"})) == 0
+    fixed_step.advance(world, 0.4 / 120, InputFrame(roar=True, pressed=()))
+    assert [(frame.pressed, frame.released) for frame in world.frames] == [({"roar"}, {"dash"})]
+
+    fixed_step.reset()
+    fixed_step.advance(world, 0.4 / 120, InputFrame(pressed={"dash"}))
+    fixed_step.reset()
+    fixed_step.advance(world, 1.0 / 120, InputFrame(pressed=()))
+    assert world.frames[-1].pressed == frozenset()
+
+@pytest.mark.parametrize("pressed", [(), ("dash",), ("roar",), ("dash", "roar")])
+def test_replay_records_round_trip_the_ability_edges(pressed):
+    frame = InputFrame(move=(0.5, -0.5), dash=True, roar=True, aim_point=(10, 20), pressed=pressed)
+    dt, decoded = decode_input(INPUT_RECORD.unpack(encode_input(1 / 120, frame))[1:])
+    assert dt == 1 / 120
+    assert decoded.pressed == set(pressed)
+    assert decoded.get_abilities_state() == frame.get_abilities_state()
+    assert (decoded.dash, decoded.roar, decoded.aim_point) == (True, True, pygame.Vector2(10, 20))
+
+@pytest.mark.parametrize("keyboard_abilities", [False, True])
+def test_dash_and_roar_keys_are_opt_in(keyboard_abilities):
+    pygame.init()
+    config_manager = ConfigManager()
+    config_manager.config = dict(config_manager.config,
+                                 controls=dict(config_manager.config["controls"], keyboard_abilities=keyboard_abilities))
+    handler = InputHandler(config_manager)
+    handler.controller_mode = False
+    keys = KeyState(pygame.K_SPACE, pygame.K_LSHIFT, pygame.K_e, pygame.K_q)
+    assert handler.is_held("dash", keys) == keyboard_abilities
+    assert handler.is_held("roar", keys) == keyboard_abilities
+    assert handler.is_held("secondary", keys) and handler.is_held("menu_wheel", keys)
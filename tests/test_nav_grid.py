@@ -0,0 +1,49 @@
+import random
+
+import pygame
+import pytest
+
+from level_maze.arena import Arena
+from level_maze.obstacle_manager import ObstacleManager
+
+def reference_blocked(om, arena, x, y):
+    # The per-cell test A* ran before the grid was rasterized: cell outside the
+    # arena, or the cell grown by the clearance touching any obstacle
+    cs = om.nav_cell_size
+    cell = pygame.Rect(x * cs, y * cs, cs, cs)
+    if not arena.rect.contains(cell):
+        return True
+    grown = cell.inflate(om.nav_clearance, om.nav_clearance)
+    return any(grown.colliderect(obs.rect) for obs in om.get_obstacles())
+
+def assert_matches_reference(om, arena):
+    blocked = om.ensure_nav_grid(arena)
+    ox, oy = om.nav_origin
+    rows, cols = blocked.shape
+    for y in range(rows):
+        for x in range(cols):
+            assert blocked[y, x] == reference_blocked(om, arena, x + ox, y + oy), (x + ox, y + oy)
+
+@pytest.mark.parametrize("seed", range(5))
+def test_rasterized_grid_matches_per_cell_test(seed):
+    rng = random.Random(seed)
+    arena = Arena(rng.randint(0, 60), rng.randint(0, 60), rng.randint(500, 900), rng.randint(400, 700))
+    om = ObstacleManager()
+    om.generate_obstacles(arena, pygame.Rect(300, 250, 50, 50), 15, rng=rng)
+    assert_matches_reference(om, arena)
+
+    # Incremental updates: overlapping adds (counts above 1), expiry, edge-aligned rects
+    for _ in range(30):
+        if rng.random() < 0.6:
+            x = rng.choice([rng.randint(-20, 900), rng.randint(0, 20) * 40 - 5])
+            y = rng.randint(-20, 700)
+            om.add_dynamic_obstacle(pygame.Rect(x, y, rng.randint(1, 120), rng.randint(1, 120)),
+                                    lifespan=rng.uniform(0.1, 2.0))
+        om.update(rng.uniform(0.0, 0.4))
+        assert_matches_reference(om, arena)
+
+def test_grid_follows_a_resized_arena():
+    om = ObstacleManager()
+    om.add_dynamic_obstacle(pygame.Rect(200, 200, 60, 60))
+    assert_matches_reference(om, Arena(50, 50, 700, 500))
+    assert_matches_reference(om, Arena(10, 30, 900, 640))
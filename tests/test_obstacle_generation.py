@@ -0,0 +1,48 @@
+import random
+
+import pygame
+import pytest
+
+from level_maze.arena import Arena
+from level_maze.obstacle_manager import ObstacleManager
+
+GAP = 50 # gap_required in generate_obstacles
+
+def generate(seed, count, arena=None, safe_zone=None):
+    arena = arena or Arena(50, 50, 700, 500)
+    safe_zone = safe_zone or pygame.Rect(375, 275, 50, 50)
+    om = ObstacleManager()
+    stats = om.generate_obstacles(arena, safe_zone, count, rng=random.Random(seed))
+    return om, arena, safe_zone, stats
+
+@pytest.mark.parametrize("seed", range(8))
+@pytest.mark.parametrize("count", [10, 200])
+def test_layout_keeps_every_constraint(seed, count):
+    om, arena, safe_zone, stats = generate(seed, count)
+    rects = [obs.rect for obs in om.get_obstacles()]
+    assert stats["placed"] == len(rects) <= count
+
+    spawn_area = arena.rect.inflate(-GAP * 2, -GAP * 2)
+    grown_safe_zone = safe_zone.inflate(om.min_gap, om.min_gap)
+    for i, rect in enumerate(rects):
+        assert 30 <= rect.width <= 80 and 30 <= rect.height <= 80
+        assert spawn_area.contains(rect)
+        assert not rect.colliderect(grown_safe_zone)
+        # Brute-force pairwise gap check, no grid
+        for other in rects[i + 1:]:
+            assert not rect.inflate(GAP * 2, GAP * 2).colliderect(other), (rect, other)
+
+@pytest.mark.parametrize("seed", range(8))
+def test_small_request_is_met(seed):
+    _, _, _, stats = generate(seed, 10)
+    assert stats["placed"] == 10
+
+def test_same_seed_gives_same_layout():
+    first = [tuple(obs.rect) for obs in generate(3, 40)[0].get_obstacles()]
+    second = [tuple(obs.rect) for obs in generate(3, 40)[0].get_obstacles()]
+    assert first == second
+
+def test_safe_zone_covering_the_arena_places_nothing():
+    arena = Arena(50, 50, 700, 500)
+    _, _, _, stats = generate(0, 10, arena, arena.rect.copy())
+    assert stats["placed"] == 0
@@ -0,0 +1,38 @@
+import math
+
+import pygame
+import pytest
+
+from level_maze.arena import Arena
+from level_maze.config_manager import ConfigManager
+from level_maze.input_handler import InputFrame
+from level_maze.obstacle_manager import ObstacleManager
+from level_maze.player import Player
+
+DIRECTIONS = [(math.cos(i * math.pi / 4), math.sin(i * math.pi / 4)) for i in range(8)]
+
+def distance_covered(direction, tick_rate, seconds=0.5):
+    arena = Arena(0, 0, 2000, 2000)
+    player = Player(1000, 1000, ConfigManager())
+    frame = InputFrame(move=direction)
+    start = player.position.copy()
+    for _ in range(round(seconds * tick_rate)):
+        player.update(1.0 / tick_rate, frame, arena, ObstacleManager())
+    # rect follows the float position
+    assert player.rect.center == (int(player.position.x), int(player.position.y))
+    return player.position.distance_to(start), player.speed * seconds
+
+@pytest.mark.parametrize("direction", DIRECTIONS)
+@pytest.mark.parametrize("tick_rate", [30, 60, 120, 240])
+def test_speed_is_the_same_in_every_direction_and_tick_rate(direction, tick_rate):
+    covered, expected = distance_covered(direction, tick_rate)
+    assert covered == pytest.approx(expected, abs=1e-6)
+
+def test_arena_clamp_keeps_position_and_rect_together():
+    arena = Arena(0, 0, 400, 400)
+    player = Player(200, 200, ConfigManager())
+    frame = InputFrame(move=(1, 0.3))
+    for _ in range(240):
+        player.update(1.0 / 120, frame, arena, ObstacleManager())
+    assert player.rect.right == arena.rect.right - arena.wall_thickness
+    assert player.rect.center == (int(player.position.x), int(player.position.y))
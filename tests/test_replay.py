@@ -0,0 +1,77 @@
+import math
+
+import pytest
+
+from level_maze.config_manager import ConfigManager
+from level_maze.input_handler import InputFrame
+from level_maze.replay import ReplayPlayer, ReplayRecorder, world_fingerprint
+from level_maze.simulation import Simulation
+
+KEYFRAME_INTERVAL = 50
+STEPS = 400
+
+def scripted_input(frame):
+    # Steering, aiming, ability presses and a held secondary, all varying over the run
+    return InputFrame(move=(math.cos(frame / 30), math.sin(frame / 45)),
+                      aim_point=(400 + 200 * math.cos(frame / 20), 300 + 150 * math.sin(frame / 25)),
+                      dash=frame % 90 < 3, roar=frame % 170 < 2, secondary=frame % 120 < 40,
+                      pressed=[name for name, period in (("dash", 90), ("roar", 170)) if frame % period == 0])
+
+def record(path, seed):
+    """Records a scripted run; returns {frame: fingerprint} at every keyframe."""
+    simulation = Simulation(ConfigManager(), seed=seed)
+    simulation.reset()
+    recorder = ReplayRecorder(str(path), simulation, KEYFRAME_INTERVAL)
+    fingerprints = {}
+    for _ in range(STEPS):
+        if simulation.frame % KEYFRAME_INTERVAL == 0:
+            fingerprints[simulation.frame] = world_fingerprint(simulation)
+        if simulation.step(1.0 / 120, scripted_input(simulation.frame)):
+            break
+    fingerprints["end"] = world_fingerprint(simulation)
+    recorder.close()
+    return fingerprints
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_playback_matches_the_recording_at_every_keyframe(tmp_path, seed):
+    expected = record(tmp_path / "match.lmr", seed)
+    player = ReplayPlayer(str(tmp_path / "match.lmr"))
+    assert [frame for frame, _ in player.index] == [frame for frame in expected if frame != "end"]
+
+    seen = {}
+    def check(simulation, frame, snapshot):
+        seen[frame] = world_fingerprint(simulation)
+        stored = player.create_simulation()
+        stored.restore(snapshot)
+        assert world_fingerprint(stored) == seen[frame]
+
+    simulation = player.create_simulation()
+    player.play(simulation, on_keyframe=check)
+    assert seen == {frame: value for frame, value in expected.items() if frame != "end"}
+    assert world_fingerprint(simulation) == expected["end"]
+
+@pytest.mark.parametrize("target", [0, 49, 50, 173, 300])
+def test_seek_lands_on_the_recorded_state(tmp_path, target):
+    path = tmp_path / "match.lmr"
+    record(path, 7)
+    player = ReplayPlayer(str(path))
+    straight = player.create_simulation()
+    player.play(straight, until=target)
+
+    seeked = player.create_simulation()
+    player.play(seeked, until=STEPS // 2) # Seek from a state ahead of the target
+    player.seek(seeked, target)
+    assert seeked.frame == straight.frame == target
+    assert world_fingerprint(seeked) == world_fingerprint(straight)
+
+def test_truncated_recording_plays_up_to_its_last_complete_record(tmp_path):
+    path = tmp_path / "match.lmr"
+    record(path, 4)
+    data = path.read_bytes()
+    cut = tmp_path / "cut.lmr"
+    cut.write_bytes(data[:len(data) // 2])
+    player = ReplayPlayer(str(cut))
+    assert player.index is None
+    simulation = player.create_simulation()
+    frame = player.play(simulation)
+    assert 0 < frame < STEPS
@@ -0,0 +1,69 @@
+import math
+
+import pytest
+
+from level_maze.config_manager import ConfigManager
+from level_maze.input_handler import InputFrame
+from level_maze.replay import world_fingerprint
+from level_maze.simulation import Simulation
+
+def scripted_input(frame):
+    return InputFrame(move=(math.cos(frame / 25), math.sin(frame / 35)), look=(1, 0),
+                      dash=frame % 80 == 0, roar=frame % 150 == 0, secondary=frame % 100 < 30)
+
+def advance(simulation, steps):
+    for _ in range(steps):
+        if simulation.step(1.0 / 120, scripted_input(simulation.frame)):
+            break
+
+def new_world(seed):
+    simulation = Simulation(ConfigManager(), seed=seed)
+    simulation.reset()
+    return simulation
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("checkpoint", [0, 90, 250])
+def test_restored_world_steps_like_the_uninterrupted_one(seed, checkpoint):
+    uninterrupted = new_world(seed)
+    advance(uninterrupted, checkpoint)
+    snapshot = uninterrupted.snapshot()
+    advance(uninterrupted, 200)
+
+    # Restored into a different world: nothing of its own state may leak through
+    restored = new_world(seed + 100)
+    advance(restored, 37)
+    restored.restore(snapshot)
+    advance(restored, 200)
+    assert world_fingerprint(restored) == world_fingerprint(uninterrupted)
+    assert restored.outcome == uninterrupted.outcome
+
+def test_one_snapshot_restores_any_number_of_times():
+    simulation = new_world(5)
+    advance(simulation, 120)
+    checkpoint = simulation.snapshot()
+    runs = []
+    for _ in range(3):
+        simulation.restore(checkpoint)
+        advance(simulation, 150)
+        runs.append(world_fingerprint(simulation))
+    assert runs[0] == runs[1] == runs[2]
+
+def test_save_and_load_round_trip(tmp_path):
+    simulation = new_world(6)
+    advance(simulation, 180)
+    path = str(tmp_path / "quicksave.lms")
+    simulation.save(path)
+    expected = world_fingerprint(simulation)
+
+    loaded = new_world(7)
+    loaded.load(path)
+    assert world_fingerprint(loaded) == expected
+    advance(simulation, 100)
+    advance(loaded, 100)
+    assert world_fingerprint(loaded) == world_fingerprint(simulation)
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "not_a_save.lms"
+    path.write_bytes(b"LMREPLAY" + bytes(32))
+    with pytest.raises(ValueError):
+        new_world(1).load(str(path))
@@ -0,0 +1,46 @@
+import random
+
+import pygame
+import pytest
+
+from level_maze.spatial_hash import SpatialHash
+
+def random_rect(rng):
+    return pygame.Rect(rng.randint(-100, 900), rng.randint(-100, 700), rng.randint(1, 150), rng.randint(1, 150))
+
+@pytest.mark.parametrize("seed", range(5))
+def test_queries_match_linear_scan(seed):
+    rng = random.Random(seed)
+    index = SpatialHash(cell_size=64)
+    items = {}
+    for n in range(150):
+        items[n] = random_rect(rng)
+        index.insert(n, items[n])
+    for n in rng.sample(sorted(items), 50):
+        index.remove(n)
+        del items[n]
+    for n in rng.sample(sorted(items), 20): # Re-inserting moves an item to the end
+        items[n] = items.pop(n).move(rng.randint(-50, 50), rng.randint(-50, 50))
+        index.insert(n, items[n])
+    assert len(index) == len(items)
+
+    for _ in range(200):
+        rect = random_rect(rng)
+        expected = [n for n, r in items.items() if rect.colliderect(r)]
+        assert index.query_rect(rect) == expected
+        assert index.any_rect(rect) == bool(expected)
+
+        # Segments in every direction, including axis-aligned and ones ending on cell boundaries
+        start = (rng.choice([rng.uniform(-100, 900), 128.0]), rng.uniform(-100, 700))
+        end = rng.choice([(rng.uniform(-100, 900), rng.uniform(-100, 700)), (start[0], rng.uniform(-100, 700)),
+                          (rng.uniform(-100, 900), start[1]), (256.0, 192.0)])
+        expected = [n for n, r in items.items() if r.clipline(start, end)]
+        assert index.query_segment(start, end) == expected
+        assert index.any_segment(start, end) == bool(expected)
+
+def test_clear_empties_every_bucket():
+    index = SpatialHash()
+    index.insert("a", pygame.Rect(0, 0, 200, 200))
+    index.clear()
+    assert len(index) == 0
+    assert index.query_rect(pygame.Rect(0, 0, 500, 500)) == []
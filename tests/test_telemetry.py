@@ -0,0 +1,61 @@
+import pytest
+
+from level_maze import telemetry
+from level_maze.telemetry import FRAME, HEADER_SIZE, RECORD, SEQ, TRAILING_SEQ_OFFSET, TelemetryReader, TelemetryWriter
+
+@pytest.fixture
+def writer(tmp_path):
+    writer = TelemetryWriter()
+    writer.open(str(tmp_path / "session.lmt"), capacity=4)
+    yield writer
+    writer.close()
+
+def emit(writer, n):
+    for i in range(n):
+        seq = writer.count + 1
+        writer.emit(FRAME, seq, seq, seq * 2, seq * 3, seq * 4)
+
+def test_reader_returns_every_record_once(writer):
+    reader = TelemetryReader(writer.path)
+    emit(writer, 3)
+    assert [(r.seq, r.id, r.a, r.d) for r in reader.poll()] == [(1, 1, 1, 4), (2, 2, 2, 8), (3, 3, 3, 12)]
+    emit(writer, 1)
+    assert [r.seq for r in reader.poll()] == [4]
+    assert reader.poll() == [] and reader.lost == 0
+
+def test_lapped_reader_counts_the_overwritten_records(writer):
+    reader = TelemetryReader(writer.path)
+    emit(writer, 10)
+    assert [r.seq for r in reader.poll()] == [7, 8, 9, 10]
+    assert reader.lost == 6
+
+class InterleavedSeq:
+    """Stands in for telemetry.SEQ: after the reader's first seq read, runs `between`."""
+    def __init__(self, between):
+        self.between = between
+        self.calls = 0
+
+    def unpack_from(self, buffer, offset=0):
+        value = SEQ.unpack_from(buffer, offset)
+        self.calls += 1
+        if self.calls == 1:
+            self.between()
+        return value
+
+@pytest.mark.parametrize("written", [SEQ.size, 24, TRAILING_SEQ_OFFSET])
+def test_write_racing_the_read_is_rejected(writer, monkeypatch, written):
+    # The writer laps the slot after the reader checked the trailing seq and
+    # gets `written` bytes in (leading seq first) before the reader finishes;
+    # the trailing seq still matches, so only the final leading check can tell
+    reader = TelemetryReader(writer.path)
+    emit(writer, 1)
+    offset = HEADER_SIZE
+    newer = bytearray(RECORD.size)
+    RECORD.pack_into(newer, 0, 5, 5.0, FRAME, 5, 5.0, 10.0, 15.0, 20.0, 5)
+
+    def overwrite():
+        writer.buffer[offset:offset + written] = newer[:written]
+
+    monkeypatch.setattr(telemetry, "SEQ", InterleavedSeq(overwrite))
+    assert reader.poll() == []
+    assert reader.lost == 1
@@ -0,0 +1,85 @@
+import pytest
+
+from level_maze.config_manager import ConfigManager
+from level_maze.input_handler import InputFrame
+from level_maze.replay import world_fingerprint
+from level_maze.simulation import Simulation
+from level_maze.timestep import FixedTimestep
+
+TICK_RATE = 120
+
+def new_world(seed):
+    simulation = Simulation(ConfigManager(), seed=seed)
+    simulation.reset()
+    return simulation
+
+# Held movement only: a frame's sample drives all of its steps, so input that
+# changed per frame (or carried ability edges) would differ between framings
+STEERING = InputFrame(move=(0.6, -0.8), pressed=())
+
+def run(simulation, display_rate, seconds):
+    fixed_step = FixedTimestep(TICK_RATE, max_substeps=8)
+    steps = 0
+    for _ in range(round(seconds * display_rate)):
+        steps += fixed_step.advance(simulation, 1.0 / display_rate, STEERING)
+        assert 0.0 <= fixed_step.alpha < 1.0
+        if simulation.outcome is not None:
+            break
+    return steps
+
+def test_accumulator_runs_whole_steps_and_keeps_the_remainder():
+    # 64 Hz keeps every quantity here exact in binary floating point
+    simulation = new_world(1)
+    fixed_step = FixedTimestep(64)
+    assert fixed_step.advance(simulation, 2.5 / 64, InputFrame()) == 2
+    assert fixed_step.alpha == 0.5
+    assert fixed_step.advance(simulation, 0.25 / 64, InputFrame()) == 0
+    assert fixed_step.alpha == 0.75
+    assert fixed_step.advance(simulation, 0.25 / 64, InputFrame()) == 1
+    assert fixed_step.alpha == 0.0
+    assert simulation.frame == 3
+    assert simulation.elapsed == 3.0 / 64
+
+def test_backlog_beyond_max_substeps_is_dropped():
+    simulation = new_world(1)
+    fixed_step = FixedTimestep(TICK_RATE, max_substeps=4)
+    assert fixed_step.advance(simulation, 1.0, InputFrame()) == 4
+    assert 0.0 <= fixed_step.alpha < 1.0
+    assert fixed_step.advance(simulation, 1.0 / TICK_RATE, InputFrame()) == 1
+
+@pytest.mark.parametrize("seed", range(3))
+def test_world_is_the_same_at_any_display_rate(seed):
+    # Only how many steps land in each frame changes, not the steps themselves
+    counts = []
+    for display_rate in (30, 60, 144):
+        simulation = new_world(seed)
+        steps = run(simulation, display_rate, seconds=2.0)
+        counts.append(steps)
+        reference = new_world(seed)
+        for _ in range(steps):
+            reference.step(1.0 / TICK_RATE, STEERING)
+        assert world_fingerprint(simulation) == world_fingerprint(reference), display_rate
+    assert max(counts) - min(counts) <= 1
+
+def test_slow_motion_scales_game_time():
+    simulation = new_world(1)
+    simulation.slowmo_timer = 1.0
+    fixed_step = FixedTimestep(TICK_RATE)
+    steps = sum(fixed_step.advance(simulation, 1.0 / 60, InputFrame()) for _ in range(60))
+    # One real second of slow motion is SLOWMO_SCALE game seconds
+    assert steps == pytest.approx(TICK_RATE * Simulation.SLOWMO_SCALE, abs=1)
+    assert simulation.slowmo_timer <= 0
+
+def test_interpolation_blends_and_then_restores_positions():
+    simulation = new_world(1)
+    fixed_step = FixedTimestep(TICK_RATE)
+    player = simulation.player
+    fixed_step.advance(simulation, 1.5 / TICK_RATE, InputFrame(move=(1, 0), pressed=()))
+    before = fixed_step.interpolator.previous[id(player)][1]
+    after = player.position.copy()
+    assert after != before
+    with fixed_step.interpolator.interpolated(simulation, fixed_step.alpha):
+        assert player.position == before.lerp(after, fixed_step.alpha)
+        assert player.rect.center == (int(player.position.x), int(player.position.y))
+    assert player.position == after
+    assert player.rect.center == (int(after.x), int(after.y))